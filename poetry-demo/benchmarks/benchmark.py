@@ -0,0 +1,409 @@
+# Dependencies:
+# - argparse: Parses the command line options.
+# - json: Reads the baseline and writes the results in a machine-readable form.
+# - os: Finds the package for the startup measurements.
+# - platform: Describes the machine the results were measured on.
+# - statistics: Summarizes the repeated timings.
+# - subprocess: Runs the startup measurements in new interpreters.
+# - sys: Starts the startup measurements with the same interpreter, and sets the exit status.
+# - time: Measures wall time with the high resolution performance counter.
+# - tracemalloc: Measures the memory allocated by the measured calls.
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+
+from poetry_demo.goalEntrySampler import GoalEntrySampler
+from poetry_demo.goalKeeper import GoalKeeper
+from poetry_demo.instrumentation import Instrumentation
+from poetry_demo.simulator import LASER_PERIOD, FieldSimulator
+
+# use `python -m benchmarks.benchmark --baseline baseline.json`, from the directory of pyproject.toml, to compare a run against a stored baseline,
+# and `--update-baseline` to store the current run as the new baseline.
+# `--trace trace.npz` also plays the recorded decisions instrumented, prints where their time goes and dumps the
+# spans, see poetry_demo.instrumentation.
+# The startup cases measure a cold start in new interpreters, `--no-startup` skips them.
+
+DEFAULT_THRESHOLD = 0.10  # a case is a regression when it is more than 10% slower, or uses 10% more memory
+MEMORY_SLACK = 64  # bytes a memory measurement may grow by beyond the threshold, the size of a small object
+GATED_METRICS = ("median_us", "peak_bytes", "retained_bytes")  # the measurements compared against the baseline
+DEFAULT_REPEAT = 7
+BENCHMARK_SHOT = ((8.0, 11.0), (-6.0, 2.0))  # the (position, velocity) the scripted laser is recorded from
+
+# Run by `measure_startup` in a new interpreter, prints the seconds each step of a cold start took
+STARTUP_SCRIPT = """
+import json
+import time
+
+start = time.perf_counter()
+from poetry_demo.goalKeeper import GoalKeeper
+imported = time.perf_counter()
+
+keeper = GoalKeeper()
+constructed = time.perf_counter()
+keeper.stop()
+
+start_fast = time.perf_counter()
+fast_keeper = GoalKeeper(fast_start=True)
+constructed_fast = time.perf_counter()
+
+
+class Laser:
+    def activate_laser(self, location, facing_degree):
+        return 4.0
+
+    def now(self):
+        return 0.0
+
+    def receive(self):
+        return None
+
+    def game_over(self):
+        return False
+
+
+start_step = time.perf_counter()
+GoalKeeper(backend=Laser()).search_step()
+stepped = time.perf_counter()
+print(json.dumps({
+    "startup_import": imported - start,
+    "startup_construct": constructed - imported,
+    "startup_construct_fast": constructed_fast - start_fast,
+    "startup_first_step": stepped - start_step,
+}))
+"""
+
+
+class ScriptedLaser:
+    """
+    Laser stand-in that plays back a fixed script of readings, used as a GoalKeeper backend.
+
+    Explanation:
+    - `activate_laser` returns the next reading of `readings`, and `activate_laser_sweep` the next array of
+    `sweeps`, wrapping around when the script is shorter than the run.
+    - When `exhaust` is True the game is over once the script has been played, so a control loop that drifts
+    from the recorded run still ends.
+    - No teammate messages are delivered.
+    """
+
+    def __init__(self, readings, sweeps=(), exhaust=False):
+        self.readings = list(readings)
+        self.sweeps = list(sweeps)
+        self.exhaust = exhaust
+        self.rewind()
+
+    def rewind(self):
+        self.index = 0
+        self.sweep_index = 0
+
+    def activate_laser(self, location, facing_degree):
+        reading = self.readings[self.index % len(self.readings)]
+        self.index += 1
+        return reading
+
+    def activate_laser_sweep(self, location, angles):
+        sweep = self.sweeps[self.sweep_index % len(self.sweeps)]
+        self.sweep_index += 1
+        return sweep[: len(angles)]
+
+    def receive(self):
+        return None
+
+    def now(self):
+        return (self.index + self.sweep_index) * LASER_PERIOD
+
+    def game_over(self):
+        return self.exhaust and self.index >= len(self.readings) and self.sweep_index >= len(self.sweeps)
+
+
+class RecordingBackend:
+    """
+    Backend that forwards to another backend and keeps every laser reading, to build a `ScriptedLaser`.
+    """
+
+    def __init__(self, backend):
+        self.backend = backend
+        self.readings = []
+        self.sweeps = []
+
+    def activate_laser(self, location, facing_degree):
+        reading = self.backend.activate_laser(location, facing_degree)
+        self.readings.append(reading)
+        return reading
+
+    def activate_laser_sweep(self, location, angles):
+        sweep = self.backend.activate_laser_sweep(location, angles)
+        self.sweeps.append(sweep)
+        return sweep
+
+    def receive(self):
+        return self.backend.receive()
+
+    def now(self):
+        return self.backend.now()
+
+    def game_over(self):
+        return self.backend.game_over()
+
+
+def record_script(sweep_mode=False, shot=BENCHMARK_SHOT):
+    """
+    Record the laser readings of a single `prevent_attack` decision against the simulator.
+
+    Args:
+        sweep_mode (bool, optional): Record the keeper in sweep mode.
+        shot (tuple, optional): The (position, velocity) of the ball.
+
+    Returns:
+        ScriptedLaser: A laser that plays the same decision back.
+    """
+    simulator = FieldSimulator()
+    simulator.kick(*shot)
+    recorder = RecordingBackend(simulator)
+    keeper = GoalKeeper(backend=recorder)
+    keeper.sweep_mode = sweep_mode
+    keeper.prevent_attack()
+    return ScriptedLaser(recorder.readings, recorder.sweeps, exhaust=True)
+
+
+def measure(function, number, repeat, setup=None):
+    """
+    Measure the wall time and the allocations of `function`.
+
+    Args:
+        function (callable): The measured call.
+        number (int): How many times the call is made in a single timing.
+        repeat (int): How many timings are taken.
+        setup (callable, optional): Called before every timing, and not measured.
+
+    Returns:
+    dict: The median and minimum time per call in microseconds, and the memory high-water mark and the
+        memory still held after `number` calls, in bytes.
+    """
+    timings = []
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        start = time.perf_counter()
+        for _ in range(number):
+            function()
+        timings.append((time.perf_counter() - start) / number)
+
+    if setup is not None:
+        setup()
+    tracemalloc.start()
+    before, _ = tracemalloc.get_traced_memory()
+    for _ in range(number):
+        function()
+    after, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "median_us": statistics.median(timings) * 1e6,
+        "min_us": min(timings) * 1e6,
+        "peak_bytes": peak - before,
+        "retained_bytes": after - before,
+    }
+
+
+def benchmark_cases():
+    """
+    Build the benchmarked cases of the perception-to-decision hot path.
+
+    Returns:
+    dict: name -> (function, number, setup).
+    """
+    keeper = GoalKeeper(backend=ScriptedLaser([4.0]))
+    keeper.facing_degree = 45
+    keeper.tracker.push(8.0, 14.0)
+    keeper.tracker.push(7.0, 14.5)
+    sampling_keeper = GoalKeeper(backend=ScriptedLaser([4.0]), goal_sampler=GoalEntrySampler())
+    sampling_keeper.tracker.push(8.0, 14.0)
+    sampling_keeper.tracker.push(7.0, 14.5)
+
+    cases = {
+        "calculate_new_position": (lambda: keeper.calculate_new_position(0), 10000, None),
+        "get_laser_poisiton": (keeper.get_laser_poisiton, 10000, None),
+        "idenifiy": (keeper.idenifiy, 10000, None),
+        "encountered_a_ball": (keeper.encountered_a_ball, 10000, None),
+        "estimate_ball_location": (keeper.estimate_ball_location, 10000, None),
+        "goal_entry_estimate": (sampling_keeper.goal_entry_estimate, 1000, None),
+    }
+
+    for name, sweep_mode in (("prevent_attack", False), ("prevent_attack_sweep", True)):
+        laser = record_script(sweep_mode)
+        decision_keeper = GoalKeeper(backend=laser)
+        decision_keeper.sweep_mode = sweep_mode
+        start_location = decision_keeper.location
+
+        def setup(laser=laser, decision_keeper=decision_keeper, start_location=start_location):
+            laser.rewind()
+            decision_keeper.location = start_location
+            decision_keeper.facing_degree = 0
+            decision_keeper.tracker.clear()
+
+        cases[name] = (decision_keeper.prevent_attack, 1, setup)
+    return cases
+
+
+def measure_startup(repeat):
+    """
+    Measure a cold start of the keeper process, once per new interpreter.
+
+    Args:
+        repeat (int): How many interpreters are started.
+
+    Returns:
+    dict: Per step of the start (the import of `poetry_demo.goalKeeper`, the construction of a keeper with its
+        listening thread and with `fast_start`, and the first search step of a keeper with a backend) the
+        median and minimum time in microseconds.
+
+    Explanation:
+    - Only a new interpreter imports the modules for the first time, in this process they are imported already.
+    """
+    package_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    environment = dict(os.environ)
+    environment["PYTHONPATH"] = os.pathsep.join(filter(None, (package_root, environment.get("PYTHONPATH"))))
+    timings = {}
+    for _ in range(repeat):
+        output = subprocess.run(
+            [sys.executable, "-c", STARTUP_SCRIPT], env=environment, capture_output=True, text=True, check=True
+        ).stdout
+        for name, seconds in json.loads(output).items():
+            timings.setdefault(name, []).append(seconds)
+    return {
+        name: {"median_us": statistics.median(values) * 1e6, "min_us": min(values) * 1e6}
+        for name, values in timings.items()
+    }
+
+
+def run_benchmarks(repeat=DEFAULT_REPEAT, startup=True):
+    """
+    Run every benchmark case.
+
+    Args:
+        repeat (int, optional): How many timings are taken per case.
+        startup (bool, optional): Also measure the cold start, see `measure_startup`.
+
+    Returns:
+    dict: The machine description and the results of every case, ready to be written as JSON.
+    """
+    results = {}
+    for name, (function, number, setup) in benchmark_cases().items():
+        results[name] = measure(function, number, repeat, setup)
+    if startup:
+        results.update(measure_startup(repeat))
+    return {
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "results": results,
+    }
+
+
+def trace_decisions(path, decisions=100):
+    """
+    Play the recorded decisions with instrumentation on and dump the trace.
+
+    Args:
+        path (str): Where to write the trace, a `.npz` file.
+        decisions (int, optional): How many times each recorded decision is played.
+
+    Returns:
+        dict: The instrumentation summary, see `Instrumentation.summary`.
+    """
+    instrumentation = Instrumentation()
+    for sweep_mode in (False, True):
+        laser = record_script(sweep_mode)
+        for _ in range(decisions):
+            laser.rewind()
+            keeper = GoalKeeper(backend=laser)
+            keeper.sweep_mode = sweep_mode
+            instrumentation.attach(keeper)
+            keeper.prevent_attack()
+            instrumentation.detach()
+    instrumentation.dump(path)
+    return instrumentation.summary()
+
+
+def compare(current, baseline, threshold=DEFAULT_THRESHOLD):
+    """
+    Compare a run against a baseline run.
+
+    Args:
+        current (dict): The output of `run_benchmarks`.
+        baseline (dict): A stored output of `run_benchmarks`.
+        threshold (float, optional): The allowed growth as a fraction of the baseline, for the time and the memory.
+
+    Returns:
+    list: (name, metric, baseline, current) for every measurement of `GATED_METRICS` over the threshold.
+
+    Explanation:
+    - The memory high-water mark and the retained memory are gated like the median time. A memory measurement
+    may also grow by `MEMORY_SLACK` bytes, a case that allocates nothing would otherwise fail on a single object.
+    - The startup cases have no memory measurement, only their time is gated.
+    """
+    regressions = []
+    for name, result in current["results"].items():
+        if name not in baseline["results"]:
+            continue
+        for metric in GATED_METRICS:
+            if metric not in result or metric not in baseline["results"][name]:
+                continue
+            allowed = baseline["results"][name][metric] * (1 + threshold)
+            if metric.endswith("_bytes"):
+                allowed += MEMORY_SLACK
+            if result[metric] > allowed:
+                regressions.append((name, metric, baseline["results"][name][metric], result[metric]))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the GoalKeeper perception-to-decision hot path.")
+    parser.add_argument("--output", default="benchmark-results.json", help="where to write the results")
+    parser.add_argument("--baseline", help="a stored results file to compare against")
+    parser.add_argument(
+        "--threshold", type=float, default=DEFAULT_THRESHOLD, help="allowed slowdown and memory growth, 0.1 is 10%%"
+    )
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT, help="timings per case")
+    parser.add_argument("--update-baseline", action="store_true", help="store this run as the baseline")
+    parser.add_argument("--trace", help="where to dump a trace of the recorded decisions")
+    parser.add_argument("--no-startup", action="store_true", help="skip the cold start cases")
+    args = parser.parse_args(argv)
+
+    current = run_benchmarks(args.repeat, not args.no_startup)
+    with open(args.output, "w") as results_file:
+        json.dump(current, results_file, indent=2)
+
+    for name, result in current["results"].items():
+        if "peak_bytes" in result:
+            print(f"{name:30} {result['median_us']:10.2f} us  peak {result['peak_bytes']:8d} B")
+        else:
+            print(f"{name:30} {result['median_us']:10.2f} us")
+
+    if args.trace:
+        summary = trace_decisions(args.trace)
+        for category, self_us in summary["categories"].items():
+            print(f"{category:30} {self_us / summary['decisions']:10.2f} us per decision")
+
+    if args.baseline is None:
+        return 0
+    if args.update_baseline:
+        with open(args.baseline, "w") as baseline_file:
+            json.dump(current, baseline_file, indent=2)
+        return 0
+
+    with open(args.baseline) as baseline_file:
+        baseline = json.load(baseline_file)
+    regressions = compare(current, baseline, args.threshold)
+    for name, metric, baseline_value, current_value in regressions:
+        print(f"REGRESSION {name} {metric}: {baseline_value:.2f} -> {current_value:.2f}")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
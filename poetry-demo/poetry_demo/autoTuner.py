@@ -0,0 +1,149 @@
+# Dependencies:
+# - math: Computes the angular sizes of the ball and of a robot seen by the laser.
+import math
+
+from poetry_demo.goalKeeper import FACE_MOVEMENT
+
+SWEEP_TIME = 0.18  # seconds a search sweep of the half circle should take, FACE_MOVEMENT steps of LASER_PERIOD
+LATTICE_STEPS = (1, 1.5, 2, 2.5, 3, 4.5, 5, 6, 7.5, 9, 10)  # face movements that divide 90, and so 180 and 360
+SMOOTHING = 0.2  # weight of a new measurement in the moving averages
+EPSILON_BIAS = 0.0  # degrees above the low end of the epsilon window
+WARMUP = 8  # laser readings measured before the tuner changes the face movement
+
+
+class AutoTuner:
+    """
+    Online tuning of `face_movement` and `epsilon_degree` from what the keeper measures during play.
+
+    Explanation:
+    - The keeper reports the time of every laser reading on its own clock (`GoalKeeper.now`, the simulated time
+    with a simulator backend), and the distance of every hit it classifies. One tuner can be shared by the keepers
+    of consecutive shots, it keeps learning across them.
+    - Face movement: a search sweep of the half circle costs 180 / face_movement laser readings. The tuner picks
+    the smallest step of `LATTICE_STEPS` that keeps the sweep within `sweep_time` at the measured laser latency,
+    a slow laser scans coarsely. The step never exceeds the angular width of the ball at the far end of the
+    field, wider steps could pass over it, and never goes below `min_face_movement`: every heading of a finer
+    search is one more reading before the ball is seen again.
+    - The step is tuned from the laser latency only. A rotation sets the facing degree and the game manager turns
+    the robot, the keeper has no rotation command to time.
+    - Epsilon: `encountered_a_ball` looks to the sides of a hit at distance d, atan(robot_radius / d) - epsilon
+    degrees away. A robot still covers that heading and the ball does not when the offset lies between their
+    angular half-widths, asin(radius / (d + radius)), which bounds epsilon to a window that depends on d.
+    The tuner keeps epsilon in the window of the recent hit distance (a moving average), at its low end plus
+    `bias`, clamped to the window.
+    - The low end is the widest offset that still sees a robot hit at its center. A hit near the edge of the
+    ball puts one side inside the ball whatever epsilon is, the widest offset makes that least likely.
+    - Epsilon is tuned from the hit distance only, not from the classification outcomes. Whether a track stands
+    still does not tell if its classification was right, and learning from it pushed the bias to the edges of
+    the window in the simulator without saving more shots.
+
+    Assumptions:
+    - Turning to the next heading takes little time next to a laser reading.
+    """
+
+    def __init__(
+        self,
+        sweep_time=SWEEP_TIME,
+        min_face_movement=FACE_MOVEMENT,
+        smoothing=SMOOTHING,
+        bias=EPSILON_BIAS,
+        warmup=WARMUP,
+    ):
+        self.sweep_time = sweep_time
+        self.min_face_movement = min_face_movement
+        self.smoothing = smoothing
+        self.warmup = warmup
+        self.laser_latency = None  # seconds per laser reading, moving average
+        self.distance = None  # distance of the classified hits, moving average
+        self.bias = bias  # degrees from the low end of the epsilon window
+        self.readings = 0
+
+    def state(self):
+        """
+        Get what the tuner learned, as (laser latency, distance, bias, readings), NaN for the
+        averages without a measurement. See `restore`.
+        """
+        laser_latency = math.nan if self.laser_latency is None else self.laser_latency
+        distance = math.nan if self.distance is None else self.distance
+        return (laser_latency, distance, self.bias, self.readings)
+
+    def restore(self, state):
+        """
+        Continue from a `state()`, the one of the tuner of a keeper that was restarted.
+        """
+        laser_latency, distance, self.bias, self.readings = state
+        self.laser_latency = None if math.isnan(laser_latency) else laser_latency
+        self.distance = None if math.isnan(distance) else distance
+
+    def average(self, mean, value):
+        if mean is None:
+            return value
+        return mean + self.smoothing * (value - mean)
+
+    def observe_laser(self, seconds, readings=1):
+        """
+        Record the time of `readings` laser readings taken together.
+        """
+        if readings:
+            self.laser_latency = self.average(self.laser_latency, seconds / readings)
+            self.readings += readings
+
+    def observe_hit(self, distance):
+        if distance > 0:
+            self.distance = self.average(self.distance, distance)
+
+    def epsilon_bounds(self, keeper, distance):
+        """
+        Get the epsilon window of a hit at `distance`, see the class explanation.
+
+        Returns:
+            tuple: (low, high) in degrees.
+        """
+        facing = math.degrees(math.atan(keeper.robot_radius / distance))
+        low = facing - math.degrees(math.asin(keeper.robot_radius / (distance + keeper.robot_radius)))
+        high = facing - math.degrees(math.asin(keeper.ball_radius / (distance + keeper.ball_radius)))
+        return low, high
+
+    def epsilon(self, keeper):
+        """
+        Get the tuned epsilon, the keeper's own before the first classified hit.
+        """
+        if self.distance is None:
+            return keeper.epsilon_degree
+        low, high = self.epsilon_bounds(keeper, self.distance)
+        return low + min(max(self.bias, 0.0), high - low)
+
+    def max_face_movement(self, keeper):
+        """
+        Get the angular width of the ball at the far end of the field, in degrees.
+        """
+        reach = math.hypot(keeper.field_width, keeper.field_length)
+        return 2 * math.degrees(math.asin(keeper.ball_radius / (reach + keeper.ball_radius)))
+
+    def face_movement(self, keeper):
+        """
+        Get the tuned face movement, the keeper's own until `warmup` laser readings were measured.
+        """
+        if self.readings < self.warmup:
+            return keeper.face_movement
+        wanted = 180 * self.laser_latency / self.sweep_time
+        largest = self.max_face_movement(keeper)
+        step = self.min_face_movement
+        for candidate in LATTICE_STEPS:
+            if candidate < self.min_face_movement:
+                continue
+            if candidate > largest:
+                break
+            step = candidate
+            if candidate >= wanted - 1e-9:
+                break
+        return step
+
+    def apply(self, keeper):
+        """
+        Set the tuned parameters on the keeper.
+        """
+        step = self.face_movement(keeper)
+        if step != keeper.face_movement:
+            keeper.set_face_movement(step)
+        keeper.epsilon_degree = self.epsilon(keeper)
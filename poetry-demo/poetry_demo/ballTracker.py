@@ -0,0 +1,216 @@
+# Dependencies:
+# - math: Provides mathematical functions.
+import math
+
+
+class BallTracker:
+    """
+    Follow the ball over its last `window` sightings and fit a linear trajectory to them.
+
+    Explanation:
+    - The sightings are kept in a fixed-size ring buffer that is allocated once, when the tracker is created. The
+    buffer is made of plain lists of floats, the tracker reads and writes single values, and imports no NumPy.
+    - Every sighting carries the time it was taken, for the velocity of the ball.
+    - Alongside the buffer the tracker keeps the running least-squares sums (n, sum x, sum y, sum x^2, sum xy).
+    - When a new sighting arrives the oldest one is subtracted from the sums and the new one is added,
+        so every update and every fit costs the same no matter how long the window is.
+    - Subtracting leaves a rounding error in the sums that grows with every update. Every `window` wraps of the
+        ring buffer the sums are recomputed from the buffer, which keeps the average cost of an update constant.
+
+    Math Explanation:
+    - For the line y = slope * x + intercept the least-squares solution is:
+        slope = (n * sum_xy - sum_x * sum_y) / (n * sum_xx - sum_x^2)
+        intercept = (sum_y - slope * sum_x) / n
+    """
+
+    def __init__(self, window=2):
+        if window < 2:
+            raise ValueError("The tracker needs a window of at least two points to fit a line.")
+        self.window = window
+        self.xs = [0.0] * window
+        self.ys = [0.0] * window
+        self.ts = [0.0] * window
+        self.count = 0
+        self.newest = -1  # index of the latest sighting in the ring buffer
+        self.wraps = 0  # wraps of the ring buffer since the sums were last recomputed
+        self.sum_x = 0.0
+        self.sum_y = 0.0
+        self.sum_xx = 0.0
+        self.sum_xy = 0.0
+
+    def __len__(self):
+        return self.count
+
+    def clear(self):
+        """
+        Forget every sighting. The buffer is kept and reused.
+        """
+        self.count = 0
+        self.newest = -1
+        self.wraps = 0
+        self.sum_x = self.sum_y = self.sum_xx = self.sum_xy = 0.0
+
+    def push(self, x, y, t=0.0):
+        """
+        Add a sighting of the ball, dropping the oldest one if the window is full.
+
+        Args:
+            x (float): The x-coordinate of the ball.
+            y (float): The y-coordinate of the ball.
+            t (float, optional): The time of the sighting in seconds.
+
+        Returns:
+            None
+        """
+        index = (self.newest + 1) % self.window
+        if self.count == self.window:
+            # The slot we are about to overwrite holds the oldest sighting, remove it from the sums
+            old_x = self.xs[index]
+            old_y = self.ys[index]
+            self.sum_x -= old_x
+            self.sum_y -= old_y
+            self.sum_xx -= old_x * old_x
+            self.sum_xy -= old_x * old_y
+        else:
+            self.count += 1
+
+        self.xs[index] = x
+        self.ys[index] = y
+        self.ts[index] = t
+        self.newest = index
+        self.sum_x += x
+        self.sum_y += y
+        self.sum_xx += x * x
+        self.sum_xy += x * y
+
+        if index == self.window - 1 and self.count == self.window:
+            self.wraps += 1
+            if self.wraps == self.window:
+                self.resum()
+
+    def resum(self):
+        """
+        Recompute the running sums from the full buffer, dropping the accumulated rounding error.
+        """
+        self.sum_x = math.fsum(self.xs)
+        self.sum_y = math.fsum(self.ys)
+        self.sum_xx = math.fsum(x * x for x in self.xs)
+        self.sum_xy = math.fsum(x * y for x, y in zip(self.xs, self.ys))
+        self.wraps = 0
+
+    def points(self):
+        """
+        Get the sightings in the window.
+
+        Returns:
+        list: (x, y) tuples ordered from the oldest to the latest sighting.
+        """
+        indexes = [i % self.window for i in range(self.newest - self.count + 1, self.newest + 1)]
+        return [(self.xs[i], self.ys[i]) for i in indexes]
+
+    def last_delta_x(self):
+        """
+        Get how much the ball moved along the x axis between the two latest sightings.
+
+        Returns:
+            float: The x difference, positive when the ball is moving towards the enemy goal.
+        """
+        return self.xs[self.newest] - self.xs[self.newest - 1]
+
+    def velocity(self):
+        """
+        Get the velocity of the ball between the oldest and the latest sighting in the window.
+
+        Returns:
+            tuple: The (x, y) velocity in field units per second, or None if there are less than two sightings
+                or they share the same time.
+        """
+        if self.count < 2:
+            return None
+        oldest = (self.newest - self.count + 1) % self.window
+        elapsed = self.ts[self.newest] - self.ts[oldest]
+        if elapsed <= 0:
+            return None
+        return (
+            (self.xs[self.newest] - self.xs[oldest]) / elapsed,
+            (self.ys[self.newest] - self.ys[oldest]) / elapsed,
+        )
+
+    def time_to_line(self, x):
+        """
+        Get how long the ball needs to reach the vertical line at `x`, at its current velocity.
+
+        Args:
+            x (float): The x-coordinate of the line.
+
+        Returns:
+            float: The time in seconds from the latest sighting, math.inf if the ball is not moving towards the line.
+        """
+        velocity = self.velocity()
+        distance = x - self.xs[self.newest]
+        if velocity is None or velocity[0] == 0 or (distance > 0) != (velocity[0] > 0):
+            return math.inf
+        return distance / velocity[0]
+
+    def last_time(self):
+        return self.ts[self.newest]
+
+    def fit(self):
+        """
+        Fit a linear function to the sightings in the window.
+
+        Returns:
+        tuple: The slope and intercept of the fitted line, or None if the line is vertical
+            (all the sightings share the same x-coordinate).
+        """
+        denominator = self.count * self.sum_xx - self.sum_x * self.sum_x
+        if abs(denominator) < 1e-12:
+            return None
+        slope = (self.count * self.sum_xy - self.sum_x * self.sum_y) / denominator
+        intercept = (self.sum_y - slope * self.sum_x) / self.count
+        return slope, intercept
+
+    def residual(self, coefficients):
+        """
+        Get the distance of the latest sighting from a fitted line.
+
+        Args:
+            coefficients (tuple): The slope and intercept of the line, as returned by `fit`.
+
+        Returns:
+            float: The distance in field units, math.inf if there is no line or no sighting.
+        """
+        if coefficients is None or self.count == 0:
+            return math.inf
+        slope, intercept = coefficients
+        return abs(slope * self.xs[self.newest] + intercept - self.ys[self.newest]) / math.hypot(slope, 1.0)
+
+    def estimate(self):
+        """
+        Estimate the y-coordinate of the ball at its latest x-coordinate on the fitted line.
+
+        Returns:
+            float: The estimated y-coordinate of the ball.
+        """
+        coefficients = self.fit()
+        if coefficients is None:
+            # A vertical line gives no slope, the latest sighting is our best estimate
+            return self.ys[self.newest]
+        slope, intercept = coefficients
+        return self.xs[self.newest] * slope + intercept
+
+    def estimate_at(self, x):
+        """
+        Estimate the y-coordinate where the fitted trajectory crosses the vertical line at `x`.
+
+        Args:
+            x (float): The x-coordinate of the line.
+
+        Returns:
+            float: The estimated y-coordinate, the latest y-coordinate if the line is vertical.
+        """
+        coefficients = self.fit()
+        if coefficients is None:
+            return self.ys[self.newest]
+        slope, intercept = coefficients
+        return x * slope + intercept
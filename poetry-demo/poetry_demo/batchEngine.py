@@ -0,0 +1,336 @@
+# Dependencies:
+# - numpy (as np): Holds the state of every keeper in arrays and advances all of them at once.
+import numpy as np
+
+from poetry_demo.goalKeeper import (
+    BALL_RADIUS,
+    BOUNDARY_TOLERANCE,
+    FACE_MOVEMENT,
+    FIELD_LENGTH,
+    FIELD_WIDTH,
+    GOAL_DEPTH,
+    GOAL_WIDTH,
+    ROBOT_RADIUS,
+    TRACKER_WINDOW,
+)
+from poetry_demo.motionPlanner import STEP_TOLERANCE
+from poetry_demo.simulator import LASER_PERIOD, SHOT_DURATION
+
+# Assumptions:
+# Same Rules:
+# Every keeper follows the rules of GoalKeeper.prevent_attack, go_to_location and will_enter_goal, against its own
+# ball, on the field of FieldSimulator. One tick of the engine is one iteration of the prevent_attack loop.
+
+# Ball Only:
+# There are no opposing robots or teammates in the batch, so every object the laser hits is the ball.
+# The classification by encountered_a_ball is not repeated, only the simulated time of its three extra laser
+# readings is charged.
+# A shot where GoalKeeper's classification takes the ball for a robot, a ball close enough to touch the keeper,
+# is the only case where the outcomes of the two differ.
+
+# Decision:
+# Once a keeper decides, it moves to the decided y-coordinate with go_to_location and holds there,
+# the rest of the shot is resolved in closed form, the same as FieldSimulator.play_shot.
+
+GOAL = 0
+SAVED = 1
+WIDE = 2
+CLASSIFICATION_READINGS = 3  # laser readings of encountered_a_ball charged on every hit
+
+
+class KeeperBatch:
+    """
+    Struct-of-arrays engine that runs N goalkeepers against N shots at once.
+
+    Explanation:
+    - Every attribute of a keeper (location, facing degree, search direction, tracker ring buffer and its running
+    sums) and of its ball is a column of an array with one row per keeper.
+    - `step` advances every keeper that is still searching by one iteration of `prevent_attack`, with NumPy
+    operations over the rows instead of a Python loop over keeper objects.
+    - `run` steps until every keeper has decided or its shot is over, then resolves the outcomes.
+    """
+
+    def __init__(
+        self,
+        positions,
+        velocities,
+        face_movement=FACE_MOVEMENT,
+        tracker_window=TRACKER_WINDOW,
+        step_size=ROBOT_RADIUS / 2,
+        laser_period=LASER_PERIOD,
+        duration=SHOT_DURATION,
+    ):
+        positions = np.asarray(positions, dtype=float)
+        velocities = np.asarray(velocities, dtype=float)
+        count = len(positions)
+        self.count = count
+        self.face_movement = face_movement
+        self.window = tracker_window
+        self.step_size = step_size
+        self.laser_period = laser_period
+        self.duration = duration
+        self.field_length = FIELD_LENGTH
+        self.field_width = FIELD_WIDTH
+        self.goal_width = GOAL_WIDTH
+        self.goal_depth = GOAL_DEPTH
+        self.robot_radius = ROBOT_RADIUS
+        self.ball_radius = BALL_RADIUS
+
+        # Keepers, at the base facing 90 degrees, where prevent_attack starts its search
+        self.x = np.full(count, self.goal_depth + self.robot_radius, dtype=float)
+        self.y = np.full(count, self.field_length / 2, dtype=float)
+        self.facing = np.full(count, 90.0)
+        self.search_direction = np.ones(count, dtype=bool)
+        self.decided = np.zeros(count, dtype=bool)
+        self.decision_y = np.full(count, np.nan)
+
+        # Tracker ring buffers and running least-squares sums, see BallTracker
+        self.track_x = np.zeros((count, tracker_window))
+        self.track_y = np.zeros((count, tracker_window))
+        self.track_count = np.zeros(count, dtype=np.int64)
+        self.track_newest = np.full(count, -1, dtype=np.int64)
+        self.sum_x = np.zeros(count)
+        self.sum_y = np.zeros(count)
+        self.sum_xx = np.zeros(count)
+        self.sum_xy = np.zeros(count)
+
+        # Balls and their simulated clocks
+        self.ball_x = positions[:, 0].copy()
+        self.ball_y = positions[:, 1].copy()
+        self.ball_vx = velocities[:, 0].copy()
+        self.ball_vy = velocities[:, 1].copy()
+        self.time = np.zeros(count)
+        self.laser_activations = np.zeros(count, dtype=np.int64)
+
+    def shot_over(self):
+        """
+        Get the keepers whose shot is over: the ball crossed the goal line, left the field or the time ran out.
+        """
+        out_of_field = (self.ball_x < 0) | (self.ball_x > self.field_width)
+        out_of_field |= (self.ball_y < 0) | (self.ball_y > self.field_length)
+        return (self.time >= self.duration) | (self.ball_x <= self.goal_depth) | out_of_field
+
+    def searching(self):
+        """
+        Get the keepers that are still in the prevent_attack loop.
+        """
+        return ~self.decided & ~self.shot_over()
+
+    def advance(self, rows, readings):
+        """
+        Move the simulated clock and the balls of `rows` forward by `readings` laser readings.
+        """
+        seconds = readings * self.laser_period
+        self.time[rows] += seconds
+        self.ball_x[rows] += self.ball_vx[rows] * seconds
+        self.ball_y[rows] += self.ball_vy[rows] * seconds
+        self.laser_activations[rows] += readings
+
+    def laser(self, rows):
+        """
+        Measure the laser distance of the keepers in `rows`, see `FieldSimulator.ray_distances`.
+        """
+        radian_angles = np.radians(self.facing[rows])
+        dx = np.cos(radian_angles)
+        dy = np.sin(radian_angles)
+        origin_x = self.x[rows]
+        origin_y = self.y[rows]
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            to_x = np.where(dx > 0, (self.field_width - origin_x) / dx, np.where(dx < 0, -origin_x / dx, np.inf))
+            to_y = np.where(dy > 0, (self.field_length - origin_y) / dy, np.where(dy < 0, -origin_y / dy, np.inf))
+        distances = np.minimum(to_x, to_y)
+
+        offset_x = self.ball_x[rows] - origin_x
+        offset_y = self.ball_y[rows] - origin_y
+        b = dx * offset_x + dy * offset_y
+        discriminant = b * b - (offset_x * offset_x + offset_y * offset_y - self.ball_radius**2)
+        hit = discriminant >= 0
+        t = b - np.sqrt(np.where(hit, discriminant, 0))
+        distances = np.where(hit & (t > 0) & (t < distances), t, distances)
+        return origin_x + distances * dx, origin_y + distances * dy
+
+    def push(self, rows, object_x, object_y):
+        """
+        Add a sighting to the tracker of every keeper in `rows`, see `BallTracker.push`.
+        """
+        index = (self.track_newest[rows] + 1) % self.window
+        full = self.track_count[rows] == self.window
+        old_x = np.where(full, self.track_x[rows, index], 0)
+        old_y = np.where(full, self.track_y[rows, index], 0)
+
+        self.track_x[rows, index] = object_x
+        self.track_y[rows, index] = object_y
+        self.track_newest[rows] = index
+        self.track_count[rows] += ~full
+        self.sum_x[rows] += object_x - old_x
+        self.sum_y[rows] += object_y - old_y
+        self.sum_xx[rows] += object_x * object_x - old_x * old_x
+        self.sum_xy[rows] += object_x * object_y - old_x * old_y
+
+    def estimate(self, rows):
+        """
+        Estimate the y-coordinate of the ball of every keeper in `rows`, see `BallTracker.estimate`.
+        """
+        count = self.track_count[rows]
+        sum_x = self.sum_x[rows]
+        sum_y = self.sum_y[rows]
+        denominator = count * self.sum_xx[rows] - sum_x * sum_x
+        vertical = np.abs(denominator) < 1e-12
+        safe_denominator = np.where(vertical, 1, denominator)
+        slope = (count * self.sum_xy[rows] - sum_x * sum_y) / safe_denominator
+        intercept = (sum_y - slope * sum_x) / count
+        newest = self.track_newest[rows]
+        newest_x = self.track_x[rows, newest]
+        newest_y = self.track_y[rows, newest]
+        return np.where(vertical, newest_y, newest_x * slope + intercept)
+
+    def step(self):
+        """
+        Advance every keeper that is still searching by one iteration of the `prevent_attack` loop.
+
+        Returns:
+            int: The number of keepers that were advanced.
+
+        Explanation:
+        - A keeper facing away from the field, (90, 270) degrees, turns back to 90.
+        - Every keeper fires its laser. A reading on the field boundary means nothing was seen, and the keeper
+        rotates one `face_movement` step in its search direction.
+        - A hit is pushed to the keeper's tracker. With two sightings or more and the ball not moving towards the
+        enemy goal, the keeper estimates the y-coordinate, and decides if it is within the goal.
+        """
+        rows = np.flatnonzero(self.searching())
+        if rows.size == 0:
+            return 0
+
+        facing = self.facing[rows]
+        self.facing[rows] = np.where((facing > 90) & (facing < 270), 90.0, facing)
+
+        self.advance(rows, 1)
+        object_x, object_y = self.laser(rows)
+        nothing = (object_x <= BOUNDARY_TOLERANCE) | (object_x >= self.field_width - BOUNDARY_TOLERANCE)
+        nothing |= (object_y <= BOUNDARY_TOLERANCE) | (object_y >= self.field_length - BOUNDARY_TOLERANCE)
+
+        missed = rows[nothing]
+        turn = np.where(self.search_direction[missed], -self.face_movement, self.face_movement)
+        self.facing[missed] = (self.facing[missed] + turn) % 360
+
+        hit = ~nothing
+        seen = rows[hit]
+        if seen.size == 0:
+            return rows.size
+        self.advance(seen, CLASSIFICATION_READINGS)
+        self.push(seen, object_x[hit], object_y[hit])
+
+        newest = self.track_newest[seen]
+        moving_away = self.track_x[seen, newest] - self.track_x[seen, newest - 1] > 0
+        ready = seen[(self.track_count[seen] >= 2) & ~moving_away]
+        if ready.size:
+            y_estimation = self.estimate(ready)
+            entering = ((self.field_length - self.goal_width) / 2 <= y_estimation) & (
+                y_estimation <= (self.field_length + self.goal_width) / 2
+            )
+            self.decided[ready[entering]] = True
+            self.decision_y[ready[entering]] = y_estimation[entering]
+        return rows.size
+
+    def go_to_decisions(self):
+        """
+        Move every keeper that decided to (goal_depth + robot_radius, decision_y), see `MotionPlanner.plan`.
+        """
+        rows = np.flatnonzero(self.decided)
+        delta_x = self.goal_depth + self.robot_radius - self.x[rows]
+        delta_y = self.decision_y[rows] - self.y[rows]
+        heading = (np.degrees(np.arctan2(delta_y, delta_x)) + 360) % 360
+        distance = np.sqrt(delta_x**2 + delta_y**2)
+        radian_angle = np.radians(heading)
+        step_x = self.step_size * np.cos(radian_angle)
+        step_y = self.step_size * np.sin(radian_angle)
+        # The rounding residues of cos and sin at right angles are 0, see MotionPlanner.plan
+        step_x[np.abs(step_x) < STEP_TOLERANCE] = 0.0
+        step_y[np.abs(step_y) < STEP_TOLERANCE] = 0.0
+        steps = np.ceil(distance / self.step_size)
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            limit_x = np.where(
+                step_x > 0,
+                np.floor((self.field_width - self.x[rows]) / step_x),
+                np.where(step_x < 0, np.floor(self.x[rows] / -step_x), np.inf),
+            )
+            limit_y = np.where(
+                step_y > 0,
+                np.floor((self.field_length - self.y[rows]) / step_y),
+                np.where(step_y < 0, np.floor(self.y[rows] / -step_y), np.inf),
+            )
+        steps = np.maximum(0, np.minimum(steps, np.minimum(limit_x, limit_y)))
+        self.facing[rows] = heading
+        self.x[rows] += steps * step_x
+        self.y[rows] += steps * step_y
+
+    def resolve(self):
+        """
+        Resolve the shot of every keeper, see `FieldSimulator.resolve`.
+
+        Returns:
+        numpy.ndarray: GOAL, SAVED or WIDE for every keeper.
+        """
+        offset_x = self.ball_x - self.x
+        offset_y = self.ball_y - self.y
+        reach = self.ball_radius + self.robot_radius
+        a = self.ball_vx**2 + self.ball_vy**2
+        b = offset_x * self.ball_vx + offset_y * self.ball_vy
+        c = offset_x**2 + offset_y**2 - reach * reach
+        discriminant = b * b - a * c
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            hit_time = (-b - np.sqrt(np.where(discriminant >= 0, discriminant, 0))) / a
+            hit_time = np.where((a > 0) & (discriminant >= 0) & (hit_time >= 0), hit_time, np.inf)
+            goal_time = np.where(self.ball_vx < 0, (self.goal_depth - self.ball_x) / self.ball_vx, np.inf)
+        goal_y = self.ball_y + self.ball_vy * np.where(np.isfinite(goal_time), goal_time, 0)
+        in_mouth = ((self.field_length - self.goal_width) / 2 <= goal_y) & (
+            goal_y <= (self.field_length + self.goal_width) / 2
+        )
+
+        saved = (c <= 0) | (np.isfinite(hit_time) & (hit_time <= goal_time))
+        goal = ~saved & np.isfinite(goal_time) & in_mouth
+        return np.where(saved, SAVED, np.where(goal, GOAL, WIDE))
+
+    def run(self, max_ticks=100000):
+        """
+        Play every shot to the end.
+
+        Args:
+            max_ticks (int, optional): A bound on the number of ticks.
+
+        Returns:
+        numpy.ndarray: GOAL, SAVED or WIDE for every keeper.
+        """
+        for _ in range(max_ticks):
+            if not self.step():
+                break
+        self.go_to_decisions()
+        return self.resolve()
+
+
+def evaluate_shots(positions, velocities, **parameters):
+    """
+    Play a batch of shots with one keeper per shot.
+
+    Args:
+        positions (numpy.ndarray): (N, 2) kick positions.
+        velocities (numpy.ndarray): (N, 2) ball velocities.
+        **parameters: Keeper parameters passed to `KeeperBatch`.
+
+    Returns:
+        dict: The save rate, the counts of every outcome and the mean simulated decision time in seconds.
+    """
+    batch = KeeperBatch(positions, velocities, **parameters)
+    outcomes = batch.run()
+    decided = batch.decided
+    return {
+        "save_rate": float(np.mean(outcomes == SAVED)) if len(outcomes) else 0.0,
+        "saved": int(np.sum(outcomes == SAVED)),
+        "goals": int(np.sum(outcomes == GOAL)),
+        "wide": int(np.sum(outcomes == WIDE)),
+        "mean_decision_time": float(batch.time[decided].mean()) if decided.any() else float("nan"),
+    }
@@ -0,0 +1,134 @@
+# Dependencies:
+# - collections.namedtuple: Builds the estimate type.
+# - numpy (as np): Draws and fits every trajectory sample in one batch. Imported on first use, see LazyModule.
+from collections import namedtuple
+
+from poetry_demo.lazyImport import LazyModule
+
+np = LazyModule("numpy")
+
+GOAL_SAMPLES = 2048  # trajectory samples drawn per estimate
+LASER_NOISE = 0.01  # standard deviation of a laser distance, in field units. Set it to the noise of the laser
+ENTRY_THRESHOLD = 0.7  # goal-entry probability the keeper commits at, see GoalEntrySampler
+
+GoalEntryEstimate = namedtuple("GoalEntryEstimate", ("probability", "intercepts", "coverage_y", "coverage"))
+GoalEntryEstimate.__doc__ = """
+The result of `GoalEntrySampler.estimate`.
+
+Fields:
+- probability (float): The fraction of the samples whose trajectory enters the goal.
+- intercepts (numpy.ndarray): Where the entering samples cross the line the keeper defends, sorted.
+- coverage_y (float): The y-coordinate on that line that blocks the most entering samples.
+- coverage (float): The fraction of all the samples a keeper at `coverage_y` blocks.
+"""
+
+
+class GoalEntrySampler:
+    """
+    Monte Carlo estimate of the chance the ball enters the goal, and of the keeper position that covers it best.
+
+    Explanation:
+    - A sighting is a point of the outline of the ball, the laser cannot tell which one. So every sample places
+    the center of the ball `ball_radius` behind each sighting, on a random side of the half of the ball facing
+    the robot, and adds Gaussian laser noise of `noise` field units. A sample puts the center on the same side for
+    every sighting in the window: the sightings are a few laser reads apart, taken from nearly the same direction,
+    and the laser hits the same side of the ball. A side drawn for each sighting alone moves the centers of two
+    sightings up to a ball diameter apart, more than the ball moves between them.
+    - A line is fitted to every sample at once from the least-squares sums over the window, the same fit as
+    `BallTracker.fit`. The samples are laid out as (window, samples) arrays, so every sum is a few vector
+    additions and no Python loop runs per sample.
+    - A sample enters the goal when it moves towards our goal (its x decreases from the oldest to the latest
+    sighting), its line crosses the goal line inside the goal mouth, and its ball does not touch the robot
+    already: the robot blocks that ball where it stands.
+    - The keeper at y on the line it defends, x = goal_depth + robot_radius, blocks every trajectory crossing
+    that line within robot_radius + ball_radius of y. On the sorted intercepts the best window of that width is
+    found with one `searchsorted`.
+    - The random draws are standardized, made once per window length and reused by every estimate (common random
+    numbers): an estimate is arithmetic on preallocated draws, and the same sightings always give the same
+    estimate.
+    - `threshold` is the goal-entry probability `search_step` commits at, see `GoalKeeper.goal_entry_estimate`.
+    Two sightings a few laser reads apart leave the direction of the ball uncertain, so even on a clean laser a
+    shot at the goal scores well below 1. A lower threshold commits to the position that covers most of a wide
+    spread instead of waiting for a sighting that narrows it.
+    - The keeper only scores ball sightings that continue the trajectory before them, see
+    `GoalKeeper.check_sighting`: a window that joins the ball and a robot the classification took for it can look
+    like a sure goal.
+
+    Assumptions:
+    - The robot did not move while the sightings in the window were taken.
+    - A sample whose line is vertical keeps the y-coordinate of its latest sighting, as `BallTracker.estimate`
+    does.
+    """
+
+    def __init__(self, samples=GOAL_SAMPLES, noise=LASER_NOISE, threshold=ENTRY_THRESHOLD, seed=0):
+        self.samples = samples
+        self.noise = noise
+        self.threshold = threshold
+        self.seed = seed
+        self.draws = {}  # window length -> the standardized draws, made on first use
+
+    def standard_draws(self, window):
+        """
+        Get the standardized draws for `window` sightings: the cosine and sine of the side of the ball every
+        sample puts the centers on, relative to the laser rays, and the laser noise along x and y.
+        """
+        draws = self.draws.get(window)
+        if draws is None:
+            rng = np.random.default_rng(self.seed)
+            sides = rng.uniform(-np.pi / 2, np.pi / 2, (1, self.samples))
+            noise = rng.standard_normal((2, window, self.samples)) * self.noise
+            draws = self.draws[window] = (np.cos(sides), np.sin(sides), noise[0], noise[1])
+        return draws
+
+    def estimate(self, keeper):
+        """
+        Sample the trajectories of the ball from the keeper's tracker.
+
+        Args:
+            keeper (GoalKeeper): The keeper whose tracker and field are used.
+
+        Returns:
+            GoalEntryEstimate: The estimate, or None if the tracker has less than two sightings.
+        """
+        points = keeper.tracker.points()
+        count = len(points)
+        if count < 2:
+            return None
+        cos_sides, sin_sides, noise_x, noise_y = self.standard_draws(count)
+
+        sightings = np.array(points)  # (window, 2)
+        location_x, location_y = keeper.location
+        rays = np.arctan2(sightings[:, 1] - location_y, sightings[:, 0] - location_x)
+        ray_x = (keeper.ball_radius * np.cos(rays))[:, None]
+        ray_y = (keeper.ball_radius * np.sin(rays))[:, None]
+        # The center is ball_radius from the sighting, rotated by the side away from the laser ray
+        xs = sightings[:, :1] + cos_sides * ray_x - sin_sides * ray_y + noise_x
+        ys = sightings[:, 1:] + cos_sides * ray_y + sin_sides * ray_x + noise_y
+
+        sum_x = xs.sum(axis=0)
+        sum_y = ys.sum(axis=0)
+        denominator = count * (xs * xs).sum(axis=0) - sum_x * sum_x
+        vertical = np.abs(denominator) < 1e-12
+        denominator[vertical] = 1.0
+        slopes = (count * (xs * ys).sum(axis=0) - sum_x * sum_y) / denominator
+        intercepts = (sum_y - slopes * sum_x) / count
+
+        goal_ys = slopes * keeper.goal_depth + intercepts
+        defended_ys = slopes * (keeper.goal_depth + keeper.robot_radius) + intercepts
+        if vertical.any():
+            goal_ys[vertical] = defended_ys[vertical] = ys[-1, vertical]
+
+        low = (keeper.field_length - keeper.goal_width) / 2
+        high = (keeper.field_length + keeper.goal_width) / 2
+        reach = keeper.robot_radius + keeper.ball_radius
+        touching = np.hypot(xs[-1] - location_x, ys[-1] - location_y) <= reach
+        entering = (xs[-1] < xs[0]) & (goal_ys >= low) & (goal_ys <= high) & ~touching
+        crossings = np.sort(defended_ys[entering])
+        probability = crossings.size / self.samples
+        if not crossings.size:
+            return GoalEntryEstimate(0.0, crossings, float(location_y), 0.0)
+
+        blocked = np.searchsorted(crossings, crossings + 2 * reach, side="right") - np.arange(crossings.size)
+        best = int(np.argmax(blocked))
+        coverage_y = min(max(float(crossings[best]) + reach, 0.0), float(keeper.field_length))
+        return GoalEntryEstimate(probability, crossings, coverage_y, float(blocked[best]) / self.samples)
@@ -1,11 +1,38 @@
 # Dependencies:
+# - logging: Reports the teammate messages that are dropped.
 # - math: Provides mathematical functions.
 # - threading: Supports multithreading capabilities.
-# - numpy (as np): Used for numerical operations and array manipulation.
+# - time: Provides the clock when there is no backend.
+# - numpy (as np): Used for numerical operations and array manipulation. Imported by the first vectorized call,
+#   see LazyModule, a keeper that searches one laser shot at a time never imports it.
+import logging
 import math
 import threading
-
-import numpy as np
+import time
+
+from poetry_demo.ballTracker import BallTracker
+from poetry_demo.keeperState import KeeperState
+from poetry_demo.lazyImport import LazyModule
+from poetry_demo.motionPlanner import MotionPlanner
+from poetry_demo.searchScheduler import HINT_LEFT, HINT_RIGHT, LinearSearch
+from poetry_demo.teammateInbox import MESSAGE_QUEUE_SIZE, TeammateInbox
+from poetry_demo.trackSet import ROBOT, TrackSet
+from poetry_demo.warmStart import CHECKPOINT_PERIOD, SNAPSHOT_MAX_AGE, SnapshotWriter, pack_snapshot, read_snapshot
+from poetry_demo.teammateProtocol import (
+    BINARY_TYPES,
+    MESSAGE_SIZE,
+    OP_BALL_AT_LEFT_CORNER,
+    OP_BALL_AT_RIGHT_CORNER,
+    OP_GO_TO_BASE,
+    OP_POSITION,
+    OP_WRONG_DIRECTION,
+    decode,
+    decode_batch,
+    parse_legacy,
+)
+
+np = LazyModule("numpy")
+logger = logging.getLogger(__name__)
 
 # Assumptions:
 # Constant Step Size:
@@ -37,6 +64,8 @@ import numpy as np
 
 # TODO train our model with hyperparamters: the number of dots we follow to make the liner function,the step size,
 # the angel step size,the search angels
+# The first three are GoalKeeper arguments (tracker_window, step_size, face_movement), and `poetry_demo.tuning`
+# searches them against simulated matches.
 
 
 # use GoalKeeper.run() to start the robort
@@ -50,10 +79,37 @@ GOAL_WIDTH = 5
 GOAL_DEPTH = 2
 EPSILON = 1e10
 FACE_MOVEMENT = 2
+BOUNDARY_TOLERANCE = 1e-6  # how close to the field boundary a laser reading counts as "nothing seen"
+TRACKER_WINDOW = 2  # the number of dots we follow to make the linear function
+MESSAGE_WAIT = 0.5  # seconds the listening thread blocks on the transceiver before checking if it should stop
+DECISION_MARGIN = 0.05  # seconds before the ball reaches the goal line an anytime decision is committed at the latest
+INTERCEPT_TOLERANCE = 0.5  # two consecutive intercepts this close make an anytime decision confident
+RESIDUAL_TOLERANCE = 0.5  # field units, a sighting this close to the previous trajectory continues it
+SWEEP_CHUNK = 4  # headings measured by one sweep call, a sweep stops with the chunk of its first hit
 
 
 class GoalKeeper:
-    def __init__(self):
+    def __init__(
+        self,
+        tracker_window=TRACKER_WINDOW,
+        backend=None,
+        message_queue_size=MESSAGE_QUEUE_SIZE,
+        face_movement=FACE_MOVEMENT,
+        epsilon_degree=EPSILON,
+        step_size=None,
+        search_scheduler=None,
+        anytime=False,
+        decision_margin=DECISION_MARGIN,
+        intercept_tolerance=INTERCEPT_TOLERANCE,
+        residual_tolerance=RESIDUAL_TOLERANCE,
+        multi_tracking=False,
+        fast_start=False,
+        goal_sampler=None,
+        sensor=None,
+        auto_tuner=None,
+        warm_start=None,
+        checkpoint_period=CHECKPOINT_PERIOD,
+    ):
         self.robot_radius = ROBOT_RADIUS
         self.ball_radius = BALL_RADIUS
         self.field_length = FIELD_LENGTH
@@ -63,15 +119,90 @@ class GoalKeeper:
         self.location = (self.goal_depth + self.robot_radius, self.field_length / 2)  # assuming we start at the middle of the goal
         # and that (0,0) is up right corner
         self.facing_degree = 0  # faceing the enemey goal
-        self.step_size = self.robot_radius / 2
-        self.message_check_thread = threading.Thread(target=self.check_teammate_messages)
-        self.message_check_thread.daemon = True
-        self.message_check_thread.start()
-        self.last_seen = []
-        self.search_dirction = 1
-        self.epsilon_degree = EPSILON
+        self.step_size = self.robot_radius / 2 if step_size is None else step_size
+        self.face_movement = face_movement  # degrees of a single search rotation
+        self.motion = MotionPlanner(self.step_size, self.field_width, self.field_length)
+        self.backend = backend  # the laser, transceiver and game clock, None when the game manager provides them
+        self.inbox = TeammateInbox(message_queue_size)
+        self.message_batch = bytearray()  # binary messages drained together, reused between drains
+        self.message_stop = threading.Event()
+        self.message_check_thread = None
+        # Laser samples taken by another process, see SensorWorker. Off when sensor is None, the laser is read here
+        self.sensor = sensor
+        # With fast_start the listening thread is started by run(), constructing a keeper starts no thread
+        if not fast_start:
+            self.start_workers()
+        self.tracker = BallTracker(tracker_window)
+        # Every object the laser hits, see TrackSet. Off when multi_tracking is False, every hit is classified
+        self.tracks = TrackSet(self.robot_radius) if multi_tracking else None
+        self.search_direction = 1
+        self.sweep_mode = False  # when True, prevent_attack searches with vectorized laser sweeps, see sweep_read
+        self.sweep_single = None  # in sweep mode, a heading the next step reads with a single shot, see sweep_report
+        # The headings prevent_attack reads outside sweep mode, see poetry_demo.searchScheduler
+        self.search = LinearSearch() if search_scheduler is None else search_scheduler
+        self.other_object_heading = None  # where the last classification's side read found an object, if it did
+        # Ball sightings checked against the trajectory before them, see check_sighting
+        self.residual_tolerance = residual_tolerance
+        self.sighting_fit = None  # the trajectory fitted at the latest ball sighting of the current decision
+        self.sighting_heading = None  # the laser heading of the latest ball sighting of the current decision
+        # Anytime decisions, see anytime_decision. Off by default, prevent_attack waits for will_enter_goal
+        self.anytime = anytime
+        self.decision_margin = decision_margin
+        self.intercept_tolerance = intercept_tolerance
+        self.intercept = None  # the latest intercept y-coordinate of the current decision
+        self.intercept_deadline = math.inf  # when the current decision has to be committed
+        # Probabilistic decisions, see goal_entry_estimate. Off when goal_sampler is None, will_enter_goal decides
+        self.goal_sampler = goal_sampler
+        self.goal_entry = None  # the latest GoalEntryEstimate
+        self.epsilon_degree = epsilon_degree
+        # Online tuning of face_movement and epsilon_degree, see AutoTuner. Off when auto_tuner is None
+        self.auto_tuner = auto_tuner
         self.team_mate_position = (-1, -1)  # Initialized as out of board so won't interrupt
         # in goal detection before coordinates are sent
+        self.teammate_tolerance = self.robot_radius  # a laser hit on the teammate lands on its outline
+        # The snapshot other threads read, see KeeperState. Written only by the control loop
+        self.state = KeeperState(0, self.location, self.facing_degree, self.team_mate_position)
+        self.message_handlers = {  # teammate message opcode -> action, see process_teammate_message
+            OP_GO_TO_BASE: self.on_go_to_base,
+            OP_BALL_AT_RIGHT_CORNER: self.on_ball_at_right_corner,
+            OP_BALL_AT_LEFT_CORNER: self.on_ball_at_left_corner,
+            OP_WRONG_DIRECTION: self.on_wrong_direction,
+            OP_POSITION: self.on_position,
+        }
+        # Snapshots for a restart, see checkpoint and restore_snapshot. Off when warm_start (the path) is None
+        self.snapshot_writer = SnapshotWriter(warm_start) if warm_start is not None else None
+        self.checkpoint_period = checkpoint_period
+        self.checkpoint_time = -math.inf
+        if warm_start is not None:
+            self.restore_snapshot(read_snapshot(warm_start))
+
+    @property
+    def last_seen(self):
+        """
+        The ball sightings the tracker follows, from the oldest to the latest, as (x, y) tuples.
+        """
+        return self.tracker.points()
+
+    def publish_state(self):
+        """
+        Publish a new snapshot of the robot's state for the other threads, see `KeeperState`.
+
+        Returns:
+            KeeperState: The published snapshot.
+        """
+        self.state = KeeperState(self.state.version + 1, self.location, self.facing_degree, self.team_mate_position)
+        if self.sensor is not None:
+            self.sensor.publish_pose(self.location)
+        return self.state
+
+    def snapshot(self):
+        """
+        Get the latest published snapshot of the robot's state, from any thread and without a lock.
+
+        Returns:
+            KeeperState: The snapshot.
+        """
+        return self.state
 
     def move_right(self):
         """
@@ -175,7 +306,6 @@ class GoalKeeper:
         Assumptions: the rotate is by degrees
 
         """
-
         radian_angle = math.radians(self.facing_degree + direction)
 
         # We want to move self.step_size with direction degrees, so to update the coordinates we draw a triangle,
@@ -195,6 +325,45 @@ class GoalKeeper:
         # Check if the new position is within the field limits
         return 0 <= x <= self.field_width and 0 <= y <= self.field_length
 
+    def is_on_field_boundary(self, x, y):
+        """
+        Check if a laser reading landed on the field boundary, meaning the laser hasn't seen anything.
+
+        Args:
+            x (float or numpy.ndarray): The x-coordinate of the reading.
+            y (float or numpy.ndarray): The y-coordinate of the reading.
+
+        Returns:
+            bool or numpy.ndarray: True where the reading is on (or beyond) the boundary.
+
+        Note:
+        The coordinates are computed with trigonometric functions, so the comparison uses `BOUNDARY_TOLERANCE`
+        instead of exact equality. x runs along the field width and y along the field length,
+        the same as in `is_within_field_limits`.
+        """
+        return (
+            (x <= BOUNDARY_TOLERANCE)
+            | (x >= self.field_width - BOUNDARY_TOLERANCE)
+            | (y <= BOUNDARY_TOLERANCE)
+            | (y >= self.field_length - BOUNDARY_TOLERANCE)
+        )
+
+    def is_teammate(self, x, y):
+        """
+        Check if a laser reading landed on the teammate.
+
+        Args:
+            x (float or numpy.ndarray): The x-coordinate of the reading.
+            y (float or numpy.ndarray): The y-coordinate of the reading.
+
+        Returns:
+            bool or numpy.ndarray: True where the reading is within `teammate_tolerance` of the teammate's position.
+        """
+        delta_x = x - self.team_mate_position[0]
+        delta_y = y - self.team_mate_position[1]
+        reach = self.teammate_tolerance + BOUNDARY_TOLERANCE
+        return delta_x * delta_x + delta_y * delta_y <= reach * reach
+
     def rotate_clockwise(self):
         """
         Rotate the robot in a clockwise direction by a predefined face movement angle.
@@ -203,14 +372,14 @@ class GoalKeeper:
             None
 
         Explanation:
-        - Updates the facing degree by subtracting the predefined face movement angle.
+        - Updates the facing degree by subtracting the face movement angle.
         - Performs a safety check by ensuring the facing degree is within the range [0, 360).
         Assumptions:
-        - The `FACE_MOVEMENT` value can be optimized based on the capabilities of the robot.
+        - The `face_movement` value (default `FACE_MOVEMENT`) can be optimized based on the capabilities of the robot.
         The optimal value should take into account the robot's agility and responsiveness to changes in facing direction.
-        Adjustments to `FACE_MOVEMENT` can be made experimentally to find the most efficient rotation speed.
+        Adjustments to `face_movement` can be made experimentally to find the most efficient rotation speed.
         """
-        self.facing_degree = (self.facing_degree - FACE_MOVEMENT) % 360
+        self.facing_degree = (self.facing_degree - self.face_movement) % 360
 
     def rotate_counter_clockwise(self):
         """
@@ -220,24 +389,87 @@ class GoalKeeper:
             None
 
         Assumptions:
-        - The `FACE_MOVEMENT` value can be optimized based on the capabilities of the robot.
+        - The `face_movement` value (default `FACE_MOVEMENT`) can be optimized based on the capabilities of the robot.
         The optimal value should take into account the robot's agility and responsiveness to changes in facing direction.
-        Adjustments to `FACE_MOVEMENT` can be made experimentally to find the most efficient rotation speed.
+        Adjustments to `face_movement` can be made experimentally to find the most efficient rotation speed.
 
         Explanation:
-        - Updates the facing degree by adding the predefined face movement angle.
+        - Updates the facing degree by adding the face movement angle.
         - Performs a safety check by ensuring the facing degree is within the range [0, 360).
         The modulus operation is applied, although not strictly necessary for safety.
         """
-        self.facing_degree = (self.facing_degree + FACE_MOVEMENT) % 360
+        self.facing_degree = (self.facing_degree + self.face_movement) % 360
+
+    def set_face_movement(self, face_movement):
+        """
+        Change the degrees of a single search rotation, and rebuild what depends on it.
+
+        Args:
+            face_movement (float): The new face movement, in degrees.
+
+        Returns:
+            None
+        """
+        self.face_movement = face_movement
 
     def activate_laser(self):
-        pass
+        """
+        Activate the robot's laser sensor in the current facing degree.
+
+        Returns:
+            float: The distance to the first object or field boundary the laser hits.
+
+        Assumptions:
+        - Without a backend the laser is activated by the game manager.
+        """
+        if self.backend is not None:
+            return self.backend.activate_laser(self.location, self.facing_degree)
+
+    def now(self):
+        """
+        Get the current time in seconds, from the backend clock when there is a backend.
+        """
+        if self.backend is not None:
+            return self.backend.now()
+        return time.monotonic()
+
+    def read_laser(self, cached=False):
+        """
+        Measure the distance in the current facing degree, reusing a fresh reading when allowed.
+
+        Args:
+            cached (bool, optional): Allow a fresh sample of the sensor worker.
+
+        Returns:
+            float: The measured distance.
+
+        Explanation:
+        - Without a sensor worker this is `activate_laser`.
+        - With a sensor worker a cached call first takes the worker's latest sample of the heading, if it is fresh
+        and from the current location (see `SensorWorker.latest`), without waiting for the laser.
+        - Only the ball classification asks for cached readings. The search always fires the laser,
+        it must see the ball move.
+        - With an auto tuner every laser activation is timed on `now`, the backend clock or the monotonic clock
+        without a backend. A sample of the sensor worker is not a laser activation and is not timed.
+        """
+        if cached and self.sensor is not None:
+            distance = self.sensor.latest(self.location, self.facing_degree)
+            if distance is not None:
+                return distance
+        if self.auto_tuner is None:
+            return self.activate_laser()
+        start = self.now()
+        distance = self.activate_laser()
+        self.auto_tuner.observe_laser(self.now() - start)
+        return distance
 
-    def get_laser_poisiton(self):
+    def get_laser_poisiton(self, cached=False):
         """
         Get the position of an object detected by the robot's laser.
 
+        Args:
+            cached (bool, optional): Allow a fresh sample of the sensor worker, see `read_laser`.
+
         Returns:
         tuple: A tuple containing the x and y coordinates of the detected object.
 
@@ -250,41 +482,145 @@ class GoalKeeper:
         object's position relative to the robot.
 
         """
-        distance = self.activate_laser()
+        distance = self.read_laser(cached)
         radian_angle = math.radians(self.facing_degree)
         object_x = self.location[0] + distance * math.cos(radian_angle)
         object_y = self.location[1] + distance * math.sin(radian_angle)
         return object_x, object_y
 
-    def idenifiy(self):
+    def idenifiy(self, cached=False):
         """
         Identify an object detected by the robot's laser.
 
+        Args:
+            cached (bool, optional): Allow a fresh sample of the sensor worker, see `read_laser`.
+
         Returns:
         tuple: A tuple containing the identification code, x, and y coordinates of the detected object.
 
         Explanation:
         - The method retrieves the position of the detected object using the
         `get_laser_poisiton` method.
-        - It then checks if the object is at the boundaries of the field, indicating
-        that the laser hasn't seen anything.
+        - It then checks if the object is at the boundaries of the field (within `BOUNDARY_TOLERANCE`),
+        indicating that the laser hasn't seen anything.
         - It compares the detected object's position with the latests teammate's position
-        to determine if the laser saw a teammate.
+        to determine if the laser saw a teammate. The laser hits the outline of the teammate,
+        so any hit within `teammate_tolerance` of its position counts.
         - If the object is not at the field boundaries and is not the teammate,
         it is identified as a ball or player from the other team.
         """
-        object_x, object_y = self.get_laser_poisiton()
+        object_x, object_y = self.get_laser_poisiton(cached)
 
         # Check if the object is at the boundaries of the field
-        if object_x == 0 or object_x == self.field_length or object_y == 0 or object_y == self.field_width:
+        if self.is_on_field_boundary(object_x, object_y):
             return 0, object_x, object_y  # The laser hasn't seen anything
 
         # Check if the object is a teammate
-        if object_x == self.team_mate_position[0] and object_y == self.team_mate_position[1]:
+        if self.is_teammate(object_x, object_y):
             return 0, object_x, object_y  # The laser saw the teammate
         else:
             return 1, object_x, object_y  # The laser saw a ball or player from the other team
 
+    def sweep_angles(self):
+        """
+        Get the headings left to scan in the current search sweep.
+
+        Returns:
+        numpy.ndarray: The headings in degrees, in the order the search visits them.
+
+        Explanation:
+        - The search covers the half of the circle facing the field, from 90 to 270 degrees through 0.
+        - A clockwise search (`search_direction` is truthy) walks down from 90,
+        a counterclockwise one walks up from 270.
+        - The sweep starts at the current facing degree and moves in `face_movement` steps until the end of the
+        half circle, so a sweep that was interrupted by a hit continues from where it stopped.
+        """
+        if self.search_direction:
+            span = (self.facing_degree - 270) % 360
+            direction = -1
+        else:
+            span = (90 - self.facing_degree) % 360
+            direction = 1
+        steps = int(span // self.face_movement) + 1
+        return (self.facing_degree + direction * self.face_movement * np.arange(steps)) % 360
+
+    def activate_laser_sweep(self, angles):
+        """
+        Activate the robot's laser once for every heading in `angles`.
+
+        Args:
+            angles (numpy.ndarray): The headings in degrees to measure.
+
+        Returns:
+        numpy.ndarray: The measured distance for every heading.
+
+        Assumptions:
+        - A backend answers the whole sweep at once. Otherwise the game manager may replace this method with a
+        single sweep command, and the default implementation falls back to rotating and calling `activate_laser`
+        once per heading, and restores the facing degree after.
+        - With an auto tuner the whole sweep is timed on `now`, in both cases.
+        """
+        start = self.now() if self.auto_tuner is not None else None
+        if self.backend is not None:
+            distances = self.backend.activate_laser_sweep(self.location, angles)
+        else:
+            distances = np.empty(len(angles))
+            temp_degree = self.facing_degree
+            for index, angle in enumerate(angles):
+                self.facing_degree = angle
+                distances[index] = self.activate_laser()
+            self.facing_degree = temp_degree
+        if start is not None:
+            self.auto_tuner.observe_laser(self.now() - start, len(angles))
+        return distances
+
+    def get_laser_positions(self, angles, distances):
+        """
+        Get the positions of the objects detected by a laser sweep.
+
+        Args:
+            angles (numpy.ndarray): The headings in degrees the laser was fired at.
+            distances (numpy.ndarray): The distance measured at every heading.
+
+        Returns:
+        tuple: Two arrays with the x and y coordinates of the detected objects.
+
+        Explanation:
+        - This is the vectorized form of `get_laser_poisiton`, the same trigonometry is applied to all the
+        headings at once instead of one heading per call.
+        """
+        radian_angles = np.radians(angles)
+        object_xs = self.location[0] + distances * np.cos(radian_angles)
+        object_ys = self.location[1] + distances * np.sin(radian_angles)
+        return object_xs, object_ys
+
+    def idenifiy_sweep(self, angles, distances=None):
+        """
+        Identify the objects detected by a laser sweep.
+
+        Args:
+            angles (numpy.ndarray): The headings in degrees to identify.
+            distances (numpy.ndarray, optional): Distances already measured at those headings. When missing,
+                the laser is fired with `activate_laser_sweep`.
+
+        Returns:
+        tuple: Three arrays with the identification codes, x, and y coordinates of the detected objects.
+
+        Explanation:
+        - Applies the same rules as `idenifiy` to every heading at once:
+        - An object at the boundaries of the field means the laser hasn't seen anything (code 0).
+        - An object at the latest teammate's position is the teammate (code 0).
+        - Anything else is a ball or player from the other team (code 1).
+        """
+        if distances is None:
+            distances = self.activate_laser_sweep(angles)
+        object_xs, object_ys = self.get_laser_positions(angles, np.asarray(distances, dtype=float))
+
+        nothing = self.is_on_field_boundary(object_xs, object_ys)
+        teammate = self.is_teammate(object_xs, object_ys)
+        codes = (~(nothing | teammate)).astype(np.int8)
+        return codes, object_xs, object_ys
+
     def rotate_to_angle(self, angle):
         """
         Rotate the robot to a specified angle.
@@ -315,7 +651,7 @@ class GoalKeeper:
 
         Assumptions:
         - The robot uses a constant step size for forward movement.
-        - The game maneger will translate those constant step as steps and not as one big jump
+        - The game maneger will translate the command to constant steps and not to one big jump
 
          Explanation:
         - Delta X and Delta Y Calculation:
@@ -334,80 +670,348 @@ class GoalKeeper:
 
         - Movement to Target:
           - The robot rotates to the calculated angle using `rotate_to_angle`.
-          - The robot moves forward by a constant step size until it reaches the target location
+          - The robot moves forward by a constant step size until it reaches the target location.
+          - The steps are planned in closed form by `MotionPlanner.plan`, including the steps that stay within
+            the field limits, and sent to the game manager as a single command with `send_motion_command`.
+          - The command replaces the one that is still in flight, if any.
+        """
+        command = self.motion.plan(self.location, (target_x, target_y))
+        self.rotate_to_angle(command.heading)
+        self.motion.submit(command)
+        self.send_motion_command(command)
+        self.location = command.target
+        self.publish_state()
+
+    def send_motion_command(self, command):
         """
-        # Calculate the angle to the target location
-        delta_x = target_x - self.location[0]
-        delta_y = target_y - self.location[1]
-        target_angle = (math.degrees(math.atan2(delta_y, delta_x)) + 360) % 360
+        Send a coalesced move to the game manager.
 
-        distance_to_target = math.sqrt(delta_x**2 + delta_y**2)
+        Args:
+            command (MotionCommand): Rotate to `command.heading`, then walk `command.steps` steps forward.
 
-        self.rotate_to_angle(target_angle)
+        Returns:
+            None
 
-        while distance_to_target > 0:
-            # Move the robot forward by the constant step size
-            self.move_forward()
+        Assumptions:
+        - The game manager executes the command and replaces the previous one if it is still running.
+        """
 
-            # Update the remaining distance
-            distance_to_target -= self.step_size
+    def interrupt_motion(self, steps_done):
+        """
+        Stop the move in flight, as reported by the game manager.
 
-    def Transceiver(self):
-        pass
+        Args:
+            steps_done (int): The steps the robot walked before it stopped.
 
-    def handle_teammate_messages(self):
+        Returns:
+            None
+
+        Explanation:
+        - The location is corrected to where the robot actually stopped, so the next `go_to_location`
+        plans from there.
+        """
+        position = self.motion.interrupt(steps_done)
+        if position is not None:
+            self.location = position
+            self.publish_state()
+
+    def Transceiver(self, timeout=None):
+        """
+        Receive the next message from a teammate, blocking until one arrives or `timeout` passes.
+
+        Args:
+            timeout (float, optional): The most seconds to wait, None waits until a message arrives.
+
+        Returns:
+            str: The message, or None if no message arrived in time.
+
+        Assumptions:
+        - A backend answers right away with the next message that is due, it does not block.
+        - Without a backend the messages are delivered by the game manager, which blocks this call on the radio.
+        Until it does, the call sleeps for `timeout` so a listening thread costs no CPU.
         """
-        Continuously listens for teammate messages using the Transceiver and processes them.
+        if self.backend is not None:
+            return self.backend.receive()
+        self.message_stop.wait(timeout)
+        return None
+
+    def drain_teammate_messages(self):
         """
-        while True:
+        Process every teammate message that is waiting in the inbox.
+
+        Returns:
+            int: The number of messages processed.
+
+        Explanation:
+        - The control loop calls this method between laser reads, so the teammate updates are applied at a known
+        point in the loop instead of racing it.
+        - With a backend there is no listening thread, the messages that are due are pulled from the backend into
+        the inbox first, so the run stays deterministic.
+        - Consecutive binary messages are gathered in one buffer and decoded together with
+        `process_teammate_messages`, a free-text message is processed on its own, in order.
+        """
+        if self.backend is not None:
             message = self.Transceiver()
+            while message:
+                self.inbox.put(message)
+                message = self.Transceiver()
+        handled = self.inbox.drain(self.collect_teammate_message)
+        self.flush_teammate_messages()
+        return handled
+
+    def collect_teammate_message(self, message):
+        """
+        Gather a binary message for batch processing, or process a free-text message after the gathered ones.
+        A binary message whose length is not a multiple of `MESSAGE_SIZE` is dropped.
+        """
+        if isinstance(message, BINARY_TYPES):
+            if len(message) % MESSAGE_SIZE:
+                logger.warning("Invalid binary message length.")
+                return
+            self.message_batch += message
+        else:
+            self.flush_teammate_messages()
+            self.process_teammate_message(message)
+
+    def flush_teammate_messages(self):
+        """
+        Process the gathered binary messages and empty the batch buffer.
+
+        Explanation:
+        - The messages are copied out of the batch buffer and the buffer is emptied before any handler runs. No
+        NumPy view of the buffer is left, so the buffer can be resized even if a handler raises, and the handler's
+        exception is the one the caller sees.
+        """
+        if self.message_batch:
+            batch = bytes(self.message_batch)
+            self.message_batch.clear()
+            self.process_teammate_messages(batch)
+
+    def message_metrics(self):
+        """
+        Get the queue depth and message latency metrics of the teammate inbox, see `TeammateInbox.metrics`.
+        """
+        return self.inbox.metrics()
+
+    def start_workers(self):
+        """
+        Start the sensor worker, if there is one, and the teammate listening thread, unless there is a backend or
+        the thread was started already.
+
+        Returns:
+            None
+        """
+        if self.sensor is not None:
+            self.sensor.start()
+            self.sensor.publish_pose(self.location)
+        if self.backend is not None or self.message_check_thread is not None:
+            return
+        self.message_check_thread = threading.Thread(target=self.handle_teammate_messages)
+        self.message_check_thread.daemon = True
+        self.message_check_thread.start()
+
+    def checkpoint(self, force=False):
+        """
+        Take a snapshot of the state a restarted keeper needs, and hand it to the snapshot writer.
+
+        Args:
+            force (bool, optional): Take the snapshot even if the last one is younger than `checkpoint_period`.
+
+        Returns:
+            None
+
+        Explanation:
+        - The snapshot holds the pose, the search direction, the teammate position, the face movement and epsilon
+        in use with the auto tuner's state, and the ball tracker's sightings, see `poetry_demo.warmStart`.
+        - Packing it costs a few microseconds. The file is written and atomically replaced on the writer's thread.
+        """
+        if self.snapshot_writer is None:
+            return
+        now = self.now()
+        if not force and now - self.checkpoint_time < self.checkpoint_period:
+            return
+        self.checkpoint_time = now
+        self.snapshot_writer.submit(pack_snapshot(self, now))
+
+    def restore_snapshot(self, snapshot, max_age=SNAPSHOT_MAX_AGE):
+        """
+        Continue from the snapshot of a keeper that was restarted.
+
+        Args:
+            snapshot (WarmStart): The snapshot, see `read_snapshot`. None restores nothing.
+            max_age (float, optional): Seconds a ball sighting stays valid, counting the time the keeper was down.
+
+        Returns:
+            bool: True if the snapshot was restored.
+
+        Explanation:
+        - The location, the teammate position and the parameters of the snapshot replace the defaults, and the auto
+        tuner continues from its state.
+        - The ball sightings younger than `max_age` go back to the tracker, their times moved to this keeper's clock,
+        so the first sighting after the restart can already be fitted to a trajectory.
+        - The search starts a new pass from the default heading and direction, the snapshot keeps them for the
+        caller. Facing the restored sighting, the next one would lie on the same laser ray, and a trajectory fitted
+        to two sightings on one ray runs through the robot whatever the ball does.
+        """
+        if snapshot is None:
+            return False
+        self.location = snapshot.location
+        self.team_mate_position = snapshot.team_mate_position
+        if snapshot.face_movement != self.face_movement:
+            self.set_face_movement(snapshot.face_movement)
+        self.epsilon_degree = snapshot.epsilon_degree
+        if self.auto_tuner is not None and snapshot.tuner is not None:
+            self.auto_tuner.restore(snapshot.tuner)
+        downtime = max(time.time() - snapshot.saved_at, 0.0)
+        now = self.now()
+        self.tracker.clear()
+        for x, y, age in snapshot.sightings:
+            if downtime + age <= max_age:
+                self.tracker.push(x, y, now - downtime - age)
+        self.publish_state()
+        return True
+
+    def stop(self):
+        """
+        Stop the teammate listening thread and the sensor worker, if they are running, and write a last snapshot
+        with a warm-start file.
+
+        Returns:
+            None
+        """
+        if self.snapshot_writer is not None:
+            self.checkpoint(force=True)
+            self.snapshot_writer.close()
+        self.message_stop.set()
+        if self.message_check_thread is not None:
+            self.message_check_thread.join()
+        if self.sensor is not None:
+            self.sensor.stop()
+
+    def game_over(self):
+        """
+        Check if the game is over.
+
+        Returns:
+            bool: True once the game has ended.
+
+        Assumptions:
+        - Without a backend the game manager stops the robot, so the game never ends from our side.
+        """
+        if self.backend is not None:
+            return self.backend.game_over()
+        return False
+
+    def handle_teammate_messages(self):
+        """
+        Continuously listens for teammate messages using the Transceiver and queues them in the inbox.
+
+        Explanation:
+        - The Transceiver blocks until a message arrives, so the thread is idle between messages.
+        - The messages are only queued here, the control loop applies them with `drain_teammate_messages`.
+        - The thread checks every `MESSAGE_WAIT` seconds if `stop` was called.
+        """
+        while not self.message_stop.is_set():
+            message = self.Transceiver(timeout=MESSAGE_WAIT)
             if message:
-                self.process_teammate_message(message)
+                self.inbox.put(message)
 
     def process_teammate_message(self, message):
         """
         Process a message received from a teammate and take appropriate actions.
 
         Args:
-            message (str): The message received from the teammate.
+            message (bytes or str): The message received from the teammate, in the binary format of
+                `teammateProtocol` (one or several back-to-back messages) or in the legacy free-text format.
 
         Returns:
             None
 
         Explanation:
+        - A binary message is decoded in place with `struct`, a buffer of several messages goes to
+        `process_teammate_messages`.
+        - A free-text message is translated to the same opcode and coordinates with `parse_legacy`.
+        - The action is looked up by opcode in `self.message_handlers`:
         - If the message is "Go to base," the robot moves to a predefined base location.
         - If the message indicates the location of the ball at the right or left corner, the robot moves to the respective corner.
         - If the message is "you are looking in the wrong direction," the robot adjusts its search direction.
-        - If the message starts with "position:", the robot extracts coordinates and updates information about the teammate.
+        - If the message is a position, the robot updates information about the teammate.
 
         Assumptions:
-        - The format of the message is predefined for accurate processing.
+        - The format of the message is predefined for accurate processing. A binary message of the wrong length or
+        a malformed position is dropped.
         - The extracted coordinates are expected to be in the format "x,y." """
-        if message == "Go to base":
-            self.go_to_location(self.goal_depth + self.robot_radius, self.field_length / 2)
-            # Logic explanation: The robot aligns itself with the center of the field and moves forward.
-
-        elif message == "ball at the right corner":
-            # Move the robot to a position near the right corner based on predefined coordinates
-            self.go_to_location(self.goal_width + self.robot_radius, (self.field_length + self.goal_width) / 2)
-            # Logic explanation: The robot aligns itself with the right corner when
-            # (self.field_length + self.goal_width)/2 is the lower end of football gate.
-
-        elif message == "ball at the left corner":
-            # Logic explanation: The robot aligns itself with the left corner and moves forward,
-            # (self.field_length - self.goal_width)/2 is the upper end of football gate.
-            self.go_to_location(self.goal_width + self.robot_radius, (self.field_length - self.goal_width) / 2)
-
-        elif message.startswith("position: "):
-            # Extract coordinates from the message
-            coordinates_str = message[len("position: ") :]
+        if isinstance(message, BINARY_TYPES):
+            if not message or len(message) % MESSAGE_SIZE:
+                logger.warning("Invalid binary message length.")
+                return
+            if len(message) > MESSAGE_SIZE:
+                self.process_teammate_messages(message)
+                return
+            opcode, x, y = decode(message)
+        else:
             try:
-                # Convert extracted coordinates to integers
-                x, y = map(int, coordinates_str.split(","))
-                self.team_mate_position = (x, y)
-
+                parsed = parse_legacy(message)
             except ValueError:
-                print("Invalid position format in the message.")
+                logger.warning("Invalid position format in the message.")
+                return
+            if parsed is None:
+                return
+            opcode, x, y = parsed
+
+        handler = self.message_handlers.get(opcode)
+        if handler is not None:
+            handler(x, y)
+
+    def process_teammate_messages(self, buffer):
+        """
+        Process a buffer of back-to-back binary messages at once.
+
+        Args:
+            buffer (bytes-like): The messages, its length is a multiple of `MESSAGE_SIZE`.
+
+        Returns:
+            None
+
+        Explanation:
+        - The buffer is decoded as a single NumPy view, without copying it.
+        - Teammates broadcast their position at a high rate and only the latest one matters, so the position
+        messages before the last one are skipped. The remaining messages are handled in the order they arrived.
+        """
+        messages = decode_batch(buffer)
+        opcodes = messages["opcode"]
+        handled = opcodes != OP_POSITION
+        positions = np.flatnonzero(~handled)
+        if positions.size:
+            handled[positions[-1]] = True
+        for index in np.flatnonzero(handled):
+            handler = self.message_handlers.get(int(opcodes[index]))
+            if handler is not None:
+                handler(float(messages["x"][index]), float(messages["y"][index]))
+
+    def on_go_to_base(self, x, y):
+        # Logic explanation: The robot aligns itself with the center of the field and moves forward.
+        self.go_to_location(self.goal_depth + self.robot_radius, self.field_length / 2)
+
+    def on_ball_at_right_corner(self, x, y):
+        # Move the robot to a position near the right corner based on predefined coordinates
+        self.go_to_location(self.goal_width + self.robot_radius, (self.field_length + self.goal_width) / 2)
+        # Logic explanation: The robot aligns itself with the right corner when
+        # (self.field_length + self.goal_width)/2 is the lower end of football gate.
+        self.search.hint(self, HINT_RIGHT)
+
+    def on_ball_at_left_corner(self, x, y):
+        # Logic explanation: The robot aligns itself with the left corner and moves forward,
+        # (self.field_length - self.goal_width)/2 is the upper end of football gate.
+        self.go_to_location(self.goal_width + self.robot_radius, (self.field_length - self.goal_width) / 2)
+        self.search.hint(self, HINT_LEFT)
+
+    def on_wrong_direction(self, x, y):
+        # Search the other way around
+        self.search_direction = 0 if self.search_direction else 1
+
+    def on_position(self, x, y):
+        self.team_mate_position = (x, y)
 
     def prevent_attack(self):
         """
@@ -415,23 +1019,14 @@ class GoalKeeper:
 
         Returns:
             float: If a potential goal-scoring trajectory is detected, returns the estimated y-coordinate
-                of the ball. Otherwise, returns None.
+                of the ball. If the game ends before that, returns None.
 
         Explanation:
         - Initialize the flag to indicate whether the target location has been reached.
         - Ensure the robot is facing the correct direction for effective searching.
         - Check if the robot is not already at a strategic position.
         - Move the robot to a strategic position near the center of the field.
-
-        - Implement a search until the target is found and prevented.
-        - Identify objects using the laser.
-        - When the robot encounters an object identified as a ball, append the coordinates to the list `last_seen`.
-            Logic explanation: When the robot encounters an object identified as a ball,
-            it appends the coordinates of the object to the list `last_seen`.
-            This is done to track the trajectory of the ball based on the historical positions.
-        - If there are not enough historical positions, continue searching.
-        - If enough historical positions are available, estimate the y-coordinate of the ball's current position.
-        - If the trajectory indicates the ball will enter the goal, return the estimated y-coordinate.
+        - Implement a search until the target is found and prevented, one `search_step` per iteration.
         """
         not_found = True
         self.rotate_to_angle(90)
@@ -439,34 +1034,306 @@ class GoalKeeper:
 
         if (self.goal_depth + self.robot_radius, self.field_length / 2) != self.location:
             self.go_to_location(self.goal_depth + self.robot_radius, self.field_length / 2)
+        self.search.begin(self)
+        self.sweep_single = None
+        self.intercept = None
+        self.intercept_deadline = math.inf
+        self.sighting_heading = None
+        self.sighting_fit = None
+
+        while not_found and not self.game_over():
+            y_estimation = self.search_step()
+            if y_estimation is not None:
+                return y_estimation
+        return None
 
-        while not_found:
-            if self.facing_degree < 270 and self.facing_degree > 90:
-                self.rotate_to_angle(90)
+    def search_step(self):
+        """
+        Run a single iteration of the `prevent_attack` search.
 
+        Returns:
+            float: The estimated y-coordinate of the ball if its trajectory enters the goal, otherwise None.
+
+        Explanation:
+        - Apply the teammate messages that arrived since the last laser read, and publish the state the step
+            starts from for the other threads.
+        - Identify objects using the laser. Outside sweep mode the search scheduler (`self.search`) picks the
+            heading of every read and is told what the read found. In sweep mode `sweep_read` identifies the
+            remaining headings of the search in vectorized chunks up to the first hit, and `sweep_report` picks
+            what is read next.
+        - Tell if the hit is the ball with `classify_hit`.
+        - When the robot encounters an object identified as a ball, push the coordinates to the ball tracker.
+            Logic explanation: When the robot encounters an object identified as a ball,
+            it pushes the coordinates of the object to `self.tracker`.
+            This is done to track the trajectory of the ball based on the historical positions.
+        - If the ball moved towards the enemy goal since the previous sighting, continue searching.
+        - If there are not enough historical positions, continue searching.
+        - If enough historical positions are available, estimate the y-coordinate of the ball's current position.
+        - If the trajectory indicates the ball will enter the goal, return the estimated y-coordinate.
+        - In anytime mode `anytime_decision` can commit earlier, and the step returns the latest intercept as soon
+            as its deadline has passed if it is in the goal, whatever the search finds.
+        - With a goal-entry sampler every sighting `check_sighting` accepts is also scored with
+            `goal_entry_estimate`: once the goal-entry probability reaches the sampler's threshold the step returns
+            the position that covers the most sampled trajectories. Below the threshold, or for a sighting that does
+            not continue the trajectory, the `will_enter_goal` rule decides as without a sampler.
+        - With a warm-start file the step starts by taking a snapshot, at most every `checkpoint_period`, see
+            `checkpoint`.
+        - With an auto tuner the step starts by setting the tuned `face_movement` and `epsilon_degree`, see
+            `AutoTuner`.
+        """
+        self.drain_teammate_messages()
+        self.publish_state()
+        if self.snapshot_writer is not None:
+            self.checkpoint()
+        if self.auto_tuner is not None:
+            self.auto_tuner.apply(self)
+        intercept = self.intercept
+        if intercept is not None and self.intercept_deadline <= self.now() and self.will_enter_goal(intercept):
+            return intercept
+        if self.facing_degree < 270 and self.facing_degree > 90:
+            self.rotate_to_angle(90)
+
+        if self.sweep_mode:
+            heading, idenifiy = self.sweep_read()
+            if heading is None:
+                return None
+        else:
+            heading = self.search.next_heading(self)
+            self.rotate_to_angle(heading)
             idenifiy = self.idenifiy()
 
-            if idenifiy[0] == 0:
-                if self.search_direction:  # Change direction if the teammate instructs
-                    self.rotate_clockwise()
-                else:
-                    self.rotate_counter_clockwise()
+        if idenifiy[0] == 0:
+            if self.sweep_mode:
+                self.sweep_report(heading, False, False)
+            else:
+                self.search.report(self, heading, False, False)
 
+        else:
+            ball = self.classify_hit(idenifiy[1], idenifiy[2])
+            if self.sweep_mode:
+                self.sweep_report(heading, True, ball)
             else:
-                if self.encountered_a_ball():
-                    self.last_seen.append((idenifiy[1], idenifiy[2]))  # Object identified coordinates
-
-                    if len(self.last_seen) < 2:
-                        continue
-                    if len(self.last_seen) == 2 and self.last_seen[1][0] - self.last_seen[0][0] > 0:  # ball going in enemey
-                        # gate dirctions
-                        continue
-                    else:
-                        y_estimation = self.estimate_ball_location()
-                        if self.will_enter_goal(y_estimation):
-                            return y_estimation
+                self.search.report(self, heading, True, ball, self.other_object_heading)
+            if ball:
+                self.tracker.push(idenifiy[1], idenifiy[2], self.now())  # Object identified coordinates
+                checked = self.check_sighting()
+                if self.anytime:
+                    y_estimation = self.anytime_decision(checked)
+                    if y_estimation is not None:
+                        return y_estimation
+
+                if len(self.tracker) < 2:
+                    return None
+                if self.goal_sampler is not None and checked:
+                    self.goal_entry = self.goal_entry_estimate()
+                    if self.goal_entry.probability >= self.goal_sampler.threshold:
+                        return self.goal_entry.coverage_y
+                if self.tracker.last_delta_x() > 0:  # ball going in enemey gate dirctions
+                    return None
+                else:
+                    y_estimation = self.estimate_ball_location()
+                    if self.will_enter_goal(y_estimation):
+                        return y_estimation
         return None
 
+    def sweep_read(self):
+        """
+        Read the next heading of the sweep search.
+
+        Returns:
+            tuple: The heading of the read and its identification, see `idenifiy`. The heading is None when the
+                rest of the half circle has no hit.
+
+        Explanation:
+        - A heading `sweep_report` picked, the last ball sighting or an object a classification read found, is read
+        with a single shot, as the linear search does.
+        - Otherwise the headings left in the sweep are identified `SWEEP_CHUNK` at a time with `idenifiy_sweep`,
+        and the sweep stops with the chunk of the first hit: the rest of the half circle is not measured. The robot
+        turns to the first hit that is not a robot the track set already knows.
+        - When the half circle has no hit the robot turns to its beginning for the next sweep.
+        """
+        if self.sweep_single is not None:
+            self.rotate_to_angle(self.sweep_single)
+            return self.facing_degree, self.idenifiy()
+
+        angles = self.sweep_angles()
+        for start in range(0, len(angles), SWEEP_CHUNK):
+            chunk = angles[start : start + SWEEP_CHUNK]
+            codes, object_xs, object_ys = self.idenifiy_sweep(chunk)
+            hits = np.flatnonzero(codes)
+            if self.tracks is not None and hits.size:
+                hits = self.skip_known_robots(hits, chunk, object_xs, object_ys)
+            if hits.size:
+                self.rotate_to_angle(chunk[hits[0]])
+                return self.facing_degree, (1, object_xs[hits[0]], object_ys[hits[0]])
+
+        # Nothing in this sweep, start the next one from the beginning of the half circle
+        self.rotate_to_angle(90 if self.search_direction else 270)
+        return None, (0, None, None)
+
+    def sweep_report(self, heading, found, ball):
+        """
+        Pick what the sweep search reads next.
+
+        Args:
+            heading (float): The heading of the read.
+            found (bool): True if the read hit an object.
+            ball (bool): True if the object is the ball.
+
+        Explanation:
+        - After a ball hit the heading is read again to follow the ball.
+        - After a hit that `encountered_a_ball` ruled out because a side read found another object, that heading is
+        read next, the other object may be the ball.
+        - Otherwise the sweep goes on one step past the heading.
+        """
+        self.sweep_single = None
+        if found and ball:
+            self.sweep_single = heading
+            return
+        if found and self.other_object_heading is not None:
+            self.sweep_single = self.other_object_heading
+            return
+        self.rotate_to_angle(heading)
+        if self.search_direction:
+            self.rotate_clockwise()
+        else:
+            self.rotate_counter_clockwise()
+
+    def classify_hit(self, x, y):
+        """
+        Tell if the object the laser hit is the ball.
+
+        Args:
+            x (float): The x-coordinate of the hit.
+            y (float): The y-coordinate of the hit.
+
+        Returns:
+            bool: True if the object is the ball.
+
+        Explanation:
+        - Without multi-object tracking every hit is classified with `encountered_a_ball`.
+        - With it, the hit is assigned to its track first. A hit that repeats the last sighting of a known robot costs
+        no laser shot: it is a robot again, and the other object its classification found is read next again, see
+        `TrackSet.repeated`. Every other hit is classified as without tracking, so a robot that moved, or a ball the
+        classification once took for a robot, is a ball candidate again.
+        - With an auto tuner the distance of the hit sets `epsilon_degree` first, see `AutoTuner`.
+        """
+        if self.auto_tuner is not None:
+            self.auto_tuner.observe_hit(math.hypot(x - self.location[0], y - self.location[1]))
+            self.epsilon_degree = self.auto_tuner.epsilon(self)
+        self.other_object_heading = None
+        if self.tracks is None:
+            return self.encountered_a_ball()
+        track = self.tracks.associate(x, y, self.now(), self.facing_degree)
+        if self.tracks.kind(track) == ROBOT:
+            self.other_object_heading = self.tracks.other_heading(track)
+            return False
+        ball = self.encountered_a_ball()
+        self.tracks.label(track, ball, self.other_object_heading)
+        return ball
+
+    def skip_known_robots(self, hits, angles, object_xs, object_ys):
+        """
+        Drop the hits of a sweep that repeat the last sighting of a known robot, and move the robot tracks to the
+        new sightings.
+
+        Args:
+            hits (numpy.ndarray): The indexes of the hits in the sweep.
+            angles (numpy.ndarray): The headings of the sweep.
+            object_xs (numpy.ndarray): The x-coordinates of the sweep.
+            object_ys (numpy.ndarray): The y-coordinates of the sweep.
+
+        Returns:
+            numpy.ndarray: The indexes of the remaining hits. A robot track whose sighting is not repeated is no
+                longer a known robot, see `TrackSet.update`, and its hit remains.
+        """
+        now = self.now()
+        tracks = self.tracks.gate_many(object_xs[hits], object_ys[hits], now)
+        robots = (tracks >= 0) & (self.tracks.kinds[tracks] == ROBOT)
+        for index in np.flatnonzero(robots):
+            hit, track = hits[index], tracks[index]
+            self.tracks.update(track, object_xs[hit], object_ys[hit], now, angles[hit])
+            robots[index] = self.tracks.kinds[track] == ROBOT
+        return hits[~robots]
+
+    def check_sighting(self):
+        """
+        Check the latest ball sighting against the trajectory fitted at the sighting before.
+
+        Returns:
+            bool: True if the sighting continues that trajectory.
+
+        Explanation:
+        - The sighting continues the trajectory when it lies within `residual_tolerance` of it, see
+        `BallTracker.residual`. Otherwise the sightings in the tracker may belong to two objects, a robot the
+        classification took for the ball among them.
+        - A sighting from the same heading as the one before checks nothing: both lie on one ray from the robot, and
+        the fitted trajectory runs through the robot whatever the ball does.
+        - Call it once per ball sighting, it moves the trajectory on to the latest sighting.
+        """
+        previous_heading = self.sighting_heading
+        self.sighting_heading = self.facing_degree
+        previous_fit = self.sighting_fit
+        self.sighting_fit = self.tracker.fit()
+        return self.facing_degree != previous_heading and self.tracker.residual(previous_fit) <= self.residual_tolerance
+
+    def anytime_decision(self, checked):
+        """
+        Decide where to intercept the ball from the sightings so far, without waiting for an unbounded search.
+
+        Args:
+            checked (bool): True if the latest sighting continues the trajectory before it, see `check_sighting`.
+
+        Returns:
+            float: The intercept y-coordinate once the decision is confident or its deadline is reached,
+                otherwise None.
+
+        Explanation:
+        - The time the ball needs to reach the goal line comes from the tracker's velocity, and the intercept is
+        where the fitted trajectory crosses the line the robot defends, x = goal_depth + robot_radius.
+        - A fit is only used once `check_sighting` accepts its latest sighting. Otherwise the intercept is dropped
+        and `will_enter_goal` decides as without anytime decisions.
+        - The latest checked intercept is kept as the best one so far, with its deadline: `decision_margin` seconds
+        before the ball reaches the goal line.
+        - The decision is confident when two consecutive checked intercepts agree within `intercept_tolerance`.
+        - The intercept is committed when it is in the goal and the decision is confident or the deadline has passed,
+        `search_step` commits it at the deadline even if the ball is not seen again. An intercept outside the goal
+        is never committed, the search goes on as without anytime decisions.
+        """
+        if not checked:
+            # The fit may join two objects
+            self.intercept = None
+            self.intercept_deadline = math.inf
+            return None
+        time_to_goal = self.tracker.time_to_line(self.goal_depth)
+        if math.isinf(time_to_goal):
+            return None  # The ball is not coming towards our goal
+        previous = self.intercept
+        self.intercept = self.tracker.estimate_at(self.goal_depth + self.robot_radius)
+        self.intercept_deadline = self.tracker.last_time() + time_to_goal - self.decision_margin
+        confident = previous is not None and abs(self.intercept - previous) <= self.intercept_tolerance
+        if (confident or self.now() >= self.intercept_deadline) and self.will_enter_goal(self.intercept):
+            return self.intercept
+        return None
+
+    def goal_entry_estimate(self):
+        """
+        Estimate the chance the ball enters the goal, from samples of the tracker's uncertainty.
+
+        Returns:
+            GoalEntryEstimate: The goal-entry probability, the sorted intercepts of the entering samples on the
+                line the robot defends, and the y-coordinate that blocks most of them, see `GoalEntrySampler`.
+                None if the tracker has less than two sightings.
+
+        Explanation:
+        - `will_enter_goal` answers yes or no for the single fitted trajectory, while two noisy sightings leave
+        that trajectory very uncertain. The sampler refits the trajectory to thousands of perturbed copies of the
+        sightings in one batch.
+        - The latest estimate is kept in `self.goal_entry`. When `search_step` commits on it, `run()` moves to its
+        `coverage_y` the same way it moves to a point estimate.
+        """
+        return self.goal_sampler.estimate(self)
+
     def will_enter_goal(self, y_point):
         """
         Check if the provided y-coordinate is within the goal-scoring range.
@@ -487,28 +1354,15 @@ class GoalKeeper:
             float: The estimated y-coordinate of the ball.
 
         Explanation:
-        - Create arrays of x and y coordinates from the two most recent historical positions.
-        - Delete the first historical position, as it is no longer needed.
-        - Fit a linear function (degree 1) to the remaining historical positions using polyfit.
-        - Update the first historical position with the last one, and remove the last one from the list.
-        - Calculate the estimated y-coordinate using the fitted linear function.
+        - The tracker keeps the last `tracker_window` historical positions in a ring buffer together with
+        their running least-squares sums, so the oldest position is dropped as soon as a new one arrives.
+        - Fit a linear function (degree 1) to the historical positions from the running sums.
+        - Calculate the estimated y-coordinate at the latest x-coordinate using the fitted linear function.
 
         Note:
         our estimate_ball_location is blind to diractions, its sees only linear function but we dirction in the function
         """
-        x_values = np.array([self.last_seen[0][0], self.last_seen[1][0]])
-        y_values = np.array([self.last_seen[0][1], self.last_seen[1][1]])
-
-        # Delete the first item as it is no longer needed
-        self.last_seen[0] = self.last_seen[-1]
-        self.last_seen.pop()
-
-        # Fit a linear function (degree 1) using polyfit
-        coefficients = np.polyfit(x_values, y_values, 1)
-        slope, intercept = coefficients
-
-        # Calculate and return the estimated y-coordinate
-        return self.last_seen[0][0] * slope + intercept
+        return self.tracker.estimate()
 
     def encountered_a_ball(self):
         """
@@ -524,12 +1378,13 @@ class GoalKeeper:
         - Temporarily adjust the robot's facing degree to one side within the epsilon threshold for checking.
         - Identify objects using the laser in the adjusted direction.
         - If an object is found, return False because we found a robort.
-        - Reset the robot's facing degree to its original direction.
         - Adjust the robot's facing degree to the other side within the epsilon threshold for checking.
         - Identify objects using the laser in the adjusted direction.
-        - If an object is found, return True.
-        - Reset the robot's facing degree to its original direction.
+        - If an object is found, return False.
         - If no potential Robort is detected on either side,the target is a ball return True.
+        - The robot's facing degree is reset to its original direction on every return. The heading of a side read
+        that found an object is kept in `other_object_heading` (None otherwise), for the search scheduler.
+        - With a sensor worker the three readings may come from its latest samples, see `read_laser`.
 
         Note:
         The epsilon_degree is a threshold used to check if an object is a ball based on laser measurements.
@@ -540,7 +1395,7 @@ class GoalKeeper:
         and the dynamic nature of the environment.
         """
         # Obtain laser measurements for calculations
-        side_adjacent = self.activate_laser()
+        side_adjacent = self.read_laser(cached=True)
         side_opposite = self.robot_radius
 
         # Calculate the angle using arctangent
@@ -548,34 +1403,38 @@ class GoalKeeper:
 
         # Temporarily adjust the robot's facing degree to one side within the epsilon threshold for checking
         temp_degree = self.facing_degree
-        self.facing_degree = self.facing_degree + degree - self.epsilon_degree
-
-        # Identify objects using the laser in the adjusted direction
-        found = self.idenifiy()
-        if found[0] != 0:
-            return False
-
-        # Reset the robot's facing degree to its original direction
-        self.facing_degree = temp_degree
-
-        # Adjust the robot's facing degree to the other side within the epsilon threshold for checking
-        self.facing_degree = self.facing_degree - (degree - self.epsilon_degree)
-
-        # Identify objects using the laser in the adjusted direction
-        found = self.idenifiy()
-        if found[0] != 0:
-            return False
-
-        # Reset the robot's facing degree to its original direction
-        self.facing_degree = temp_degree
+        self.other_object_heading = None
+        try:
+            self.facing_degree = temp_degree + degree - self.epsilon_degree
+
+            # Identify objects using the laser in the adjusted direction
+            found = self.idenifiy(cached=True)
+            if found[0] != 0:
+                self.other_object_heading = self.facing_degree
+                return False
+
+            # Adjust the robot's facing degree to the other side within the epsilon threshold for checking
+            self.facing_degree = temp_degree - (degree - self.epsilon_degree)
+
+            # Identify objects using the laser in the adjusted direction
+            found = self.idenifiy(cached=True)
+            if found[0] != 0:
+                self.other_object_heading = self.facing_degree
+                return False
+        finally:
+            # Reset the robot's facing degree to its original direction
+            self.facing_degree = temp_degree
 
         # If no potential robort is detected on either side,the target is smaller, its a ball return True
         return True
 
     def run(self):
         # do all the set up for the first step of the game
+        self.start_workers()
         while not self.game_over():
             ball_y = self.prevent_attack()
+            if ball_y is None:
+                continue
             self.go_to_location(self.goal_depth + self.robot_radius, ball_y)
             # Logic explanation: The target x-coordinate is consistently set to `self.goal_depth + self.robot_radius`.
             # Placing the robot at this x-coordinate aligns it with the goalpost's edge, offering optimal coverage
@@ -0,0 +1,207 @@
+# Dependencies:
+# - time: Measures the calls with the nanosecond performance counter.
+# - numpy (as np): Holds the span ring buffer and writes it to a file.
+import time
+
+import numpy as np
+
+DEFAULT_CAPACITY = 65536  # spans kept in the ring buffer, the oldest are overwritten
+HISTOGRAM_BUCKETS = 64  # bucket b counts the calls that took [2 ** (b - 1), 2 ** b) nanoseconds
+
+SENSOR = "sensor"
+GEOMETRY = "geometry"
+TRACKER = "tracker"
+CONTROL = "control"
+
+# (owner, method name, category) of the instrumented calls, the owner is "keeper" or one of its attributes
+HOT_PATH = (
+    ("keeper", "activate_laser", SENSOR),
+    ("keeper", "activate_laser_sweep", SENSOR),
+    ("keeper", "idenifiy", GEOMETRY),
+    ("keeper", "idenifiy_sweep", GEOMETRY),
+    ("keeper", "encountered_a_ball", GEOMETRY),
+    ("keeper", "rotate_clockwise", GEOMETRY),
+    ("keeper", "rotate_counter_clockwise", GEOMETRY),
+    ("keeper", "rotate_to_angle", GEOMETRY),
+    ("keeper", "move_forward", GEOMETRY),
+    ("keeper", "move_backward", GEOMETRY),
+    ("keeper", "move_right", GEOMETRY),
+    ("keeper", "move_left", GEOMETRY),
+    ("keeper", "go_to_location", GEOMETRY),
+    ("tracker", "push", TRACKER),
+    ("keeper", "estimate_ball_location", TRACKER),
+    ("keeper", "drain_teammate_messages", CONTROL),
+    ("keeper", "search_step", CONTROL),
+    ("keeper", "prevent_attack", CONTROL),
+)
+DECISION = "prevent_attack"  # every call of this method starts a new decision
+
+SPAN_DTYPE = np.dtype(
+    [
+        ("decision", np.uint32),  # the decision the call belongs to, 0 before the first decision
+        ("call", np.uint16),  # index in `names`
+        ("depth", np.uint16),  # how many instrumented calls enclose this one
+        ("start_ns", np.int64),  # perf_counter_ns when the call started
+        ("duration_ns", np.int64),  # the whole call
+        ("self_ns", np.int64),  # the call minus the instrumented calls it made
+    ]
+)
+
+
+class Instrumentation:
+    """
+    Counters, latency histograms and span traces of the GoalKeeper hot path.
+
+    Explanation:
+    - `attach(keeper)` shadows the methods of `HOT_PATH` with timing wrappers on the keeper instance (and its
+    tracker), `detach()` removes them. Nothing is installed while detached, so instrumentation off costs nothing.
+    - Every call is counted and its latency goes to a histogram with power-of-two nanosecond buckets.
+    - Every call is also a span in a ring buffer of `capacity` records (see `SPAN_DTYPE`): the decision it belongs
+    to, its depth, start and duration, and its self time without the instrumented calls it made. Self times add
+    up, so the time of a decision can be split between sensor I/O, geometry, the tracker and the control loop.
+    - `dump(path)` writes everything to a `.npz` file for offline analysis, `summary()` gives the totals.
+
+    Assumptions:
+    - The instrumented calls run on a single thread, the control loop.
+    """
+
+    def __init__(self, capacity=DEFAULT_CAPACITY, calls=HOT_PATH):
+        self.capacity = capacity
+        self.calls = calls
+        self.names = [name for _, name, _ in calls]
+        self.categories = [category for _, _, category in calls]
+        self.spans = np.zeros(capacity, dtype=SPAN_DTYPE)
+        self.written = 0  # spans written since the last clear, the ring buffer keeps the last `capacity`
+        self.decision = 0
+        self.children = [0]  # per open call, the time spent in the instrumented calls it made
+        self.counts = [0] * len(self.names)
+        self.totals = [0] * len(self.names)
+        self.self_totals = [0] * len(self.names)
+        self.histograms = [[0] * HISTOGRAM_BUCKETS for _ in self.names]
+        self.attached = []  # (owner, name) of the installed wrappers
+
+    def clear(self):
+        """
+        Drop the collected data. The lists are cleared in place, the installed wrappers keep using them.
+        """
+        self.written = 0
+        self.decision = 0
+        self.children[:] = [0]
+        for values in (self.counts, self.totals, self.self_totals, *self.histograms):
+            values[:] = [0] * len(values)
+
+    def attach(self, keeper):
+        """
+        Start instrumenting `keeper`.
+
+        Args:
+            keeper (GoalKeeper): The instrumented robot.
+
+        Returns:
+            Instrumentation: self.
+        """
+        self.detach()
+        for index, (owner_name, name, _) in enumerate(self.calls):
+            owner = keeper if owner_name == "keeper" else getattr(keeper, owner_name)
+            setattr(owner, name, self.wrap(getattr(owner, name), index))
+            self.attached.append((owner, name))
+        return self
+
+    def detach(self):
+        """
+        Stop instrumenting, the methods of the class are visible again. The collected data is kept.
+        """
+        for owner, name in self.attached:
+            delattr(owner, name)
+        self.attached = []
+
+    def wrap(self, method, index):
+        """
+        Build the timing wrapper of a bound method.
+        """
+        clock = time.perf_counter_ns
+        spans = self.spans
+        children = self.children
+        histogram = self.histograms[index]
+        starts_decision = self.names[index] == DECISION
+
+        def traced(*args, **kwargs):
+            if starts_decision:
+                self.decision += 1
+            children.append(0)
+            start = clock()
+            try:
+                return method(*args, **kwargs)
+            finally:
+                duration = clock() - start
+                own = duration - children.pop()
+                children[-1] += duration
+                self.counts[index] += 1
+                self.totals[index] += duration
+                self.self_totals[index] += own
+                histogram[min(duration.bit_length(), HISTOGRAM_BUCKETS - 1)] += 1
+                spans[self.written % self.capacity] = (self.decision, index, len(children) - 1, start, duration, own)
+                self.written += 1
+
+        traced.__wrapped__ = method
+        return traced
+
+    def ordered_spans(self):
+        """
+        Get the spans in the ring buffer, from the oldest to the latest.
+        """
+        if self.written <= self.capacity:
+            return self.spans[: self.written].copy()
+        split = self.written % self.capacity
+        return np.concatenate((self.spans[split:], self.spans[:split]))
+
+    def summary(self):
+        """
+        Summarize the collected data.
+
+        Returns:
+        dict: Per call name its count, total and self time in microseconds and the approximate median and 99th
+            percentile latency in microseconds (the upper bound of the histogram bucket), and per category
+            its self time in microseconds.
+        """
+        calls = {}
+        categories = {}
+        for index, name in enumerate(self.names):
+            count = self.counts[index]
+            calls[name] = {
+                "count": count,
+                "total_us": self.totals[index] / 1e3,
+                "self_us": self.self_totals[index] / 1e3,
+                "p50_us": self.percentile(index, 0.5),
+                "p99_us": self.percentile(index, 0.99),
+            }
+            category = self.categories[index]
+            categories[category] = categories.get(category, 0.0) + self.self_totals[index] / 1e3
+        return {"decisions": self.decision, "calls": calls, "categories": categories}
+
+    def percentile(self, index, fraction):
+        count = self.counts[index]
+        if not count:
+            return 0.0
+        seen = 0
+        for bucket, bucket_count in enumerate(self.histograms[index]):
+            seen += bucket_count
+            if seen >= fraction * count:
+                return (1 << bucket) / 1e3
+        return (1 << (HISTOGRAM_BUCKETS - 1)) / 1e3
+
+    def dump(self, path):
+        """
+        Write the spans, the counters and the histograms to a `.npz` file, read it back with `numpy.load`.
+        """
+        np.savez_compressed(
+            path,
+            spans=self.ordered_spans(),
+            names=np.array(self.names),
+            categories=np.array(self.categories),
+            counts=np.array(self.counts, dtype=np.int64),
+            totals_ns=np.array(self.totals, dtype=np.int64),
+            self_ns=np.array(self.self_totals, dtype=np.int64),
+            histograms=np.array(self.histograms, dtype=np.int64),
+            dropped=np.int64(max(0, self.written - self.capacity)),
+        )
@@ -0,0 +1,16 @@
+# Dependencies:
+# - collections.namedtuple: Builds the immutable snapshot type.
+from collections import namedtuple
+
+KeeperState = namedtuple("KeeperState", ("version", "location", "facing_degree", "team_mate_position"))
+KeeperState.__doc__ = """
+Immutable snapshot of the state the GoalKeeper control loop shares with other threads.
+
+Explanation:
+- Only the control loop writes the robot's state: teammate messages are queued by the listening thread and
+applied by the control loop (see `TeammateInbox`).
+- The control loop publishes a new snapshot with `GoalKeeper.publish_state`, replacing the `state` attribute.
+Replacing an attribute is a single reference store, so a thread that reads `GoalKeeper.snapshot()` always gets a
+whole snapshot, never a location from one step and a facing degree from another, and nobody takes a lock.
+- `version` grows by one with every snapshot, a reader can tell if the state changed since it last looked.
+"""
@@ -0,0 +1,26 @@
+# Dependencies:
+# - importlib: Imports the wrapped module on first use.
+# - types: Provides the module type the stand-in derives from.
+import importlib
+import types
+
+
+class LazyModule(types.ModuleType):
+    """
+    Stand-in for a module that is imported the first time one of its attributes is read.
+
+    Explanation:
+    - `np = LazyModule("numpy")` at the top of a module costs nothing, NumPy is imported by the first `np.` access,
+    so a process that never takes a vectorized path never pays for the import.
+    - On that first access the attributes of the real module are copied into the stand-in, every later access is a
+    plain attribute lookup, as fast as on the module itself.
+    """
+
+    def __init__(self, name):
+        super().__init__(name)
+
+    def __getattr__(self, attribute):
+        # Only called for attributes the stand-in does not have yet, that is before the import
+        module = importlib.import_module(self.__name__)
+        self.__dict__.update(module.__dict__)
+        return getattr(module, attribute)
@@ -0,0 +1,285 @@
+# Dependencies:
+# - argparse: Parses the command line options.
+# - os: Checks if a recording already exists.
+# - struct: Packs a single record, and reports a binary message that does not decode.
+# - numpy (as np): Packs a laser sweep, and memory-maps a recording for the replay.
+import argparse
+import os
+import struct
+
+import numpy as np
+
+from poetry_demo.goalKeeper import GoalKeeper
+from poetry_demo.teammateProtocol import BINARY_TYPES, MESSAGE_SIZE, decode, encode, parse_legacy
+
+# use `python -m poetry_demo.matchRecorder match.rec` to replay a recording through the current GoalKeeper and
+# print its decisions.
+
+# Recording Format:
+# An 8 bytes header, `MAGIC`, followed by fixed-width records of 48 bytes, little endian:
+#   byte 0       kind (unsigned char), one of the record kinds below
+#   byte 1       opcode of a teammate message (unsigned char), 0 for the other kinds
+#   bytes 2-3    padding
+#   bytes 4-7    count (unsigned int), the number of readings of a sweep on its first record, 0 otherwise
+#   bytes 8-15   time of the backend clock in seconds (double)
+#   bytes 16-23  heading of the laser in degrees (double), 0 for a message
+#   bytes 24-31  x of the robot, or of a teammate message (double)
+#   bytes 32-39  y of the robot, or of a teammate message (double)
+#   bytes 40-47  the laser distance (double), 0 for a message
+# The file is only ever appended to, a recording that was cut short is still readable up to its last full record.
+
+MAGIC = b"GKMATCH1"
+LASER = 1  # a single `activate_laser` reading
+SWEEP = 2  # one reading of an `activate_laser_sweep`, a sweep is `count` consecutive records
+MESSAGE = 3  # a teammate message, as `receive` returned it
+GAME_OVER = 4  # `game_over` answered True
+
+RECORD = struct.Struct("<BB2xIddddd")
+RECORD_DTYPE = np.dtype(
+    {
+        "names": ["kind", "opcode", "count", "time", "heading", "x", "y", "distance"],
+        "formats": ["u1", "u1", "<u4", "<f8", "<f8", "<f8", "<f8", "<f8"],
+        "offsets": [0, 1, 4, 8, 16, 24, 32, 40],
+        "itemsize": RECORD.size,
+    }
+)
+
+
+class MatchRecorder:
+    """
+    Backend that forwards to another backend and appends everything the keeper sees to a recording.
+
+    Explanation:
+    - Every laser reading is written with the heading, the robot's location and the backend time, every reading
+    of a sweep as its own record, every teammate message with its opcode and coordinates, and every time the
+    game was over.
+    - Records go through a buffered file, a single reading costs one `struct.pack` and one buffered write.
+    - `close()` (or leaving the `with` block) flushes the file.
+    - A teammate message that does not decode is handed to the keeper but not recorded, the recorder never
+    changes what the keeper does.
+    """
+
+    def __init__(self, backend, path):
+        self.backend = backend
+        self.path = path
+        is_new = not os.path.exists(path) or os.path.getsize(path) == 0
+        self.file = open(path, "ab")
+        if is_new:
+            self.file.write(MAGIC)
+
+    def activate_laser(self, location, facing_degree):
+        distance = self.backend.activate_laser(location, facing_degree)
+        self.file.write(RECORD.pack(LASER, 0, 0, self.backend.now(), facing_degree, location[0], location[1], distance))
+        return distance
+
+    def activate_laser_sweep(self, location, angles):
+        distances = self.backend.activate_laser_sweep(location, angles)
+        records = np.zeros(len(distances), dtype=RECORD_DTYPE)
+        records["kind"] = SWEEP
+        records["time"] = self.backend.now()
+        records["heading"] = angles[: len(distances)]
+        records["x"] = location[0]
+        records["y"] = location[1]
+        records["distance"] = distances
+        if len(records):
+            records["count"][0] = len(records)
+        self.file.write(records.tobytes())
+        return distances
+
+    def receive(self):
+        message = self.backend.receive()
+        if not message:
+            return message
+        try:
+            if isinstance(message, BINARY_TYPES):
+                decoded = [decode(message, offset) for offset in range(0, len(message), MESSAGE_SIZE)]
+            else:
+                parsed = parse_legacy(message)
+                decoded = [parsed] if parsed is not None else []
+        except (ValueError, struct.error):
+            # A malformed message is not recorded, the keeper gets it as it came and drops it itself
+            return message
+        for opcode, x, y in decoded:
+            self.file.write(RECORD.pack(MESSAGE, opcode, 0, self.backend.now(), 0.0, x, y, 0.0))
+        return message
+
+    def now(self):
+        return self.backend.now()
+
+    def game_over(self):
+        over = self.backend.game_over()
+        if over:
+            self.file.write(RECORD.pack(GAME_OVER, 0, 0, self.backend.now(), 0.0, 0.0, 0.0, 0.0))
+        return over
+
+    def close(self):
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def load_recording(path):
+    """
+    Memory-map a recording.
+
+    Returns:
+        numpy.ndarray: The records as a read-only structured array of `RECORD_DTYPE`, backed by the file.
+
+    Raises:
+        ValueError: If the file is not a recording.
+    """
+    with open(path, "rb") as recording_file:
+        if recording_file.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f"{path} is not a match recording")
+    count = (os.path.getsize(path) - len(MAGIC)) // RECORD.size
+    if count == 0:
+        return np.zeros(0, dtype=RECORD_DTYPE)
+    return np.memmap(path, dtype=RECORD_DTYPE, mode="r", offset=len(MAGIC), shape=(count,))
+
+
+class MatchReplay:
+    """
+    Backend that plays a recording back to a GoalKeeper.
+
+    Explanation:
+    - The laser readings are answered in the recorded order, from the memory-mapped file: a sweep is a view on the
+    recorded distances, nothing is copied.
+    - A teammate message is delivered once the replay has answered every laser reading recorded before it, so the
+    messages arrive at the same point of the control loop as in the match. The same goes for the recorded
+    `game_over`, which ends a decision where the match ended it.
+    - The clock is the recorded time of the last answered reading.
+    - The game is over once every reading has been answered. A keeper that asks for more readings than were
+    recorded gets the last one again, and a sweep longer than the recorded one repeats the recorded readings.
+    - Whenever the keeper asks for a reading from another heading or location than the recorded one, the replay
+    counts a divergence: after a code change, `divergences` tells where the keeper stopped following the match.
+    """
+
+    def __init__(self, path):
+        self.records = load_recording(path)
+        # The raw bytes of the file, a single record is unpacked straight from the mapping
+        self.buffer = memoryview(self.records.view(np.uint8)) if len(self.records) else memoryview(b"")
+        kinds = self.records["kind"]
+        self.distances = self.records["distance"]
+        self.lasers = np.flatnonzero(kinds == LASER)
+        self.sweeps = np.flatnonzero((kinds == SWEEP) & (self.records["count"] > 0))
+        self.messages = np.flatnonzero(kinds == MESSAGE).tolist()
+        self.game_overs = np.flatnonzero(kinds == GAME_OVER).tolist()
+        # every reading of the recording, in order: the record index of each single reading and sweep start
+        self.readings = np.sort(np.concatenate((self.lasers, self.sweeps))).tolist()
+        self.rewind()
+
+    def rewind(self):
+        self.reading = 0
+        self.message = 0
+        self.game_over_index = 0
+        self.time = 0.0
+        self.divergences = 0
+
+    def next_reading(self, kind, location, heading):
+        """
+        Get the record index of the next reading of `kind`, skipping readings of the other kind.
+        """
+        while self.reading < len(self.readings):
+            index = self.readings[self.reading]
+            self.reading += 1
+            record = RECORD.unpack_from(self.buffer, index * RECORD.size)
+            record_kind, _, _, record_time, record_heading, x, y, _ = record
+            if record_kind != kind:
+                self.divergences += 1
+                continue
+            if record_heading != heading or x != location[0] or y != location[1]:
+                self.divergences += 1
+            self.time = record_time
+            return index
+        self.divergences += 1
+        return None
+
+    def activate_laser(self, location, facing_degree):
+        index = self.next_reading(LASER, location, facing_degree)
+        if index is None:
+            if not len(self.lasers):
+                return np.inf
+            index = self.lasers[-1]
+        return RECORD.unpack_from(self.buffer, index * RECORD.size)[-1]
+
+    def activate_laser_sweep(self, location, angles):
+        heading = angles[0] if len(angles) else 0.0
+        index = self.next_reading(SWEEP, location, heading)
+        if index is None:
+            index = self.sweeps[-1] if len(self.sweeps) else None
+        if index is None:
+            return np.full(len(angles), np.inf)
+        distances = self.distances[index : index + int(self.records["count"][index])]
+        if len(distances) != len(angles):
+            self.divergences += 1
+            return np.resize(distances, len(angles))
+        return distances
+
+    def upcoming(self):
+        """
+        Get the record index of the next reading, the records before it are due.
+        """
+        return self.readings[self.reading] if self.reading < len(self.readings) else len(self.records)
+
+    def receive(self):
+        if self.message >= len(self.messages) or self.messages[self.message] > self.upcoming():
+            return None
+        index = self.messages[self.message]
+        self.message += 1
+        _, opcode, _, _, _, x, y, _ = RECORD.unpack_from(self.buffer, index * RECORD.size)
+        return encode(opcode, x, y)
+
+    def now(self):
+        return self.time
+
+    def game_over(self):
+        if self.game_over_index < len(self.game_overs) and self.game_overs[self.game_over_index] < self.upcoming():
+            self.game_over_index += 1
+            return True
+        return self.reading >= len(self.readings)
+
+
+def replay_match(path, sweep_mode=False, **keeper_arguments):
+    """
+    Replay a recording through a new GoalKeeper, the way `GoalKeeper.run` plays a match.
+
+    Args:
+        path (str): The recording.
+        sweep_mode (bool, optional): Replay with the keeper in sweep mode.
+        **keeper_arguments: Arguments passed to `GoalKeeper`.
+
+    Returns:
+        tuple: The y-coordinates the keeper decided to move to, in order, and the number of divergences.
+    """
+    replay = MatchReplay(path)
+    keeper = GoalKeeper(backend=replay, **keeper_arguments)
+    keeper.sweep_mode = sweep_mode
+    decisions = []
+    while not keeper.game_over():
+        ball_y = keeper.prevent_attack()
+        if ball_y is None:
+            continue
+        decisions.append(ball_y)
+        keeper.go_to_location(keeper.goal_depth + keeper.robot_radius, ball_y)
+    return decisions, replay.divergences
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Replay a match recording through the GoalKeeper.")
+    parser.add_argument("recording", help="a file written by MatchRecorder")
+    parser.add_argument("--sweep-mode", action="store_true", help="replay with the keeper in sweep mode")
+    args = parser.parse_args(argv)
+
+    decisions, divergences = replay_match(args.recording, args.sweep_mode)
+    for ball_y in decisions:
+        print(f"{ball_y:.4f}")
+    print(f"{len(decisions)} decisions, {divergences} divergences from the recording")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,162 @@
+# Dependencies:
+# - math: Provides mathematical functions.
+import math
+
+STEP_TOLERANCE = 1e-12  # a step component this small is the rounding residue of cos or sin at a right angle
+
+
+class MotionCommand:
+    """
+    A single coalesced move: rotate to `heading`, then walk `steps` steps of `step_size` forward.
+
+    Attributes:
+        heading (float): The facing degree to rotate to, in [0, 360).
+        start (tuple): The (x, y) position the move starts from.
+        delta (tuple): The (delta x, delta y) of a single step.
+        steps (int): The number of steps the robot actually walks, after clipping to the field.
+        distance (float): The distance walked, `steps * step_size`.
+        target (tuple): The (x, y) position the move ends at.
+    """
+
+    __slots__ = ("heading", "start", "delta", "steps", "distance", "target")
+
+    def __init__(self, heading, start, delta, steps, step_size):
+        self.heading = heading
+        self.start = start
+        self.delta = delta
+        self.steps = steps
+        self.distance = steps * step_size
+        self.target = self.position_after(steps)
+
+    def position_after(self, steps):
+        """
+        Get the position of the robot after walking `steps` steps of the command.
+
+        Args:
+            steps (int): The number of steps walked, more than `self.steps` counts as `self.steps`.
+
+        Returns:
+            tuple: The (x, y) position.
+        """
+        steps = min(steps, self.steps)
+        return self.start[0] + steps * self.delta[0], self.start[1] + steps * self.delta[1]
+
+
+class MotionPlanner:
+    """
+    Plan `go_to_location` moves in closed form and keep the command that is being executed.
+
+    Explanation:
+    - `go_to_location` used to walk to the target with one `move_forward` per `step_size`, each one a separate
+    command to the game manager, checked against the field limits one at a time.
+    - The robot walks in a straight line and the field is a rectangle, so the steps that stay in the field are
+    always the first ones: the planner finds how many in closed form and emits one command.
+    - The command being executed is `active`. Submitting a new command replaces it, so a new estimate from
+    `prevent_attack` can take over a move that is still in flight.
+    """
+
+    def __init__(self, step_size, field_width, field_length):
+        self.step_size = step_size
+        self.field_width = field_width
+        self.field_length = field_length
+        self.active = None
+
+    def is_within_field_limits(self, x, y):
+        return 0 <= x <= self.field_width and 0 <= y <= self.field_length
+
+    def steps_within_field(self, position, delta):
+        """
+        Get how many steps of `delta` can be walked from `position` before leaving the field.
+
+        Args:
+            position (tuple): The (x, y) starting position, inside the field.
+            delta (tuple): The (delta x, delta y) of a single step.
+
+        Returns:
+            float: The number of steps, math.inf if the walk never leaves the field.
+
+        Math Explanation:
+        - Along each axis the robot stays in [0, limit] for k <= (limit - x) / delta_x when moving forward on the
+            axis, and for k <= x / -delta_x when moving backward. The answer is the smallest bound, rounded down.
+        - A component smaller than `STEP_TOLERANCE` bounds nothing, see `plan`.
+        """
+        steps = math.inf
+        axes = ((position[0], delta[0], self.field_width), (position[1], delta[1], self.field_length))
+        for coordinate, step, limit in axes:
+            if step > STEP_TOLERANCE:
+                steps = min(steps, math.floor((limit - coordinate) / step))
+            elif step < -STEP_TOLERANCE:
+                steps = min(steps, math.floor(coordinate / -step))
+        return steps
+
+    def plan(self, location, target):
+        """
+        Plan the move from `location` to `target`.
+
+        Args:
+            location (tuple): The (x, y) position of the robot.
+            target (tuple): The (x, y) position to move to.
+
+        Returns:
+            MotionCommand: The coalesced command.
+
+        Explanation:
+        - The heading is the angle to the target, the same as `go_to_location` computes it.
+        - The robot walks the smallest number of whole steps that covers the distance, ceil(distance / step_size),
+        which is what the step-by-step loop did.
+        - A step that would leave the field is not taken, and neither is any step after it, the robot stops at the
+        last position inside the field.
+        - If the robot starts out of the field, it only walks if its first step lands inside the field.
+        - At 90, 180 and 270 degrees cos and sin leave residues like 6e-17 instead of 0. A step component smaller
+        than `STEP_TOLERANCE` is 0: a robot on an edge of the field walks along it, and stays exactly on it.
+        """
+        delta_x = target[0] - location[0]
+        delta_y = target[1] - location[1]
+        heading = (math.degrees(math.atan2(delta_y, delta_x)) + 360) % 360
+        distance = math.sqrt(delta_x**2 + delta_y**2)
+
+        radian_angle = math.radians(heading)
+        delta = tuple(
+            0.0 if abs(component) < STEP_TOLERANCE else component
+            for component in (self.step_size * math.cos(radian_angle), self.step_size * math.sin(radian_angle))
+        )
+        steps = math.ceil(distance / self.step_size) if distance > 0 else 0
+        if not self.is_within_field_limits(*location) and steps:
+            first_step = (location[0] + delta[0], location[1] + delta[1])
+            if self.is_within_field_limits(*first_step):
+                steps = 1 + max(0, min(steps - 1, self.steps_within_field(first_step, delta)))
+            else:
+                steps = 0
+        else:
+            steps = max(0, min(steps, self.steps_within_field(location, delta)))
+        return MotionCommand(heading, location, delta, steps, self.step_size)
+
+    def submit(self, command):
+        """
+        Make `command` the active command.
+
+        Args:
+            command (MotionCommand): The new command.
+
+        Returns:
+            MotionCommand: The command it replaced, or None if no command was active.
+        """
+        replaced = self.active
+        self.active = command
+        return replaced
+
+    def interrupt(self, steps_done):
+        """
+        Stop the active command after `steps_done` steps.
+
+        Args:
+            steps_done (int): The steps the robot walked before it stopped.
+
+        Returns:
+            tuple: The (x, y) position the robot stopped at, or None if no command was active.
+        """
+        if self.active is None:
+            return None
+        position = self.active.position_after(steps_done)
+        self.active = None
+        return position
@@ -0,0 +1,228 @@
+# Dependencies:
+# - math: Provides mathematical functions.
+# - collections.deque: Holds the planned headings.
+import math
+from collections import deque
+
+HINT_RIGHT = 1  # the teammate saw the ball at the right corner, towards the larger y
+HINT_LEFT = -1  # the teammate saw the ball at the left corner, towards the smaller y
+
+
+class LinearSearch:
+    """
+    The fixed search of `prevent_attack`: one `face_movement` step at a time.
+
+    Explanation:
+    - The robot reads the heading it is facing. After a miss, or a hit that is not the ball, it rotates one step
+    clockwise or counterclockwise, depending on `search_direction`, and after a ball hit it stays on the heading
+    to follow the ball.
+    - When `encountered_a_ball` rules a hit out because one of its side reads found another object, that heading
+    is read next, wherever it points: the other object may be the ball.
+    - `prevent_attack` turns the robot back to 90 degrees when it faces our own goal.
+    """
+
+    def __init__(self):
+        self.pending = None  # the heading of the object a classification read found, read next
+
+    def begin(self, keeper):
+        self.pending = None
+
+    def hint(self, keeper, side):
+        pass
+
+    def next_heading(self, keeper):
+        if self.pending is not None:
+            heading, self.pending = self.pending, None
+            return heading
+        return keeper.facing_degree
+
+    def report(self, keeper, heading, found, ball, other_heading=None):
+        if found and ball:
+            return
+        if found and other_heading is not None:
+            self.pending = other_heading
+            return
+        keeper.rotate_to_angle(heading)
+        if keeper.search_direction:
+            keeper.rotate_clockwise()
+        else:
+            keeper.rotate_counter_clockwise()
+
+
+class PredictiveSearch:
+    """
+    Coarse-to-fine search: find the ball with coarse steps, then follow it with fine ones.
+
+    Explanation:
+    - Coarse pass: the half circle facing the field is read every `coarse_step` degrees. The ball covers
+    2 * asin(ball_radius / distance) degrees as seen from the robot, so a coarse step up to that width at the
+    farthest point of the field cannot step over a ball in the field. The step is rounded down to a multiple of
+    `face_movement`, the headings stay on the lattice of the rotation methods.
+    - Every other coarse pass is shifted by half a coarse step, for a ball that the previous pass only grazed.
+    - Headings the field rules out are skipped: those facing our own goal, and those where the field boundary is
+    closer than `robot_radius`, no ball fits between the robot and the boundary there.
+    - Following: after a ball sighting the same heading is read again, as the linear search does. When the ball
+    leaves the ray, the search predicts the next position from the last two sightings and reads the headings
+    around the prediction, nearest first, before it goes back to the coarse pass.
+    - When `encountered_a_ball` rules a hit out because one of its side reads found another object, that heading
+    is read next, as in the linear search.
+    - Seeds: a coarse pass starts at the heading predicted from the last tracked trajectory, if there is one.
+    A teammate corner hint starts the pass on the side of the hinted corner.
+    - `search_direction` sets the order of the coarse pass, clockwise from 90 degrees or counterclockwise from 270.
+    """
+
+    def __init__(self, refine_span=None):
+        self.refine_span = refine_span  # degrees read around a prediction, defaults to half a coarse step
+        self.queue = deque()
+        self.side = 0
+        self.shifted = False
+        self.following = None  # the heading of the last ball sighting while the ball is in the ray
+        self.planned_from = None  # the location the coarse step was computed for
+        self.coarse_step = None
+
+    def begin(self, keeper):
+        self.queue.clear()
+        self.following = None
+        self.plan(keeper)
+        self.seed(keeper)
+
+    def hint(self, keeper, side):
+        """
+        Start the next coarse pass on the side of a teammate hint.
+
+        Args:
+            keeper (GoalKeeper): The searching robot.
+            side (int): HINT_RIGHT or HINT_LEFT.
+        """
+        self.side = side
+        self.queue.clear()
+        self.plan(keeper)
+
+    def snap(self, keeper, heading):
+        step = keeper.face_movement
+        return round(heading / step) * step % 360
+
+    def wall_distance(self, keeper, heading):
+        """
+        Get the distance from the robot to the field boundary along a heading.
+        """
+        x, y = keeper.location
+        radian_angle = math.radians(heading)
+        dx = math.cos(radian_angle)
+        dy = math.sin(radian_angle)
+        distance = math.inf
+        if dx > 0:
+            distance = (keeper.field_width - x) / dx
+        elif dx < 0:
+            distance = -x / dx
+        if dy > 0:
+            distance = min(distance, (keeper.field_length - y) / dy)
+        elif dy < 0:
+            distance = min(distance, -y / dy)
+        return distance
+
+    def allowed(self, keeper, heading):
+        """
+        Check if a ball could be seen on a heading.
+        """
+        if 90 < heading < 270:
+            return False
+        return self.wall_distance(keeper, heading) > keeper.robot_radius
+
+    def plan(self, keeper):
+        """
+        Compute the coarse step for the robot's location.
+
+        Math Explanation:
+        - The farthest point of the field is one of its corners, at distance `reach`. A ball there covers
+            2 * asin(ball_radius / reach) degrees, any closer ball covers more.
+        """
+        x, y = keeper.location
+        reach = max(
+            math.hypot(corner_x - x, corner_y - y)
+            for corner_x in (0, keeper.field_width)
+            for corner_y in (0, keeper.field_length)
+        )
+        width = 2 * math.degrees(math.asin(min(1.0, keeper.ball_radius / reach)))
+        self.coarse_step = max(1, math.floor(width / keeper.face_movement)) * keeper.face_movement
+        self.planned_from = keeper.location
+
+    def coarse_pass(self, keeper):
+        """
+        Get the headings of one coarse pass, in the order they are read.
+        """
+        step = self.coarse_step
+        offset = self.snap(keeper, step / 2) if self.shifted else 0
+        self.shifted = not self.shifted
+        count = int((180 - offset) // step) + 1
+        clockwise = [(90 - offset - index * step) % 360 for index in range(count)]
+
+        if self.side == HINT_RIGHT or (not self.side and keeper.search_direction):
+            headings = clockwise
+        else:
+            headings = clockwise[::-1]
+        if self.side:
+            # Read the hinted quarter first: headings towards the larger y for the right corner
+            hinted = [heading for heading in headings if (heading <= 90) == (self.side == HINT_RIGHT)]
+            headings = hinted + [heading for heading in headings if heading not in hinted]
+            self.side = 0
+        return [heading for heading in headings if self.allowed(keeper, heading)]
+
+    def predicted_heading(self, keeper):
+        """
+        Get the heading of the ball's next position, extrapolated from the last two sightings.
+
+        Returns:
+            float: The heading on the lattice, or None if the tracker has less than two sightings.
+        """
+        points = keeper.tracker.points()
+        if len(points) < 2:
+            return None
+        (previous_x, previous_y), (last_x, last_y) = points[-2], points[-1]
+        next_x = 2 * last_x - previous_x
+        next_y = 2 * last_y - previous_y
+        x, y = keeper.location
+        return self.snap(keeper, math.degrees(math.atan2(next_y - y, next_x - x)))
+
+    def refine(self, keeper, center):
+        """
+        Queue the headings around `center`, nearest first, ahead of the rest of the search.
+        """
+        span = self.refine_span if self.refine_span is not None else self.coarse_step / 2
+        step = keeper.face_movement
+        headings = [center]
+        for index in range(1, int(span // step) + 1):
+            headings.append((center + index * step) % 360)
+            headings.append((center - index * step) % 360)
+        self.queue.extendleft(reversed([heading for heading in headings if self.allowed(keeper, heading)]))
+
+    def seed(self, keeper):
+        predicted = self.predicted_heading(keeper)
+        if predicted is not None:
+            self.refine(keeper, predicted)
+
+    def next_heading(self, keeper):
+        if self.following is not None:
+            return self.following
+        if keeper.location != self.planned_from:
+            # The robot moved, the coarse step and the pruned headings changed
+            self.queue.clear()
+            self.plan(keeper)
+        if not self.queue:
+            self.queue.extend(self.coarse_pass(keeper))
+        if not self.queue:
+            return keeper.facing_degree
+        return self.queue.popleft()
+
+    def report(self, keeper, heading, found, ball, other_heading=None):
+        if found and ball:
+            self.following = heading
+            return
+        if self.following is not None:
+            # The ball left the ray, look where it is going
+            self.following = None
+            predicted = self.predicted_heading(keeper)
+            self.refine(keeper, predicted if predicted is not None else heading)
+        if found and other_heading is not None:
+            # A classification read found another object, it may be the ball
+            self.queue.appendleft(other_heading % 360)
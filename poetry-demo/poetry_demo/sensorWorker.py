@@ -0,0 +1,279 @@
+# Dependencies:
+# - multiprocessing: Runs the acquisition worker in its own process, and shares the ring buffer with it.
+# - struct: Packs and unpacks the records straight in the shared memory.
+# - time: Timestamps the samples with the monotonic clock, shared by every process of the machine.
+import multiprocessing
+import struct
+import time
+from multiprocessing import shared_memory
+
+RING_CAPACITY = 4096  # records kept in the ring buffer, the oldest are overwritten
+SENSOR_MAX_AGE = 0.05  # seconds a sample is used for, older samples are read again by the control loop
+READ_RETRIES = 4  # attempts to read a record the worker is writing at the same time
+HEADING_TOLERANCE = 0.5  # degrees, a sample taken along a heading this close to the one asked for is used for it
+LOCATION_TOLERANCE = 1e-6  # field units, a sample taken from a location this close to the robot is used
+
+# Shared Memory Layout:
+# A 64 bytes header, then `capacity` records of 48 bytes, then one index per heading bin, little endian:
+#   header   written (unsigned long long), the number of records written so far
+#            pose sequence (unsigned long long), odd while the control loop writes the pose
+#            x, y of the robot (double), the location the worker samples from
+#            stop (unsigned long long), set to 1 to stop the worker
+#   record   sequence (unsigned long long), odd while the worker writes the record
+#            heading, distance, time, x, y (double)
+#   index    the number of the latest record of the bin plus one (long long), 0 when the bin has no record
+HEADER = struct.Struct("<QQddQ")
+HEADER_SIZE = 64
+RECORD = struct.Struct("<Qddddd")
+INDEX = struct.Struct("<q")
+COUNTER = struct.Struct("<Q")
+POSE = struct.Struct("<dd")
+POSE_OFFSET = 8
+STOP_OFFSET = 32
+
+
+class SensorRing:
+    """
+    Ring buffer of timestamped laser samples in shared memory, with the latest sample of every heading bin.
+
+    Explanation:
+    - One process writes (the acquisition worker), any number of processes read. Nothing is locked: every record
+    carries a sequence number that is odd while it is written (a seqlock), and a reader that sees an odd or a
+    changed sequence reads again.
+    - Next to the ring an index keeps the latest record of every heading bin, so reading the latest sample of a
+    heading costs one lookup, whatever the capacity.
+    - The control loop publishes the robot's location in the header the same way, the worker samples from it.
+    - The circle is split into bins of `bin_width` degrees centered on its multiples. The latest sample of a bin
+    is only returned for a heading within `heading_tolerance` degrees of the heading it was taken along.
+    """
+
+    def __init__(self, bin_width, capacity=RING_CAPACITY, name=None):
+        self.bin_width = bin_width
+        self.capacity = capacity
+        self.bins = max(1, round(360 / bin_width))
+        self.index_offset = HEADER_SIZE + capacity * RECORD.size
+        size = self.index_offset + self.bins * INDEX.size
+        if name is None:
+            self.memory = shared_memory.SharedMemory(create=True, size=size)
+            self.memory.buf[:size] = bytes(size)
+            self.owner = True
+        else:
+            self.memory = shared_memory.SharedMemory(name=name)
+            self.owner = False
+        self.buffer = self.memory.buf
+
+    @property
+    def name(self):
+        return self.memory.name
+
+    def bin(self, heading):
+        return int(round(heading / self.bin_width)) % self.bins
+
+    def write(self, heading, distance, now, x, y):
+        """
+        Append a sample to the ring and make it the latest of its heading bin. Only the worker writes.
+        """
+        written = COUNTER.unpack_from(self.buffer, 0)[0]
+        offset = HEADER_SIZE + (written % self.capacity) * RECORD.size
+        sequence = COUNTER.unpack_from(self.buffer, offset)[0]
+        COUNTER.pack_into(self.buffer, offset, sequence + 1)
+        RECORD.pack_into(self.buffer, offset, sequence + 1, heading, distance, now, x, y)
+        COUNTER.pack_into(self.buffer, offset, sequence + 2)
+        INDEX.pack_into(self.buffer, self.index_offset + self.bin(heading) * INDEX.size, written + 1)
+        COUNTER.pack_into(self.buffer, 0, written + 1)
+
+    def latest(self, heading, heading_tolerance=None):
+        """
+        Get the latest sample of a heading bin.
+
+        Args:
+            heading (float): The heading in degrees.
+            heading_tolerance (float, optional): The largest difference in degrees between `heading` and the
+                heading the sample was taken along. Defaults to half a bin.
+
+        Returns:
+            tuple: (heading, distance, time, x, y), or None if the bin has no sample, its record was overwritten,
+            or it was taken along a heading farther than `heading_tolerance`.
+        """
+        if heading_tolerance is None:
+            heading_tolerance = self.bin_width / 2
+        number = INDEX.unpack_from(self.buffer, self.index_offset + self.bin(heading) * INDEX.size)[0]
+        if number == 0:
+            return None
+        offset = HEADER_SIZE + ((number - 1) % self.capacity) * RECORD.size
+        for _ in range(READ_RETRIES):
+            sequence, *sample = RECORD.unpack_from(self.buffer, offset)
+            if sequence % 2 == 0 and COUNTER.unpack_from(self.buffer, offset)[0] == sequence:
+                if self.bin(sample[0]) != self.bin(heading):
+                    return None  # the ring wrapped around since the bin was sampled
+                if abs((sample[0] - heading + 180) % 360 - 180) > heading_tolerance:
+                    return None
+                return tuple(sample)
+        return None
+
+    def written(self):
+        return COUNTER.unpack_from(self.buffer, 0)[0]
+
+    def publish_pose(self, location):
+        """
+        Publish the robot's location for the worker. Only the control loop publishes.
+        """
+        sequence = COUNTER.unpack_from(self.buffer, POSE_OFFSET)[0]
+        COUNTER.pack_into(self.buffer, POSE_OFFSET, sequence + 1)
+        POSE.pack_into(self.buffer, POSE_OFFSET + COUNTER.size, location[0], location[1])
+        COUNTER.pack_into(self.buffer, POSE_OFFSET, sequence + 2)
+
+    def pose(self):
+        """
+        Get the latest published location, None before the first one or if it was written during READ_RETRIES
+        attempts.
+        """
+        for _ in range(READ_RETRIES):
+            sequence = COUNTER.unpack_from(self.buffer, POSE_OFFSET)[0]
+            location = POSE.unpack_from(self.buffer, POSE_OFFSET + COUNTER.size)
+            if sequence % 2 == 0 and COUNTER.unpack_from(self.buffer, POSE_OFFSET)[0] == sequence:
+                return location if sequence else None
+        return None
+
+    def request_stop(self):
+        COUNTER.pack_into(self.buffer, STOP_OFFSET, 1)
+
+    def stopping(self):
+        return COUNTER.unpack_from(self.buffer, STOP_OFFSET)[0] != 0
+
+    def close(self):
+        """
+        Detach from the shared memory, and free it if this ring created it.
+        """
+        self.buffer.release()
+        self.memory.close()
+        if self.owner:
+            self.memory.unlink()
+
+
+def acquire(name, bin_width, capacity, laser_factory, headings):
+    """
+    Body of the acquisition worker: sample the headings over and over until the ring is told to stop.
+
+    Args:
+        name (str): The shared memory of the ring.
+        bin_width (float): The bin width of the ring.
+        capacity (int): The capacity of the ring.
+        laser_factory (callable): Builds the laser in the worker process, anything with
+            `activate_laser(location, facing_degree)`. It must be picklable.
+        headings (list): The headings sampled, in order.
+    """
+    ring = SensorRing(bin_width, capacity, name)
+    laser = laser_factory()
+    try:
+        while not ring.stopping():
+            for heading in headings:
+                location = ring.pose()
+                if location is None:
+                    time.sleep(0.001)  # the control loop has not published where the robot is yet, or is writing it
+                    break
+                distance = laser.activate_laser(location, heading)
+                ring.write(heading, distance, time.monotonic(), location[0], location[1])
+    finally:
+        ring.close()
+
+
+class SensorWorker:
+    """
+    Laser acquisition in a separate process, read by the control loop without waiting for the laser.
+
+    Explanation:
+    - The worker process fires the laser continuously over `headings` (by default the half circle facing the
+    field, every `bin_width` degrees) from the location the control loop publishes, and writes every sample
+    with its time and location to a `SensorRing`.
+    - `latest(location, heading)` returns the latest sample of the heading's bin if it is fresh: taken less than
+    `max_age` seconds ago, along a heading within `heading_tolerance` degrees and from a location within
+    `location_tolerance` field units. Otherwise it returns None, and the caller reads the laser itself, as without
+    a worker.
+    - The worker has its own interpreter, so the laser I/O runs next to the control loop on another core,
+    and does not compete with it for the GIL.
+    - `start()` starts the process, `stop()` stops it and frees the shared memory, or use it as a context manager.
+
+    Assumptions:
+    - The laser can be driven from another process, `laser_factory` builds it there.
+    - A sample is valid for headings within `heading_tolerance` of its own, the laser hits nearly the same point.
+    """
+
+    def __init__(
+        self,
+        laser_factory,
+        bin_width,
+        headings=None,
+        capacity=RING_CAPACITY,
+        max_age=SENSOR_MAX_AGE,
+        heading_tolerance=HEADING_TOLERANCE,
+        location_tolerance=LOCATION_TOLERANCE,
+    ):
+        self.laser_factory = laser_factory
+        self.bin_width = bin_width
+        if headings is None:
+            steps = int(180 // bin_width)
+            headings = [(90 - index * bin_width) % 360 for index in range(steps + 1)]
+        self.headings = list(headings)
+        self.capacity = capacity
+        self.max_age = max_age
+        self.heading_tolerance = heading_tolerance
+        self.location_tolerance = location_tolerance
+        self.ring = None
+        self.process = None
+        self.hits = 0
+        self.misses = 0
+
+    def start(self):
+        if self.process is not None:
+            return self
+        self.ring = SensorRing(self.bin_width, self.capacity)
+        self.process = multiprocessing.Process(
+            target=acquire,
+            args=(self.ring.name, self.bin_width, self.capacity, self.laser_factory, self.headings),
+            daemon=True,
+        )
+        self.process.start()
+        return self
+
+    def stop(self):
+        if self.process is None:
+            return
+        self.ring.request_stop()
+        self.process.join()
+        self.ring.close()
+        self.process = None
+        self.ring = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def publish_pose(self, location):
+        if self.ring is not None:
+            self.ring.publish_pose(location)
+
+    def latest(self, location, heading):
+        """
+        Get a fresh sample of a heading.
+
+        Args:
+            location (tuple): The (x, y) position of the robot.
+            heading (float): The heading in degrees.
+
+        Returns:
+            float: The distance, or None if there is no fresh sample from this location.
+        """
+        sample = self.ring.latest(heading, self.heading_tolerance) if self.ring is not None else None
+        if (
+            sample is None
+            or time.monotonic() - sample[2] > self.max_age
+            or abs(sample[3] - location[0]) > self.location_tolerance
+            or abs(sample[4] - location[1]) > self.location_tolerance
+        ):
+            self.misses += 1
+            return None
+        self.hits += 1
+        return sample[1]
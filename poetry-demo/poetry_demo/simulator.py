@@ -0,0 +1,351 @@
+# Dependencies:
+# - math: Provides mathematical functions.
+# - collections.deque: Holds the scheduled teammate messages in delivery order.
+# - numpy (as np): Used for the vectorized ray-circle intersection.
+import math
+from collections import deque
+
+import numpy as np
+
+from poetry_demo.goalKeeper import BALL_RADIUS, FIELD_LENGTH, FIELD_WIDTH, GOAL_DEPTH, GOAL_WIDTH, ROBOT_RADIUS
+
+# Assumptions:
+# Simulated Clock:
+# The simulation has its own clock. It only moves forward when the laser is activated, by `laser_period` for every
+# reading, so a shot runs as fast as the host can compute it and every run with the same inputs is identical.
+
+# Field Model:
+# The field uses the same axes as GoalKeeper: x runs along the field width (from our goal line towards the enemy)
+# and y along the field length. Our goal mouth is the segment x = goal_depth,
+# (field_length - goal_width) / 2 <= y <= (field_length + goal_width) / 2.
+
+# Objects:
+# The ball and the opposing robots are circles that move in straight lines at a constant velocity.
+
+LASER_PERIOD = 0.002  # seconds of simulated time per laser reading
+SHOT_DURATION = 10.0  # seconds of simulated time before a shot is called off
+
+
+class FieldSimulator:
+    """
+    Deterministic in-process backend for GoalKeeper.
+
+    Pass it as `GoalKeeper(backend=FieldSimulator())` and the keeper's laser, transceiver and `game_over`
+    are answered by the simulation instead of the robot hardware.
+    """
+
+    def __init__(
+        self,
+        field_length=FIELD_LENGTH,
+        field_width=FIELD_WIDTH,
+        goal_width=GOAL_WIDTH,
+        goal_depth=GOAL_DEPTH,
+        ball_radius=BALL_RADIUS,
+        robot_radius=ROBOT_RADIUS,
+        laser_period=LASER_PERIOD,
+        duration=SHOT_DURATION,
+        laser_noise=0.0,
+        seed=0,
+    ):
+        self.field_length = field_length
+        self.field_width = field_width
+        self.goal_width = goal_width
+        self.goal_depth = goal_depth
+        self.ball_radius = ball_radius
+        self.robot_radius = robot_radius
+        self.laser_period = laser_period
+        self.duration = duration
+        self.laser_noise = laser_noise
+        self.rng = np.random.default_rng(seed)
+        self.time = 0.0
+        self.laser_activations = 0
+        # Row 0 is the ball, the other rows are the opposing robots
+        self.centers = np.array([[-field_width, -field_length]], dtype=float)  # the ball starts out of the field
+        self.velocities = np.zeros((1, 2))
+        self.radii = np.array([ball_radius], dtype=float)
+        self.messages = deque()
+
+    @property
+    def ball_position(self):
+        return self.centers[0]
+
+    @property
+    def ball_velocity(self):
+        return self.velocities[0]
+
+    def kick(self, position, velocity):
+        """
+        Place the ball and start a new shot.
+
+        Args:
+            position (tuple): The (x, y) position of the ball.
+            velocity (tuple): The (x, y) velocity of the ball in field units per second.
+
+        Returns:
+            None
+        """
+        self.centers[0] = position
+        self.velocities[0] = velocity
+        self.time = 0.0
+        self.laser_activations = 0
+
+    def add_opponent(self, position, velocity=(0, 0)):
+        """
+        Add an opposing robot to the field.
+
+        Args:
+            position (tuple): The (x, y) position of the robot.
+            velocity (tuple, optional): The (x, y) velocity of the robot in field units per second.
+
+        Returns:
+            None
+        """
+        self.centers = np.vstack([self.centers, position])
+        self.velocities = np.vstack([self.velocities, velocity])
+        self.radii = np.append(self.radii, self.robot_radius)
+
+    def schedule_message(self, time, message):
+        """
+        Schedule a teammate message to be delivered once the simulated clock reaches `time`.
+
+        Args:
+            time (float): The simulated time of delivery in seconds.
+            message: The message, in any format `GoalKeeper.process_teammate_message` accepts.
+
+        Returns:
+            None
+        """
+        self.messages.append((time, message))
+        self.messages = deque(sorted(self.messages, key=lambda item: item[0]))
+
+    def advance(self, seconds):
+        """
+        Move the simulated clock and every object on the field forward.
+
+        Args:
+            seconds (float): The simulated time to advance.
+
+        Returns:
+            None
+        """
+        self.time += seconds
+        self.centers += self.velocities * seconds
+
+    def ray_distances(self, location, angles):
+        """
+        Measure the laser distance from `location` for every heading in `angles`.
+
+        Args:
+            location (tuple): The (x, y) position of the laser.
+            angles (numpy.ndarray): The headings in degrees.
+
+        Returns:
+        numpy.ndarray: The distance to the first circle or field boundary hit for every heading.
+
+        Math Explanation:
+        - A ray o + t * d (d a unit vector) hits a circle with center c and radius r where
+            t^2 - 2 * t * (d . (c - o)) + |c - o|^2 - r^2 = 0.
+        - With b = d . (c - o) and k = |c - o|^2 - r^2 the nearest hit is t = b - sqrt(b^2 - k),
+            and there is no hit when b^2 - k < 0 or t < 0.
+        - The rays and the circles are broadcast against each other, so all the headings and all the objects
+            are handled in one pass.
+        - The distance to the field boundary is the smallest positive t that reaches x = 0, x = field_width,
+            y = 0 or y = field_length.
+        """
+        radian_angles = np.radians(np.atleast_1d(np.asarray(angles, dtype=float)))
+        dx = np.cos(radian_angles)
+        dy = np.sin(radian_angles)
+        origin_x, origin_y = location
+
+        # Distance to the field boundary
+        with np.errstate(divide="ignore"):
+            to_x = np.where(dx > 0, (self.field_width - origin_x) / dx, np.where(dx < 0, -origin_x / dx, np.inf))
+            to_y = np.where(dy > 0, (self.field_length - origin_y) / dy, np.where(dy < 0, -origin_y / dy, np.inf))
+        distances = np.minimum(to_x, to_y)
+
+        # Distance to the circles, rays on the rows and circles on the columns
+        offset_x = self.centers[:, 0] - origin_x
+        offset_y = self.centers[:, 1] - origin_y
+        b = dx[:, None] * offset_x + dy[:, None] * offset_y
+        k = offset_x * offset_x + offset_y * offset_y - self.radii * self.radii
+        discriminant = b * b - k
+        hit = discriminant >= 0
+        t = b - np.sqrt(np.where(hit, discriminant, 0))
+        t = np.where(hit & (t > 0), t, np.inf)
+        distances = np.minimum(distances, t.min(axis=1))
+
+        if self.laser_noise:
+            distances = distances + self.rng.normal(0, self.laser_noise, distances.shape)
+        return distances
+
+    def ray_distance(self, location, facing_degree):
+        """
+        Measure the laser distance from `location` for a single heading.
+
+        The same math as `ray_distances`, written with scalars: for a single ray over a handful of objects
+        the NumPy call overhead costs more than the computation itself.
+        """
+        radian_angle = math.radians(facing_degree)
+        dx = math.cos(radian_angle)
+        dy = math.sin(radian_angle)
+        origin_x, origin_y = location
+
+        distance = math.inf
+        if dx > 0:
+            distance = (self.field_width - origin_x) / dx
+        elif dx < 0:
+            distance = -origin_x / dx
+        if dy > 0:
+            distance = min(distance, (self.field_length - origin_y) / dy)
+        elif dy < 0:
+            distance = min(distance, -origin_y / dy)
+
+        for (center_x, center_y), radius in zip(self.centers.tolist(), self.radii.tolist()):
+            offset_x = center_x - origin_x
+            offset_y = center_y - origin_y
+            b = dx * offset_x + dy * offset_y
+            discriminant = b * b - (offset_x * offset_x + offset_y * offset_y - radius * radius)
+            if discriminant >= 0:
+                t = b - math.sqrt(discriminant)
+                if 0 < t < distance:
+                    distance = t
+
+        if self.laser_noise:
+            distance += self.rng.normal(0, self.laser_noise)
+        return distance
+
+    def activate_laser(self, location, facing_degree):
+        """
+        Answer a single laser reading, see `ray_distance`. Costs `laser_period` of simulated time.
+        """
+        self.advance(self.laser_period)
+        self.laser_activations += 1
+        return self.ray_distance(location, facing_degree)
+
+    def activate_laser_sweep(self, location, angles):
+        """
+        Answer a laser sweep, see `ray_distances`. Costs `laser_period` of simulated time per heading.
+
+        The field is measured once at the start of the sweep, the objects are assumed not to move during it.
+        """
+        distances = self.ray_distances(location, angles)
+        self.advance(self.laser_period * len(distances))
+        self.laser_activations += len(distances)
+        return distances
+
+    def now(self):
+        """
+        Get the simulated time in seconds.
+        """
+        return self.time
+
+    def receive(self):
+        """
+        Deliver the next scheduled teammate message that is due.
+
+        Returns:
+            The message, or None if no message is due yet.
+        """
+        if self.messages and self.messages[0][0] <= self.time:
+            return self.messages.popleft()[1]
+        return None
+
+    def game_over(self):
+        """
+        Check if the shot is over: the ball crossed our goal line, left the field or the time ran out.
+
+        Returns:
+            bool: True once the shot is over.
+        """
+        ball_x, ball_y = self.centers[0]
+        out_of_field = not (0 <= ball_x <= self.field_width and 0 <= ball_y <= self.field_length)
+        return self.time >= self.duration or ball_x <= self.goal_depth or out_of_field
+
+    def resolve(self, keeper_location):
+        """
+        Follow the ball from where it is now, with the keeper standing at `keeper_location`, until the shot ends.
+
+        Args:
+            keeper_location (tuple): The (x, y) position the keeper holds.
+
+        Returns:
+            str: "saved" if the ball hits the keeper, "goal" if it crosses the goal mouth, "wide" otherwise.
+
+        Math Explanation:
+        - The ball hits the keeper at the first t >= 0 where |p + v * t - k| <= ball_radius + robot_radius,
+            a quadratic in t solved in closed form.
+        - The ball reaches the goal line at t = (goal_depth - p_x) / v_x when it moves towards our goal.
+        """
+        position = self.centers[0]
+        velocity = self.velocities[0]
+        offset = position - np.asarray(keeper_location, dtype=float)
+        reach = self.ball_radius + self.robot_radius
+
+        a = float(velocity @ velocity)
+        b = float(offset @ velocity)
+        c = float(offset @ offset) - reach * reach
+        if c <= 0:
+            return "saved"
+        hit_time = math.inf
+        if a > 0 and b * b - a * c >= 0:
+            hit_time = (-b - math.sqrt(b * b - a * c)) / a
+            if hit_time < 0:
+                hit_time = math.inf
+
+        goal_time = math.inf
+        if velocity[0] < 0:
+            goal_time = (self.goal_depth - position[0]) / velocity[0]
+        if hit_time <= goal_time and hit_time < math.inf:
+            return "saved"
+        if goal_time < math.inf:
+            goal_y = position[1] + velocity[1] * goal_time
+            if (self.field_length - self.goal_width) / 2 <= goal_y <= (self.field_length + self.goal_width) / 2:
+                return "goal"
+        return "wide"
+
+    def play_shot(self, keeper, position, velocity):
+        """
+        Play a single shot against `keeper` and report the outcome.
+
+        Args:
+            keeper (GoalKeeper): A keeper that uses this simulator as its backend.
+            position (tuple): The (x, y) position the ball is kicked from.
+            velocity (tuple): The (x, y) velocity of the ball in field units per second.
+
+        Returns:
+            str: "saved", "goal" or "wide", see `resolve`.
+
+        Explanation:
+        - Runs one decision of the keeper's control loop: `prevent_attack` followed by `go_to_location`,
+            the same as a single iteration of `GoalKeeper.run`.
+        - Once the keeper has committed to a position, the rest of the shot is resolved in closed form.
+        """
+        self.kick(position, velocity)
+        ball_y = keeper.prevent_attack()
+        if ball_y is not None:
+            keeper.go_to_location(keeper.goal_depth + keeper.robot_radius, ball_y)
+        return self.resolve(keeper.location)
+
+    def random_shots(self, count, speed=(4.0, 12.0)):
+        """
+        Draw `count` shots from the enemy half towards our goal mouth, using the simulator's seeded generator.
+
+        Args:
+            count (int): The number of shots.
+            speed (tuple, optional): The range of the ball speed in field units per second.
+
+        Returns:
+        tuple: Two (count, 2) arrays with the kick positions and velocities.
+        """
+        start_x = self.rng.uniform(self.field_width / 2, self.field_width - self.ball_radius, count)
+        start_y = self.rng.uniform(self.ball_radius, self.field_length - self.ball_radius, count)
+        target_y = self.rng.uniform(
+            (self.field_length - self.goal_width) / 2 - self.ball_radius,
+            (self.field_length + self.goal_width) / 2 + self.ball_radius,
+            count,
+        )
+        heading = np.arctan2(target_y - start_y, self.goal_depth - start_x)
+        ball_speed = self.rng.uniform(speed[0], speed[1], count)
+        positions = np.column_stack([start_x, start_y])
+        velocities = np.column_stack([ball_speed * np.cos(heading), ball_speed * np.sin(heading)])
+        return positions, velocities
@@ -0,0 +1,96 @@
+# Dependencies:
+# - collections.deque: The bounded queue between the listening thread and the control loop.
+# - time: Timestamps the messages to measure their latency.
+import time
+from collections import deque
+
+MESSAGE_QUEUE_SIZE = 64  # messages waiting for the control loop, the oldest is dropped when full
+
+
+class TeammateInbox:
+    """
+    Bounded queue of teammate messages, filled by the listening thread and drained by the control loop.
+
+    Explanation:
+    - `put` is called by the thread that receives the messages. Every message is stored with the time it arrived.
+    - `drain` is called by the control loop between laser reads, it hands every waiting message to a handler.
+    So the messages are applied at a known point in the loop and never race it.
+    - When the queue is full the oldest message is dropped, the latest information from the teammate is the
+    most relevant one.
+    - The queue is a bounded `deque`: `append` and `popleft` are atomic, so neither side takes a lock, and
+    checking an empty inbox on every laser step costs a length check.
+
+    Metrics:
+    - depth / max_depth: the messages waiting now and the most that ever waited.
+    - received / processed / dropped: message counters.
+    - last / mean / max latency: the seconds between a message arriving and the control loop applying it.
+    """
+
+    def __init__(self, maxsize=MESSAGE_QUEUE_SIZE):
+        self.queue = deque(maxlen=maxsize)
+        self.max_depth = 0
+        self.received = 0
+        self.processed = 0
+        self.dropped = 0
+        self.total_latency = 0.0
+        self.last_latency = 0.0
+        self.max_latency = 0.0
+
+    def __len__(self):
+        return len(self.queue)
+
+    def put(self, message):
+        """
+        Add a received message to the inbox, dropping the oldest one if the inbox is full.
+
+        Args:
+            message: The message received from the teammate.
+
+        Returns:
+            None
+        """
+        self.received += 1
+        if len(self.queue) == self.queue.maxlen:
+            self.dropped += 1  # the append below pushes the oldest message out
+        self.queue.append((time.perf_counter(), message))
+        self.max_depth = max(self.max_depth, len(self.queue))
+
+    def drain(self, handler):
+        """
+        Hand every waiting message to `handler`, without blocking.
+
+        Args:
+            handler (callable): Called with every message, in the order they arrived.
+
+        Returns:
+            int: The number of messages handled.
+        """
+        handled = 0
+        while self.queue:  # only this method removes messages, so a non-empty queue stays non-empty
+            received_at, message = self.queue.popleft()
+            latency = time.perf_counter() - received_at
+            self.processed += 1
+            self.total_latency += latency
+            self.last_latency = latency
+            self.max_latency = max(self.max_latency, latency)
+            handler(message)
+            handled += 1
+        return handled
+
+    def metrics(self):
+        """
+        Get the queue depth and message latency metrics.
+
+        Returns:
+        dict: The current metrics, see the class documentation.
+        """
+        return {
+            "depth": len(self.queue),
+            "max_depth": self.max_depth,
+            "received": self.received,
+            "processed": self.processed,
+            "dropped": self.dropped,
+            "last_latency": self.last_latency,
+            "mean_latency": self.total_latency / self.processed if self.processed else 0.0,
+            "max_latency": self.max_latency,
+        }
@@ -0,0 +1,113 @@
+# Dependencies:
+# - functools: Caches the NumPy dtype of a message.
+# - struct: Packs and unpacks a single binary message.
+# - numpy (as np): Decodes a buffer of many binary messages at once, without copying it. Imported on first use,
+#   see LazyModule.
+import functools
+import struct
+
+from poetry_demo.lazyImport import LazyModule
+
+np = LazyModule("numpy")
+
+# Message Format:
+# Every message is 12 bytes, little endian:
+#   byte 0      opcode (unsigned char)
+#   bytes 1-3   padding, keeps the coordinates 4-byte aligned
+#   bytes 4-7   x coordinate (float32)
+#   bytes 8-11  y coordinate (float32)
+# Messages without coordinates send 0, 0. Several messages can be sent back to back in a single buffer.
+
+OP_GO_TO_BASE = 1
+OP_BALL_AT_RIGHT_CORNER = 2
+OP_BALL_AT_LEFT_CORNER = 3
+OP_WRONG_DIRECTION = 4
+OP_POSITION = 5
+
+MESSAGE = struct.Struct("<B3xff")
+MESSAGE_SIZE = MESSAGE.size
+# The NumPy dtype of a message, built from this on first use, see message_dtype
+MESSAGE_FIELDS = {"names": ["opcode", "x", "y"], "formats": ["u1", "<f4", "<f4"], "offsets": [0, 4, 8]}
+
+BINARY_TYPES = (bytes, bytearray, memoryview)
+
+# The free-text messages we used before the binary format, still accepted for compatibility
+LEGACY_MESSAGES = {
+    "Go to base": OP_GO_TO_BASE,
+    "ball at the right corner": OP_BALL_AT_RIGHT_CORNER,
+    "ball at the left corner": OP_BALL_AT_LEFT_CORNER,
+    "you are looking in the wrong direction": OP_WRONG_DIRECTION,
+}
+LEGACY_POSITION_PREFIX = "position: "
+
+
+def encode(opcode, x=0.0, y=0.0):
+    """
+    Encode a single binary message.
+
+    Args:
+        opcode (int): One of the OP_* codes.
+        x (float, optional): The x-coordinate carried by the message.
+        y (float, optional): The y-coordinate carried by the message.
+
+    Returns:
+        bytes: The 12 bytes of the message.
+    """
+    return MESSAGE.pack(opcode, x, y)
+
+
+def decode(buffer, offset=0):
+    """
+    Decode a single binary message, reading straight from the buffer.
+
+    Args:
+        buffer (bytes-like): The buffer that holds the message.
+        offset (int, optional): Where the message starts in the buffer.
+
+    Returns:
+        tuple: The opcode, x and y of the message.
+    """
+    return MESSAGE.unpack_from(buffer, offset)
+
+
+def decode_batch(buffer):
+    """
+    Decode a buffer of back-to-back binary messages.
+
+    Args:
+        buffer (bytes-like): The buffer, its length is a multiple of `MESSAGE_SIZE`.
+
+    Returns:
+        numpy.ndarray: A structured array with the fields opcode, x and y. It is a view on the buffer, not a copy.
+    """
+    return np.frombuffer(buffer, dtype=message_dtype())
+
+
+@functools.lru_cache(maxsize=None)
+def message_dtype():
+    """
+    Get the NumPy dtype of a message. It is built on the first call, importing this module does not import NumPy.
+    """
+    return np.dtype(MESSAGE_FIELDS)
+
+
+def parse_legacy(message):
+    """
+    Translate a free-text message to its opcode and coordinates.
+
+    Args:
+        message (str): The message, as sent before the binary format.
+
+    Returns:
+        tuple: The opcode, x and y of the message, or None if the message is not known.
+
+    Raises:
+        ValueError: If a position message does not hold two numbers in the format "x,y".
+    """
+    opcode = LEGACY_MESSAGES.get(message)
+    if opcode is not None:
+        return opcode, 0.0, 0.0
+    if message.startswith(LEGACY_POSITION_PREFIX):
+        x, y = map(float, message[len(LEGACY_POSITION_PREFIX) :].split(","))
+        return OP_POSITION, x, y
+    return None
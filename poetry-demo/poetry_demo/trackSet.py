@@ -0,0 +1,191 @@
+# Dependencies:
+# - math: Provides mathematical functions.
+# - numpy (as np): Holds the tracks in arrays and gates many sightings against them at once. Imported on first
+#   use, see LazyModule.
+import math
+
+from poetry_demo.lazyImport import LazyModule
+
+np = LazyModule("numpy")
+
+TRACK_CAPACITY = 8  # tracks followed at the same time, a new object replaces the stalest track
+TRACK_TTL = 2.0  # seconds a track is kept without a new sighting
+STILL_TIME = 0.1  # seconds a track is followed before its velocity is measured
+REPEAT_TOLERANCE = 1e-3  # field units, the laser hits a still object at the same point up to rounding
+
+UNKNOWN = 0  # not classified yet
+BALL = 1
+ROBOT = 2
+
+
+class TrackSet:
+    """
+    Follow every object the laser hits, and remember which ones are robots.
+
+    Explanation:
+    - Each track keeps the last sighting of an object, the laser heading it was seen along, its velocity, its kind
+    (UNKNOWN, BALL or ROBOT) and the time it was last seen, in arrays of `capacity` slots.
+    - A new sighting is gated against the position every live track predicts for that time: it belongs to the
+    nearest track closer than `gate`, otherwise it starts a new track. Gating a whole sweep is one vectorized
+    distance matrix.
+    - The velocity of a track is its mean motion since its first sighting, zero as long as it stays within the gate
+    of the first sighting.
+    - A robot track keeps its kind while its sightings repeat: along the heading of the last sighting, closer to it
+    than `repeat_tolerance`. The laser hits a still robot at the same point every time it reads the same heading,
+    so a repeated sighting is skipped without laser shots, see `repeated`. Any other sighting of a robot track
+    leaves its kind UNKNOWN: the object may have moved, or be the ball the classification once took for a robot,
+    and it is classified again.
+    - A track also keeps the heading of the other object the classification of its last sighting found, the caller
+    reads it next for a skipped sighting as it would after classifying it.
+    - A track not seen for `ttl` seconds is dropped.
+
+    Assumptions:
+    - The laser hits the outline of an object, so two sightings of the same still object can be up to a diameter
+    apart. The gate defaults to the robot radius, the objects on the field are farther apart than that.
+    """
+
+    def __init__(
+        self,
+        gate,
+        capacity=TRACK_CAPACITY,
+        ttl=TRACK_TTL,
+        still_time=STILL_TIME,
+        repeat_tolerance=REPEAT_TOLERANCE,
+    ):
+        self.gate = gate
+        self.capacity = capacity
+        self.ttl = ttl
+        self.still_time = still_time
+        self.repeat_tolerance = repeat_tolerance
+        self.xs = np.zeros(capacity)
+        self.ys = np.zeros(capacity)
+        self.velocities_x = np.zeros(capacity)
+        self.velocities_y = np.zeros(capacity)
+        self.seen = np.full(capacity, -math.inf)  # the time of the last sighting, -inf for a free slot
+        self.first_xs = np.zeros(capacity)
+        self.first_ys = np.zeros(capacity)
+        self.first_seen = np.zeros(capacity)
+        self.kinds = np.zeros(capacity, dtype=np.int8)
+        self.headings = np.full(capacity, math.nan)  # the laser heading of the last sighting, nan when unknown
+        self.other_headings = np.full(capacity, math.nan)  # the other object of the last classification, or nan
+
+    def clear(self):
+        self.seen[:] = -math.inf
+        self.kinds[:] = UNKNOWN
+
+    def live(self, now):
+        return now - self.seen <= self.ttl
+
+    def gate_many(self, xs, ys, now):
+        """
+        Find the track of every sighting, without changing the tracks.
+
+        Args:
+            xs (numpy.ndarray): The x-coordinates of the sightings.
+            ys (numpy.ndarray): The y-coordinates of the sightings.
+            now (float): The time of the sightings.
+
+        Returns:
+            numpy.ndarray: For every sighting the index of the nearest live track within the gate, or -1.
+        """
+        elapsed = np.maximum(now - self.seen, 0.0)
+        elapsed[~np.isfinite(elapsed)] = 0.0
+        predicted_xs = self.xs + self.velocities_x * elapsed
+        predicted_ys = self.ys + self.velocities_y * elapsed
+        distances = np.hypot(
+            np.asarray(xs, dtype=float)[:, None] - predicted_xs[None, :],
+            np.asarray(ys, dtype=float)[:, None] - predicted_ys[None, :],
+        )
+        distances[:, ~self.live(now)] = np.inf
+        nearest = np.argmin(distances, axis=1)
+        within = distances[np.arange(len(nearest)), nearest] <= self.gate
+        return np.where(within, nearest, -1)
+
+    def associate(self, x, y, now, heading=None):
+        """
+        Assign a sighting to its track, starting a new track if no track is within the gate.
+
+        Args:
+            x (float): The x-coordinate of the sighting.
+            y (float): The y-coordinate of the sighting.
+            now (float): The time of the sighting.
+            heading (float, optional): The laser heading of the sighting.
+
+        Returns:
+            int: The index of the track.
+        """
+        track = int(self.gate_many((x,), (y,), now)[0])
+        if track < 0:
+            return self.start(x, y, now, heading)
+        self.update(track, x, y, now, heading)
+        return track
+
+    def start(self, x, y, now, heading=None):
+        """
+        Start a new track in the stalest slot.
+        """
+        track = int(np.argmin(self.seen))
+        self.xs[track] = x
+        self.ys[track] = y
+        self.velocities_x[track] = 0.0
+        self.velocities_y[track] = 0.0
+        self.seen[track] = now
+        self.first_xs[track] = x
+        self.first_ys[track] = y
+        self.first_seen[track] = now
+        self.kinds[track] = UNKNOWN
+        self.headings[track] = math.nan if heading is None else heading
+        return track
+
+    def update(self, track, x, y, now, heading=None):
+        """
+        Move a track to a new sighting, and its velocity to the mean motion since the first one.
+        A robot track whose sighting is not repeated is classified again, see `TrackSet`.
+        """
+        if self.kinds[track] == ROBOT and not self.repeated(track, x, y, heading):
+            self.kinds[track] = UNKNOWN
+        age = now - self.first_seen[track]
+        delta_x = x - self.first_xs[track]
+        delta_y = y - self.first_ys[track]
+        if age >= self.still_time and math.hypot(delta_x, delta_y) > self.gate:
+            self.velocities_x[track] = delta_x / age
+            self.velocities_y[track] = delta_y / age
+        else:
+            # Within the gate the sightings may be different points of the outline of a still object
+            self.velocities_x[track] = 0.0
+            self.velocities_y[track] = 0.0
+        self.xs[track] = x
+        self.ys[track] = y
+        self.seen[track] = now
+        self.headings[track] = math.nan if heading is None else heading
+
+    def repeated(self, track, x, y, heading):
+        """
+        Check if a sighting repeats the last sighting of a track: along the same heading, and closer to it than
+        `repeat_tolerance`.
+        """
+        if heading is None or heading != self.headings[track]:
+            return False
+        return math.hypot(x - self.xs[track], y - self.ys[track]) <= self.repeat_tolerance
+
+    def kind(self, track):
+        return int(self.kinds[track])
+
+    def label(self, track, is_ball, other_heading=None):
+        """
+        Record the classification of a track.
+
+        Args:
+            track (int): The index of the track.
+            is_ball (bool): True if the object was classified as the ball.
+            other_heading (float, optional): The heading of another object the classification found.
+        """
+        self.kinds[track] = BALL if is_ball else ROBOT
+        self.other_headings[track] = math.nan if other_heading is None else other_heading
+
+    def other_heading(self, track):
+        """
+        Get the heading of the other object the last classification of a track found, or None.
+        """
+        heading = float(self.other_headings[track])
+        return None if math.isnan(heading) else heading
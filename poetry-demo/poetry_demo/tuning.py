@@ -0,0 +1,278 @@
+# Dependencies:
+# - argparse: Parses the command line options.
+# - concurrent.futures: Fans the candidate profiles out over a process pool.
+# - functools: Binds the latency budget to the sort key of the results.
+# - itertools: Builds the grid of candidate profiles.
+# - json: Writes the checkpoint and the best profile.
+# - os: Checks if a checkpoint exists.
+# - time: Measures the wall time of a decision.
+import argparse
+import functools
+import itertools
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from poetry_demo.batchEngine import evaluate_shots
+from poetry_demo.goalKeeper import EPSILON, FACE_MOVEMENT, ROBOT_RADIUS, TRACKER_WINDOW, GoalKeeper
+from poetry_demo.simulator import FieldSimulator
+
+# use `python -m poetry_demo.tuning --face-movement 1 2 4 --step-size 1 1.5 --tracker-window 2 3 5` to search the
+# grid of profiles. Every finished profile is appended to the checkpoint file, so an interrupted run started again
+# with the same checkpoint only evaluates the profiles that are missing.
+# The best profile is written as JSON and can be used as GoalKeeper(**load_profile(path)).
+
+PROFILE_KEYS = ("face_movement", "step_size", "tracker_window", "epsilon_degree")
+DEFAULT_SHOTS = 20000  # shots per profile in the batch engine, for the save rate
+DEFAULT_LATENCY_SHOTS = 50  # shots per profile played by a real GoalKeeper, for the decision latency
+DEFAULT_OPPONENT_SHOTS = 200  # shots per profile played by a real GoalKeeper against opponents, for the classification
+OPPONENTS = ((8, 6), (7, 24))  # positions of the opposing robots standing in the field during the opponent shots
+DEFAULT_SEED = 0
+
+
+def evaluation_settings(
+    shots=DEFAULT_SHOTS,
+    latency_shots=DEFAULT_LATENCY_SHOTS,
+    opponent_shots=DEFAULT_OPPONENT_SHOTS,
+    seed=DEFAULT_SEED,
+    opponents=OPPONENTS,
+):
+    """
+    Get the settings a profile is evaluated with, the arguments of `evaluate_profile` with their defaults filled
+    in, as they are stored with every result.
+    """
+    return {
+        "shots": shots,
+        "latency_shots": latency_shots,
+        "opponent_shots": opponent_shots,
+        "seed": seed,
+        "opponents": [list(opponent) for opponent in opponents],
+    }
+
+
+def profile_key(profile, evaluation=None):
+    """
+    Get a stable identifier of a profile and the settings it is evaluated with, used to find its result in the
+    checkpoint. A result of the same profile evaluated with other shots, seed or opponents has another key.
+
+    Args:
+        profile (dict): The GoalKeeper hyperparameters.
+        evaluation (dict, optional): The settings of `evaluation_settings`, its defaults when omitted.
+    """
+    if evaluation is None:
+        evaluation = evaluation_settings()
+    return json.dumps([[profile[key] for key in PROFILE_KEYS], evaluation], sort_keys=True)
+
+
+def candidate_profiles(face_movements, step_sizes, tracker_windows, epsilon_degrees):
+    """
+    Build the grid of every combination of the given values.
+
+    Returns:
+    list: The candidate profiles, dicts with the keys of `PROFILE_KEYS`.
+    """
+    return [
+        dict(zip(PROFILE_KEYS, values))
+        for values in itertools.product(face_movements, step_sizes, tracker_windows, epsilon_degrees)
+    ]
+
+
+def evaluate_profile(
+    profile,
+    shots=DEFAULT_SHOTS,
+    latency_shots=DEFAULT_LATENCY_SHOTS,
+    opponent_shots=DEFAULT_OPPONENT_SHOTS,
+    seed=DEFAULT_SEED,
+    opponents=OPPONENTS,
+):
+    """
+    Score a profile against simulated matches.
+
+    Args:
+        profile (dict): The GoalKeeper hyperparameters.
+        shots (int, optional): The number of shots played in the batch engine.
+        latency_shots (int, optional): The number of shots played by a GoalKeeper against the simulator.
+        opponent_shots (int, optional): The number of shots played by a GoalKeeper with `opponents` in the field.
+        seed (int, optional): The seed of the shots, the same seed gives every profile the same shots.
+        opponents (tuple, optional): The positions of the opposing robots standing in the field during the
+            opponent shots.
+
+    Returns:
+    dict: The profile, its save rate and outcome counts, the mean simulated time to a decision in seconds,
+        the mean wall time of a `prevent_attack` decision in microseconds, the save rate against opponents and
+        the evaluation settings.
+
+    Explanation:
+    - The save rate is measured over many shots with `KeeperBatch`, which follows the same rules as GoalKeeper.
+    - The decision latency is the cost of our own code, so it is measured by timing real `GoalKeeper` decisions.
+    - `KeeperBatch` has only the ball in the field and does not classify what the laser hits, so `epsilon_degree`
+    does not change its save rate. The opponent save rate is measured by real `GoalKeeper` decisions against the
+    per-object simulator, with `opponents` standing in the field, where a robot taken for the ball costs shots.
+    """
+    positions, velocities = FieldSimulator(seed=seed).random_shots(shots)
+    result = evaluate_shots(
+        positions,
+        velocities,
+        face_movement=profile["face_movement"],
+        tracker_window=profile["tracker_window"],
+        step_size=profile["step_size"],
+    )
+
+    simulator = FieldSimulator(seed=seed)
+    positions, velocities = simulator.random_shots(latency_shots)
+    wall_time = 0.0
+    for position, velocity in zip(positions, velocities):
+        keeper = GoalKeeper(backend=simulator, **profile)
+        simulator.kick(position, velocity)
+        start = time.perf_counter()
+        keeper.prevent_attack()
+        wall_time += time.perf_counter() - start
+
+    result["decision_latency_us"] = wall_time / max(latency_shots, 1) * 1e6
+
+    simulator = FieldSimulator(seed=seed)
+    for opponent in opponents:
+        simulator.add_opponent(opponent)
+    positions, velocities = simulator.random_shots(opponent_shots)
+    saved = 0
+    for position, velocity in zip(positions, velocities):
+        keeper = GoalKeeper(backend=simulator, fast_start=True, **profile)
+        saved += simulator.play_shot(keeper, position, velocity) == "saved"
+    result["opponent_save_rate"] = saved / max(opponent_shots, 1)
+    result["profile"] = profile
+    result["evaluation"] = evaluation_settings(shots, latency_shots, opponent_shots, seed, opponents)
+    return result
+
+
+def rank(result, max_latency_us=None):
+    """
+    Sort key of a result: the highest save rate first, then the highest save rate against opponents, then the
+    fastest decision in simulated time, then the lowest decision latency.
+
+    Args:
+        result (dict): A result of `evaluate_profile`.
+        max_latency_us (float, optional): The decision latency budget in microseconds. A profile over it ranks
+            after every profile within it, whatever its save rate.
+    """
+    latency = result["decision_latency_us"]
+    over_budget = max_latency_us is not None and latency > max_latency_us
+    return (over_budget, -result["save_rate"], -result["opponent_save_rate"], result["mean_decision_time"], latency)
+
+
+def load_checkpoint(path):
+    """
+    Read the results that were already evaluated.
+
+    Returns:
+    dict: profile key -> result.
+    """
+    results = {}
+    if path and os.path.exists(path):
+        with open(path) as checkpoint_file:
+            for line in checkpoint_file:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    result = json.loads(line)
+                except json.JSONDecodeError:
+                    continue  # a partial line left by an interrupted run, the profile is evaluated again
+                if "evaluation" not in result:
+                    continue  # written before the evaluation settings were stored, the profile is evaluated again
+                results[profile_key(result["profile"], result["evaluation"])] = result
+    return results
+
+
+def run_search(candidates, checkpoint_path=None, workers=None, max_latency_us=None, **evaluation):
+    """
+    Evaluate every candidate profile over a process pool.
+
+    Args:
+        candidates (list): The profiles to evaluate.
+        checkpoint_path (str, optional): JSON lines file with the finished results, read on start and appended to.
+            Only results evaluated with the same settings are reused.
+        workers (int, optional): The number of processes, defaults to the number of CPUs.
+        max_latency_us (float, optional): The decision latency budget, see `rank`.
+        **evaluation: Arguments passed to `evaluate_profile`.
+
+    Returns:
+    list: The results of every candidate, best first.
+    """
+    settings = evaluation_settings(**evaluation)
+    results = load_checkpoint(checkpoint_path)
+    pending = [profile for profile in candidates if profile_key(profile, settings) not in results]
+
+    if pending:
+        checkpoint_file = open(checkpoint_path, "a") if checkpoint_path else None
+        try:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                futures = [pool.submit(evaluate_profile, profile, **evaluation) for profile in pending]
+                for future in as_completed(futures):
+                    result = future.result()
+                    results[profile_key(result["profile"], result["evaluation"])] = result
+                    if checkpoint_file is not None:
+                        checkpoint_file.write(json.dumps(result) + "\n")
+                        checkpoint_file.flush()
+        finally:
+            if checkpoint_file is not None:
+                checkpoint_file.close()
+
+    keys = {profile_key(profile, settings) for profile in candidates}
+    return sorted(
+        (result for key, result in results.items() if key in keys),
+        key=functools.partial(rank, max_latency_us=max_latency_us),
+    )
+
+
+def load_profile(path):
+    """
+    Read a profile written by the tuning runner.
+
+    Returns:
+    dict: GoalKeeper keyword arguments.
+    """
+    with open(path) as profile_file:
+        return json.load(profile_file)["profile"]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Search the GoalKeeper hyperparameters against simulated matches.")
+    parser.add_argument("--face-movement", type=float, nargs="+", default=[FACE_MOVEMENT])
+    parser.add_argument("--step-size", type=float, nargs="+", default=[ROBOT_RADIUS / 2])
+    parser.add_argument("--tracker-window", type=int, nargs="+", default=[TRACKER_WINDOW])
+    parser.add_argument("--epsilon-degree", type=float, nargs="+", default=[EPSILON])
+    parser.add_argument("--shots", type=int, default=DEFAULT_SHOTS, help="shots per profile for the save rate")
+    parser.add_argument("--latency-shots", type=int, default=DEFAULT_LATENCY_SHOTS)
+    parser.add_argument("--opponent-shots", type=int, default=DEFAULT_OPPONENT_SHOTS)
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED)
+    parser.add_argument("--max-latency-us", type=float, help="decision latency budget, slower profiles rank last")
+    parser.add_argument("--workers", type=int, help="processes, defaults to the number of CPUs")
+    parser.add_argument("--checkpoint", default="tuning-checkpoint.jsonl", help="partial results, to resume")
+    parser.add_argument("--output", default="best-profile.json", help="where to write the best profile")
+    args = parser.parse_args(argv)
+
+    candidates = candidate_profiles(args.face_movement, args.step_size, args.tracker_window, args.epsilon_degree)
+    results = run_search(
+        candidates,
+        args.checkpoint,
+        args.workers,
+        args.max_latency_us,
+        shots=args.shots,
+        latency_shots=args.latency_shots,
+        opponent_shots=args.opponent_shots,
+        seed=args.seed,
+    )
+    for result in results:
+        print(
+            f"{json.dumps([result['profile'][key] for key in PROFILE_KEYS]):40} save rate {result['save_rate']:.4f}"
+            f"  with opponents {result['opponent_save_rate']:.4f}"
+            f"  decision {result['mean_decision_time']:.3f} s  latency {result['decision_latency_us']:.0f} us"
+        )
+    with open(args.output, "w") as output_file:
+        json.dump(results[0], output_file, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
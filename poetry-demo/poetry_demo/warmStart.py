@@ -0,0 +1,211 @@
+# Dependencies:
+# - collections.namedtuple: Builds the snapshot type.
+# - math: Stands NaN in for the tuner measurements that were not taken yet.
+# - os: Replaces the snapshot file atomically.
+# - struct: Packs the snapshot.
+# - threading: Writes the snapshots on a background thread.
+# - time: Stamps the snapshots with the wall clock, which keeps running while the keeper is down.
+import math
+import os
+import struct
+import threading
+import time
+from collections import namedtuple
+
+MAGIC = b"GKWS"
+VERSION = 2
+CHECKPOINT_PERIOD = 0.05  # seconds of keeper time between two snapshots
+SNAPSHOT_MAX_AGE = 1.0  # seconds a restored ball sighting stays valid, older sightings are dropped
+
+# Snapshot Layout, little endian:
+#   header     magic (4 bytes), version (unsigned short), sightings (unsigned short), saved at (double, time.time())
+#   state      x, y, facing degree (double), search direction (signed char), teammate x, y, face movement,
+#              epsilon degree (double), tuner (unsigned char, 1 when the tuner fields are set), tuner laser latency,
+#              distance, bias (double, NaN when not measured), tuner readings (unsigned long long)
+#   sightings  x, y, age (double) per ball sighting, from the oldest, the age is counted at the snapshot
+HEADER = struct.Struct("<4sHHd")
+STATE = struct.Struct("<dddbddddBdddQ")
+SIGHTING = struct.Struct("<ddd")
+
+WarmStart = namedtuple(
+    "WarmStart",
+    (
+        "saved_at",
+        "location",
+        "facing_degree",
+        "search_direction",
+        "team_mate_position",
+        "face_movement",
+        "epsilon_degree",
+        "tuner",
+        "sightings",
+    ),
+)
+WarmStart.__doc__ = """
+A keeper snapshot read back from a file, see `read_snapshot` and `GoalKeeper.restore_snapshot`.
+
+Fields:
+- saved_at (float): The `time.time()` the snapshot was taken at.
+- location, facing_degree, search_direction, team_mate_position: The pose and the search state.
+- face_movement, epsilon_degree: The parameters in use, tuned or not.
+- tuner (tuple): The `AutoTuner.state()` of the keeper's tuner, None if it had none.
+- sightings (list): The ball tracker's sightings as (x, y, age) tuples, from the oldest, the age in seconds at
+  the time of the snapshot.
+"""
+
+
+def pack_snapshot(keeper, now):
+    """
+    Pack the state a restarted keeper needs.
+
+    Args:
+        keeper (GoalKeeper): The keeper.
+        now (float): The keeper time, the sightings are aged against it.
+
+    Returns:
+        bytes: The snapshot.
+    """
+    tracker = keeper.tracker
+    sightings = []
+    for offset in range(tracker.count - 1, -1, -1):
+        index = (tracker.newest - offset) % tracker.window
+        sightings.append(SIGHTING.pack(tracker.xs[index], tracker.ys[index], now - tracker.ts[index]))
+    tuner = keeper.auto_tuner.state() if keeper.auto_tuner is not None else (math.nan, math.nan, math.nan, 0)
+    location_x, location_y = keeper.location
+    team_mate_x, team_mate_y = keeper.team_mate_position
+    return b"".join(
+        [
+            HEADER.pack(MAGIC, VERSION, len(sightings), time.time()),
+            STATE.pack(
+                location_x,
+                location_y,
+                keeper.facing_degree,
+                keeper.search_direction,
+                team_mate_x,
+                team_mate_y,
+                keeper.face_movement,
+                keeper.epsilon_degree,
+                keeper.auto_tuner is not None,
+                *tuner,
+            ),
+            *sightings,
+        ]
+    )
+
+
+def unpack_snapshot(data):
+    """
+    Unpack a snapshot made by `pack_snapshot`.
+
+    Returns:
+        WarmStart: The snapshot, or None if `data` is not a whole snapshot of this version.
+    """
+    if len(data) < HEADER.size + STATE.size:
+        return None
+    magic, version, count, saved_at = HEADER.unpack_from(data, 0)
+    if magic != MAGIC or version != VERSION or len(data) != HEADER.size + STATE.size + count * SIGHTING.size:
+        return None
+    (
+        location_x,
+        location_y,
+        facing_degree,
+        search_direction,
+        team_mate_x,
+        team_mate_y,
+        face_movement,
+        epsilon_degree,
+        has_tuner,
+        *tuner,
+    ) = STATE.unpack_from(data, HEADER.size)
+    sightings = [
+        SIGHTING.unpack_from(data, HEADER.size + STATE.size + index * SIGHTING.size) for index in range(count)
+    ]
+    return WarmStart(
+        saved_at,
+        (location_x, location_y),
+        facing_degree,
+        search_direction,
+        (team_mate_x, team_mate_y),
+        face_movement,
+        epsilon_degree,
+        tuple(tuner) if has_tuner else None,
+        sightings,
+    )
+
+
+def write_snapshot(path, data):
+    """
+    Replace the snapshot file atomically: a reader finds the previous snapshot or this one, never a partial one.
+    """
+    temporary = "%s.%d-%d.tmp" % (path, os.getpid(), threading.get_ident())  # never shared by two writers
+    with open(temporary, "wb") as snapshot_file:
+        snapshot_file.write(data)
+        snapshot_file.flush()
+        os.fsync(snapshot_file.fileno())
+    os.replace(temporary, path)
+
+
+def read_snapshot(path):
+    """
+    Read the snapshot file.
+
+    Returns:
+        WarmStart: The snapshot, or None if there is no valid snapshot at `path`.
+    """
+    try:
+        with open(path, "rb") as snapshot_file:
+            data = snapshot_file.read()
+    except OSError:
+        return None
+    return unpack_snapshot(data)
+
+
+class SnapshotWriter:
+    """
+    Writes the keeper snapshots to a file from a background thread.
+
+    Explanation:
+    - The control loop only packs a snapshot and hands it over with `submit`, a single reference store. The file
+    is written, synced and replaced on the writer thread, off the hot path.
+    - Only the latest snapshot matters: a snapshot submitted while the previous one is written replaces the ones
+    that were waiting.
+    - The thread starts with the first snapshot, `close()` writes the last one and stops it.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.pending = (0, None)  # (number, snapshot), replaced whole by `submit`
+        self.submitted = 0
+        self.written = 0
+        self.ready = threading.Event()
+        self.closing = False
+        self.thread = None
+
+    def submit(self, data):
+        self.submitted += 1
+        self.pending = (self.submitted, data)
+        self.ready.set()
+        if self.thread is None:
+            self.thread = threading.Thread(target=self.write_pending)
+            self.thread.daemon = True
+            self.thread.start()
+
+    def write_pending(self):
+        while True:
+            self.ready.wait()
+            self.ready.clear()
+            number, data = self.pending
+            if number > self.written:
+                write_snapshot(self.path, data)
+                self.written = number
+            if self.closing and self.pending[0] == self.written:
+                return
+
+    def close(self):
+        if self.thread is None:
+            return
+        self.closing = True
+        self.ready.set()
+        self.thread.join()
+        self.thread = None
+        self.closing = False
@@ -0,0 +1,58 @@
+import math
+
+import pytest
+
+from poetry_demo.goalKeeper import GoalKeeper
+from poetry_demo.simulator import FieldSimulator
+
+# A ball rolling towards our goal at (-4, 2) field units per second. It crosses the line the keeper defends,
+# x = 5, at y = 15 and reaches the goal line, x = 2, 1.25 seconds after its third sighting.
+SIGHTINGS = [(9.0, 13.0, 0.0, 80.0), (8.0, 13.5, 0.25, 70.0), (7.0, 14.0, 0.5, 60.0), (6.0, 14.5, 0.75, 50.0)]
+DEADLINE = 0.5 + 1.25 - 0.05
+
+
+def make_keeper():
+    return GoalKeeper(backend=FieldSimulator(), anytime=True, fast_start=True)
+
+
+def sight(keeper, x, y, t, heading):
+    keeper.backend.time = t
+    keeper.rotate_to_angle(heading)
+    keeper.tracker.push(x, y, t)
+    return keeper.anytime_decision(keeper.check_sighting())
+
+
+def test_two_consistent_intercepts_commit():
+    keeper = make_keeper()
+    decisions = [sight(keeper, *sighting) for sighting in SIGHTINGS]
+    assert decisions[:3] == [None, None, None]
+    assert decisions[3] == pytest.approx(15.0)
+
+
+def test_checked_intercept_is_committed_at_its_deadline():
+    keeper = make_keeper()
+    for sighting in SIGHTINGS[:3]:
+        assert sight(keeper, *sighting) is None
+    assert keeper.intercept == pytest.approx(15.0)
+    assert keeper.intercept_deadline == pytest.approx(DEADLINE)
+    keeper.backend.time = DEADLINE - 0.01
+    assert keeper.search_step() is None
+    keeper.backend.time = DEADLINE
+    assert keeper.search_step() == pytest.approx(15.0)
+
+
+def test_sighting_off_the_trajectory_drops_the_intercept():
+    keeper = make_keeper()
+    for sighting in SIGHTINGS[:3]:
+        sight(keeper, *sighting)
+    # A robot the classification took for the ball: the fit through it is not checked, and never committed
+    assert sight(keeper, 6.69, 19.08, 2.0, 67.5) is None
+    assert keeper.intercept is None
+    assert keeper.intercept_deadline == math.inf
+
+
+def test_sightings_from_one_heading_are_not_checked():
+    keeper = make_keeper()
+    for x, y, t, _ in SIGHTINGS:
+        assert sight(keeper, x, y, t, 60.0) is None
+    assert keeper.intercept is None
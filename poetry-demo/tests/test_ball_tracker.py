@@ -0,0 +1,102 @@
+import math
+import random
+
+import numpy as np
+import pytest
+
+from poetry_demo.ballTracker import BallTracker
+
+
+@pytest.mark.parametrize("window", [2, 3, 5, 8])
+def test_fit_matches_polyfit_over_the_window(window):
+    rng = random.Random(window)
+    tracker = BallTracker(window)
+    sightings = []
+    for _ in range(50):
+        x, y = rng.uniform(0, 10), rng.uniform(0, 30)
+        tracker.push(x, y)
+        sightings.append((x, y))
+        if len(tracker) < 2:
+            continue
+        xs, ys = np.array(sightings[-window:]).T
+        slope, intercept = np.polyfit(xs, ys, 1)
+        assert tracker.fit() == pytest.approx((slope, intercept), rel=1e-6, abs=1e-6)
+        assert tracker.estimate() == pytest.approx(xs[-1] * slope + intercept, rel=1e-6, abs=1e-6)
+
+
+def test_points_keep_the_window_in_order():
+    tracker = BallTracker(3)
+    for x in range(5):
+        tracker.push(float(x), 2.0 * x)
+    assert tracker.points() == [(2.0, 4.0), (3.0, 6.0), (4.0, 8.0)]
+
+
+def test_vertical_line_has_no_fit():
+    tracker = BallTracker(2)
+    tracker.push(4.0, 10.0)
+    tracker.push(4.0, 12.0)
+    assert tracker.fit() is None
+    assert tracker.estimate() == 12.0
+    assert tracker.estimate_at(1.0) == 12.0
+
+
+def test_clear_forgets_the_sightings():
+    tracker = BallTracker(2)
+    tracker.push(1.0, 1.0)
+    tracker.push(2.0, 3.0)
+    tracker.clear()
+    tracker.push(5.0, 5.0)
+    tracker.push(6.0, 4.0)
+    assert tracker.fit() == pytest.approx((-1.0, 10.0))
+
+
+def test_window_must_fit_a_line():
+    with pytest.raises(ValueError):
+        BallTracker(1)
+
+
+def test_sums_are_recomputed_every_window_wraps():
+    window = 3
+    tracker = BallTracker(window)
+    # Large sightings followed by small ones leave a rounding error in the running sums
+    for x in range(window):
+        tracker.push(1e9 + x, 1e9 - x)
+    resums = 0
+    for x in range(window * window * window):
+        wraps = tracker.wraps
+        tracker.push(0.1 * x, 0.3 * x)
+        if wraps == window - 1 and tracker.wraps == 0:
+            resums += 1
+            xs, ys = tracker.xs, tracker.ys
+            assert tracker.sum_x == math.fsum(xs)
+            assert tracker.sum_xx == math.fsum(x * x for x in xs)
+            assert tracker.sum_xy == math.fsum(x * y for x, y in zip(xs, ys))
+    assert resums == window
+    assert tracker.fit() == pytest.approx((3.0, 0.0), abs=1e-9)
+
+
+def test_time_to_line_and_estimate_at_follow_the_velocity():
+    tracker = BallTracker(2)
+    tracker.push(8.0, 10.0, 0.0)
+    tracker.push(6.0, 11.0, 0.5)
+    assert tracker.velocity() == pytest.approx((-4.0, 2.0))
+    assert tracker.time_to_line(2.0) == pytest.approx(1.0)
+    assert tracker.estimate_at(2.0) == pytest.approx(13.0)
+
+
+def test_time_to_line_is_infinite_away_from_the_line():
+    tracker = BallTracker(2)
+    tracker.push(6.0, 11.0, 0.0)
+    tracker.push(8.0, 10.0, 0.5)
+    assert tracker.time_to_line(2.0) == math.inf
+    tracker.clear()
+    tracker.push(6.0, 11.0, 0.0)
+    assert tracker.time_to_line(2.0) == math.inf
+
+
+def test_residual_is_the_distance_of_the_latest_sighting_from_a_line():
+    tracker = BallTracker(2)
+    tracker.push(3.0, 4.0)
+    assert tracker.residual((0.0, 1.0)) == pytest.approx(3.0)
+    assert tracker.residual((1.0, 1.0)) == pytest.approx(0.0)
+    assert tracker.residual(None) == math.inf
@@ -0,0 +1,34 @@
+import pytest
+
+from poetry_demo.batchEngine import GOAL, SAVED, WIDE, KeeperBatch, evaluate_shots
+from poetry_demo.goalKeeper import GoalKeeper
+from poetry_demo.simulator import FieldSimulator
+
+OUTCOMES = {GOAL: "goal", SAVED: "saved", WIDE: "wide"}
+
+
+def seeded_shots(seed, count=200):
+    simulator = FieldSimulator(seed=seed)
+    return simulator, *simulator.random_shots(count)
+
+
+@pytest.mark.parametrize("seed", [0, 1])
+def test_batch_and_goal_keeper_give_the_same_outcomes(seed):
+    # The batch takes every hit for the ball, on these seeds so does the classification of GoalKeeper, see the
+    # Ball Only assumption of batchEngine
+    simulator, positions, velocities = seeded_shots(seed)
+    batch_outcomes = [OUTCOMES[int(outcome)] for outcome in KeeperBatch(positions, velocities).run()]
+    keeper_outcomes = [
+        simulator.play_shot(GoalKeeper(backend=simulator), position, velocity)
+        for position, velocity in zip(positions, velocities)
+    ]
+    assert batch_outcomes == keeper_outcomes
+
+
+def test_evaluate_shots_counts_the_batch_outcomes():
+    _, positions, velocities = seeded_shots(0)
+    result = evaluate_shots(positions, velocities)
+    outcomes = KeeperBatch(positions, velocities).run()
+    assert result["saved"] == int((outcomes == SAVED).sum())
+    assert result["saved"] + result["goals"] + result["wide"] == len(positions)
+    assert result["save_rate"] == pytest.approx(result["saved"] / len(positions))
@@ -0,0 +1,29 @@
+from benchmarks.benchmark import MEMORY_SLACK, compare
+
+
+def run(median_us=10.0, peak_bytes=1000, retained_bytes=0):
+    return {"results": {"case": {"median_us": median_us, "peak_bytes": peak_bytes, "retained_bytes": retained_bytes}}}
+
+
+def test_equal_runs_pass():
+    assert compare(run(), run()) == []
+
+
+def test_slower_case_is_a_regression():
+    assert compare(run(median_us=12.0), run()) == [("case", "median_us", 10.0, 12.0)]
+
+
+def test_memory_growth_is_a_regression():
+    assert compare(run(peak_bytes=1200), run()) == [("case", "peak_bytes", 1000, 1200)]
+    retained = MEMORY_SLACK + 1
+    assert compare(run(retained_bytes=retained), run()) == [("case", "retained_bytes", 0, retained)]
+
+
+def test_memory_within_the_slack_passes():
+    assert compare(run(retained_bytes=MEMORY_SLACK), run()) == []
+
+
+def test_startup_cases_are_gated_on_time_only():
+    current = {"results": {"startup_import": {"median_us": 100.0, "min_us": 90.0}}}
+    baseline = {"results": {"startup_import": {"median_us": 100.0, "min_us": 90.0}}}
+    assert compare(current, baseline) == []
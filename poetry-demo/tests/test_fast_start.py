@@ -0,0 +1,40 @@
+import os
+import subprocess
+import sys
+import threading
+
+from poetry_demo.goalKeeper import GoalKeeper
+
+PACKAGE_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def test_importing_the_keeper_does_not_import_numpy():
+    # Only a new interpreter imports the modules for the first time, the test process has imported numpy already
+    script = "import sys; import poetry_demo.goalKeeper; print('numpy' in sys.modules)"
+    output = subprocess.run(
+        [sys.executable, "-c", script], cwd=PACKAGE_ROOT, capture_output=True, text=True, check=True
+    ).stdout
+    assert output.strip() == "False"
+
+
+def test_fast_start_starts_no_thread_until_run():
+    threads = threading.active_count()
+    keeper = GoalKeeper(fast_start=True)
+    assert keeper.message_check_thread is None
+    assert threading.active_count() == threads
+
+    keeper.game_over = lambda: True
+    keeper.run()
+    try:
+        assert keeper.message_check_thread.is_alive()
+    finally:
+        keeper.stop()
+    assert not keeper.message_check_thread.is_alive()
+
+
+def test_keeper_without_fast_start_listens_right_away():
+    keeper = GoalKeeper()
+    try:
+        assert keeper.message_check_thread.is_alive()
+    finally:
+        keeper.stop()
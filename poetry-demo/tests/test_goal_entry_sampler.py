@@ -0,0 +1,41 @@
+import pytest
+
+from poetry_demo.goalEntrySampler import GoalEntrySampler
+from poetry_demo.goalKeeper import GoalKeeper
+from poetry_demo.simulator import FieldSimulator
+
+
+def estimate(*sightings):
+    keeper = GoalKeeper(backend=FieldSimulator(), fast_start=True)
+    for t, (x, y) in enumerate(sightings):
+        keeper.tracker.push(x, y, t * 0.1)
+    return GoalEntrySampler().estimate(keeper)
+
+
+def test_straight_shot_at_the_goal_enters():
+    result = estimate((12.0, 15.0), (10.0, 15.0))
+    assert result.probability > 0.95
+    assert result.coverage > 0.95
+    assert result.coverage_y == pytest.approx(15.0, abs=3.0)
+
+
+def test_shot_wide_of_the_goal_misses():
+    result = estimate((12.0, 5.0), (10.0, 6.0))
+    assert result.probability < 0.05
+
+
+def test_ball_moving_away_misses():
+    result = estimate((10.0, 15.0), (12.0, 15.0))
+    assert result.probability == 0.0
+
+
+def test_ball_touching_the_keeper_is_blocked():
+    result = estimate((9.0, 15.0), (7.0, 15.0))
+    assert result.probability == 0.0
+
+
+def test_same_sightings_give_the_same_estimate():
+    first = estimate((12.0, 20.0), (10.0, 19.0))
+    second = estimate((12.0, 20.0), (10.0, 19.0))
+    assert first.probability == second.probability
+    assert first.coverage_y == pytest.approx(second.coverage_y)
@@ -0,0 +1,60 @@
+from poetry_demo.goalKeeper import GoalKeeper
+from poetry_demo.instrumentation import CONTROL, GEOMETRY, HOT_PATH, Instrumentation
+from poetry_demo.simulator import FieldSimulator
+
+
+class Nested:
+    def outer(self):
+        return self.middle() + 1
+
+    def middle(self):
+        return self.inner() + 1
+
+    def inner(self):
+        return 1
+
+
+NESTED_CALLS = (("keeper", "outer", CONTROL), ("keeper", "middle", GEOMETRY), ("keeper", "inner", GEOMETRY))
+
+
+def test_detach_restores_the_original_methods():
+    keeper = GoalKeeper(backend=FieldSimulator(), fast_start=True)
+    owners = [(keeper if owner == "keeper" else getattr(keeper, owner), name) for owner, name, _ in HOT_PATH]
+    originals = [getattr(owner, name) for owner, name in owners]
+    instrumentation = Instrumentation().attach(keeper)
+    assert "prevent_attack" in vars(keeper)
+    assert "push" in vars(keeper.tracker)
+    instrumentation.detach()
+    for (owner, name), original in zip(owners, originals):
+        assert name not in vars(owner)
+        assert getattr(owner, name) == original
+
+
+def test_spans_record_the_nesting_depth():
+    nested = Nested()
+    instrumentation = Instrumentation(calls=NESTED_CALLS).attach(nested)
+    assert nested.outer() == 3
+    instrumentation.detach()
+    spans = instrumentation.ordered_spans()
+    names = [instrumentation.names[call] for call in spans["call"]]
+    assert names == ["inner", "middle", "outer"]  # a span is written when its call returns
+    assert spans["depth"].tolist() == [2, 1, 0]
+    assert spans["self_ns"][1] == spans["duration_ns"][1] - spans["duration_ns"][0]
+    assert spans["self_ns"][2] == spans["duration_ns"][2] - spans["duration_ns"][1]
+    assert instrumentation.counts == [1, 1, 1]
+
+
+def test_decision_spans_enclose_the_search_steps():
+    simulator = FieldSimulator()
+    keeper = GoalKeeper(backend=simulator, fast_start=True)
+    simulator.kick((8.0, 11.0), (-6.0, 2.0))
+    instrumentation = Instrumentation().attach(keeper)
+    keeper.prevent_attack()
+    instrumentation.detach()
+    spans = instrumentation.ordered_spans()
+    names = [instrumentation.names[call] for call in spans["call"]]
+    assert names[-1] == "prevent_attack"
+    assert spans["depth"][-1] == 0
+    steps = spans[[name == "search_step" for name in names]]
+    assert len(steps) and (steps["depth"] == 1).all()
+    assert (spans["decision"] == 1).all()
@@ -0,0 +1,39 @@
+from poetry_demo.goalKeeper import GoalKeeper
+from poetry_demo.keeperState import KeeperState
+from poetry_demo.simulator import FieldSimulator
+from poetry_demo.teammateProtocol import OP_POSITION, encode
+
+
+def make_keeper():
+    return GoalKeeper(backend=FieldSimulator(), fast_start=True)
+
+
+def test_snapshot_matches_the_location_after_go_to_location():
+    keeper = make_keeper()
+    keeper.go_to_location(5.0, 18.0)
+    snapshot = keeper.snapshot()
+    assert isinstance(snapshot, KeeperState)
+    assert snapshot.location == keeper.location
+    assert snapshot.facing_degree == keeper.facing_degree
+
+
+def test_every_publish_increases_the_version():
+    keeper = make_keeper()
+    versions = [keeper.snapshot().version]
+    keeper.go_to_location(5.0, 18.0)
+    versions.append(keeper.snapshot().version)
+    keeper.go_to_location(5.0, 12.0)
+    versions.append(keeper.snapshot().version)
+    keeper.process_teammate_message(encode(OP_POSITION, 4.0, 9.0))
+    keeper.publish_state()
+    versions.append(keeper.snapshot().version)
+    assert versions == sorted(set(versions))
+    assert keeper.snapshot().team_mate_position == (4.0, 9.0)
+
+
+def test_a_taken_snapshot_does_not_change():
+    keeper = make_keeper()
+    before = keeper.snapshot()
+    keeper.go_to_location(5.0, 18.0)
+    assert before.location == (5, 15.0)
+    assert keeper.snapshot() is not before
@@ -0,0 +1,61 @@
+from poetry_demo.goalKeeper import GoalKeeper
+from poetry_demo.matchRecorder import MESSAGE, MatchRecorder, load_recording, replay_match
+from poetry_demo.simulator import FieldSimulator
+from poetry_demo.teammateProtocol import OP_POSITION, encode
+
+
+def play_match(backend, sweep_mode=False):
+    """
+    Play the match the way `GoalKeeper.run` does, and keep the decisions.
+    """
+    keeper = GoalKeeper(backend=backend)
+    keeper.sweep_mode = sweep_mode
+    decisions = []
+    while not keeper.game_over():
+        ball_y = keeper.prevent_attack()
+        if ball_y is None:
+            continue
+        decisions.append(ball_y)
+        keeper.go_to_location(keeper.goal_depth + keeper.robot_radius, ball_y)
+    return decisions
+
+
+def record_match(path, sweep_mode=False):
+    simulator = FieldSimulator(seed=1)
+    simulator.kick((8.0, 20.0), (-6.0, -1.5))
+    simulator.add_opponent((7.0, 24.0))
+    simulator.schedule_message(0.01, encode(OP_POSITION, 4.0, 10.0))
+    with MatchRecorder(simulator, path) as recorder:
+        return play_match(recorder, sweep_mode)
+
+
+def test_replay_repeats_the_decisions(tmp_path):
+    path = str(tmp_path / "match.rec")
+    decisions = record_match(path)
+    assert decisions
+    assert replay_match(path) == (decisions, 0)
+
+
+def test_replay_repeats_the_decisions_in_sweep_mode(tmp_path):
+    path = str(tmp_path / "match.rec")
+    decisions = record_match(path, sweep_mode=True)
+    assert decisions
+    assert replay_match(path, sweep_mode=True) == (decisions, 0)
+
+
+def test_malformed_messages_are_not_recorded(tmp_path):
+    simulator = FieldSimulator(seed=1)
+    simulator.kick((8.0, 20.0), (-6.0, -1.5))
+    simulator.schedule_message(0.0, "position: a,b")
+    simulator.schedule_message(0.0, encode(OP_POSITION, 4.0, 10.0)[:7])
+    simulator.schedule_message(0.0, encode(OP_POSITION, 4.0, 10.0) + b"\x00")
+    simulator.schedule_message(0.0, encode(OP_POSITION, 4.0, 10.0))
+    path = str(tmp_path / "match.rec")
+    with MatchRecorder(simulator, path) as recorder:
+        for _ in range(4):
+            recorder.receive()
+    messages = load_recording(path)
+    messages = messages[messages["kind"] == MESSAGE]
+    assert messages["opcode"].tolist() == [OP_POSITION]
+    assert messages["x"].tolist() == [4.0]
+    assert messages["y"].tolist() == [10.0]
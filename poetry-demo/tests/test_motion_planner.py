@@ -0,0 +1,85 @@
+import math
+import random
+
+import numpy as np
+import pytest
+
+from poetry_demo.batchEngine import KeeperBatch
+from poetry_demo.motionPlanner import STEP_TOLERANCE, MotionPlanner
+
+FIELD_WIDTH = 10
+FIELD_LENGTH = 30
+STEP_SIZE = 1.5
+
+
+def walk_step_by_step(location, target):
+    """
+    The `go_to_location` loop the planner replaced: one `move_forward` per step, a step that leaves the field is
+    not taken. The right-angle residues of cos and sin are 0, as in the planner.
+    """
+    delta_x = target[0] - location[0]
+    delta_y = target[1] - location[1]
+    radian_angle = math.radians((math.degrees(math.atan2(delta_y, delta_x)) + 360) % 360)
+    step_x = STEP_SIZE * math.cos(radian_angle)
+    step_y = STEP_SIZE * math.sin(radian_angle)
+    step_x = 0.0 if abs(step_x) < STEP_TOLERANCE else step_x
+    step_y = 0.0 if abs(step_y) < STEP_TOLERANCE else step_y
+    distance = math.sqrt(delta_x**2 + delta_y**2)
+    x, y = location
+    while distance > 0:
+        new_x, new_y = x + step_x, y + step_y
+        if 0 <= new_x <= FIELD_WIDTH and 0 <= new_y <= FIELD_LENGTH:
+            x, y = new_x, new_y
+        distance -= STEP_SIZE
+    return x, y
+
+
+def random_coordinate(rng, limit):
+    draw = rng.random()
+    if draw < 0.3:
+        return float(rng.choice([0, limit]))  # on an edge
+    if draw < 0.5:
+        return float(rng.randint(0, limit))
+    return rng.uniform(-2, limit + 2)  # sometimes out of the field
+
+
+def test_plan_matches_the_step_by_step_loop():
+    rng = random.Random(0)
+    planner = MotionPlanner(STEP_SIZE, FIELD_WIDTH, FIELD_LENGTH)
+    for _ in range(20000):
+        location = (random_coordinate(rng, FIELD_WIDTH), random_coordinate(rng, FIELD_LENGTH))
+        target = (random_coordinate(rng, FIELD_WIDTH), random_coordinate(rng, FIELD_LENGTH))
+        expected = walk_step_by_step(location, target)
+        assert planner.plan(location, target).target == pytest.approx(expected, abs=1e-9), (location, target)
+
+
+@pytest.mark.parametrize(
+    "location, target, steps, end",
+    [
+        ((10, 15), (10, 32.6), 10, (10, 30)),
+        ((10, 30), (5.9, 30), 3, (5.5, 30)),
+        ((0, 30), (0, 21), 6, (0, 21)),
+        ((4, 0), (0, 0), 2, (1, 0)),
+    ],
+)
+def test_plan_walks_along_an_edge(location, target, steps, end):
+    command = MotionPlanner(STEP_SIZE, FIELD_WIDTH, FIELD_LENGTH).plan(location, target)
+    assert command.steps == steps
+    assert command.target == end
+
+
+def test_plan_stops_at_the_field_limit():
+    command = MotionPlanner(STEP_SIZE, FIELD_WIDTH, FIELD_LENGTH).plan((5, 27), (5, 40))
+    assert command.steps == 2
+    assert command.target == (5, 30)
+
+
+def test_batch_moves_along_an_edge():
+    batch = KeeperBatch(np.zeros((1, 2)), np.zeros((1, 2)), step_size=STEP_SIZE)
+    batch.x[:] = 9.0
+    batch.y[:] = FIELD_LENGTH
+    batch.decided[:] = True
+    batch.decision_y[:] = FIELD_LENGTH
+    batch.go_to_decisions()
+    expected = MotionPlanner(STEP_SIZE, FIELD_WIDTH, FIELD_LENGTH).plan((9.0, FIELD_LENGTH), (5.0, FIELD_LENGTH))
+    assert (batch.x[0], batch.y[0]) == expected.target
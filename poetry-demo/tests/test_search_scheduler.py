@@ -0,0 +1,45 @@
+import math
+
+import pytest
+
+from poetry_demo.goalKeeper import GoalKeeper
+from poetry_demo.searchScheduler import LinearSearch, PredictiveSearch
+from poetry_demo.simulator import FieldSimulator
+
+# The keeper starts at (5, 15). Facing 90 degrees it sees the opponent at a distance of 4, so the side reads of
+# encountered_a_ball (epsilon_degree 0) are atan(3 / 4) away, at 126.87 and 53.13 degrees. The ball is on the second.
+SIDE_HEADING = 90 - math.degrees(math.atan(3 / 4))
+
+
+def make_keeper(search_scheduler=None):
+    simulator = FieldSimulator()
+    simulator.add_opponent((5, 22))
+    radian_angle = math.radians(SIDE_HEADING)
+    simulator.kick((5 + 6 * math.cos(radian_angle), 15 + 6 * math.sin(radian_angle)), (0, 0))
+    return GoalKeeper(backend=simulator, epsilon_degree=0, search_scheduler=search_scheduler, fast_start=True)
+
+
+def test_classification_restores_the_heading():
+    keeper = make_keeper()
+    keeper.rotate_to_angle(90)
+    found, x, y = keeper.idenifiy()
+    assert found == 1
+    assert not keeper.classify_hit(x, y)
+    assert keeper.facing_degree == 90
+    assert keeper.other_object_heading == pytest.approx(SIDE_HEADING)
+
+
+@pytest.mark.parametrize("scheduler", [LinearSearch, PredictiveSearch])
+def test_scheduler_reads_the_object_a_side_read_found(scheduler):
+    keeper = make_keeper(scheduler())
+    keeper.search.begin(keeper)
+    keeper.rotate_to_angle(90)
+    assert not keeper.classify_hit(*keeper.idenifiy()[1:])
+    keeper.search.report(keeper, 90, True, False, keeper.other_object_heading)
+    assert keeper.search.next_heading(keeper) == pytest.approx(SIDE_HEADING)
+
+
+def test_linear_search_steps_after_a_miss():
+    keeper = make_keeper()
+    keeper.search.report(keeper, 90, False, False)
+    assert keeper.search.next_heading(keeper) == 90 - keeper.face_movement
@@ -0,0 +1,67 @@
+import time
+
+from poetry_demo.sensorWorker import SensorRing, SensorWorker
+
+
+def make_ring(capacity=8):
+    return SensorRing(bin_width=10, capacity=capacity)
+
+
+def test_written_sample_is_read_back():
+    ring = make_ring()
+    try:
+        ring.write(90.0, 12.5, 1.0, 5.0, 15.0)
+        assert ring.written() == 1
+        assert ring.latest(90.0) == (90.0, 12.5, 1.0, 5.0, 15.0)
+        assert ring.latest(180.0) is None
+    finally:
+        ring.close()
+
+
+def test_heading_tolerance_rejects_a_sample_of_the_same_bin():
+    ring = make_ring()
+    try:
+        ring.write(90.0, 12.5, 1.0, 5.0, 15.0)
+        assert ring.latest(93.0) is not None
+        assert ring.latest(93.0, heading_tolerance=0.5) is None
+        assert ring.latest(90.2, heading_tolerance=0.5) is not None
+    finally:
+        ring.close()
+
+
+def test_overwritten_bin_returns_none():
+    ring = make_ring(capacity=4)
+    try:
+        ring.write(90.0, 12.5, 1.0, 5.0, 15.0)
+        for index in range(4):
+            ring.write(0.0, 3.0, 2.0 + index, 5.0, 15.0)
+        assert ring.latest(90.0) is None
+        assert ring.latest(0.0)[2] == 5.0
+    finally:
+        ring.close()
+
+
+def test_pose_is_published():
+    ring = make_ring()
+    try:
+        assert ring.pose() is None
+        ring.publish_pose((5.0, 15.0))
+        assert ring.pose() == (5.0, 15.0)
+    finally:
+        ring.close()
+
+
+def test_worker_rejects_stale_or_moved_samples():
+    worker = SensorWorker(laser_factory=None, bin_width=10, capacity=8)
+    worker.ring = make_ring()
+    try:
+        worker.ring.write(90.0, 12.5, time.monotonic(), 5.0, 15.0)
+        assert worker.latest((5.0, 15.0), 90.0) == 12.5
+        assert worker.latest((5.0, 15.0 + 1e-9), 90.0) == 12.5
+        assert worker.latest((5.0, 15.1), 90.0) is None
+        assert worker.latest((5.0, 15.0), 92.0) is None
+        worker.ring.write(90.0, 12.5, time.monotonic() - worker.max_age - 1.0, 5.0, 15.0)
+        assert worker.latest((5.0, 15.0), 90.0) is None
+        assert (worker.hits, worker.misses) == (2, 3)
+    finally:
+        worker.ring.close()
@@ -0,0 +1,52 @@
+import math
+
+import numpy as np
+import pytest
+
+from poetry_demo.simulator import FieldSimulator
+
+LOCATION = (5.0, 15.0)  # the keeper at its base, the field is 10 by 30 and the ball radius 2
+
+
+def make_simulator(ball, opponents=()):
+    simulator = FieldSimulator()
+    simulator.kick(ball, (0.0, 0.0))
+    for opponent in opponents:
+        simulator.add_opponent(opponent)
+    return simulator
+
+
+@pytest.mark.parametrize(
+    "ball, heading, expected",
+    [
+        ((9.0, 15.0), 0.0, 2.0),  # straight at the center, 4 away less the radius
+        ((9.0, 16.0), 0.0, 4.0 - math.sqrt(3.0)),  # b = 4, b^2 - (|c - o|^2 - r^2) = 16 - 13
+        ((8.0, 18.0), 45.0, 3.0 * math.sqrt(2.0) - 2.0),  # along the diagonal
+        ((9.0, 15.0), 180.0, 5.0),  # away from the ball, the goal line x = 0
+        ((9.0, 15.0), 90.0, 15.0),  # past the ball, the side line y = 30
+    ],
+)
+def test_ray_hits_match_hand_computed_distances(ball, heading, expected):
+    simulator = make_simulator(ball)
+    assert simulator.ray_distance(LOCATION, heading) == pytest.approx(expected)
+    assert simulator.ray_distances(LOCATION, [heading]) == pytest.approx([expected])
+
+
+def test_nearest_circle_is_hit():
+    simulator = make_simulator((5.0, 27.0), opponents=[(5.0, 22.0)])
+    assert simulator.ray_distance(LOCATION, 90.0) == pytest.approx(22.0 - 15.0 - 3.0)
+
+
+def test_sweep_matches_single_rays():
+    simulator = make_simulator((8.0, 18.0), opponents=[(6.0, 8.0)])
+    angles = np.arange(0.0, 360.0, 7.5)
+    expected = [simulator.ray_distance(LOCATION, angle) for angle in angles]
+    assert simulator.ray_distances(LOCATION, angles) == pytest.approx(expected)
+
+
+def test_readings_advance_the_simulated_clock():
+    simulator = make_simulator((9.0, 15.0))
+    simulator.activate_laser(LOCATION, 0.0)
+    simulator.activate_laser_sweep(LOCATION, np.array([0.0, 90.0]))
+    assert simulator.laser_activations == 3
+    assert simulator.now() == pytest.approx(3 * simulator.laser_period)
@@ -0,0 +1,66 @@
+import math
+
+import pytest
+
+from poetry_demo.goalKeeper import SWEEP_CHUNK, GoalKeeper
+from poetry_demo.simulator import FieldSimulator
+
+# The keeper starts at (5, 15) facing 90 degrees and sweeps clockwise, down to 270 through 0
+HALF_CIRCLE_READS = 180 // 2 + 1
+
+
+def make_keeper(ball=None):
+    simulator = FieldSimulator()
+    if ball is not None:
+        simulator.kick(ball, (0, 0))
+    keeper = GoalKeeper(backend=simulator, fast_start=True)
+    keeper.sweep_mode = True
+    keeper.rotate_to_angle(90)
+    return keeper
+
+
+def ball_at(heading, distance=9):
+    radian_angle = math.radians(heading)
+    return 5 + distance * math.cos(radian_angle), 15 + distance * math.sin(radian_angle)
+
+
+def test_empty_sweep_starts_over():
+    keeper = make_keeper()
+    keeper.rotate_to_angle(30)
+    heading, found = keeper.sweep_read()
+    assert heading is None
+    assert found[0] == 0
+    assert keeper.facing_degree == 90
+    assert keeper.backend.laser_activations == 30 // 2 + 90 // 2 + 1
+
+
+def test_sweep_stops_with_the_chunk_of_the_first_hit():
+    keeper = make_keeper(ball_at(60))
+    heading, found = keeper.sweep_read()
+    assert found[0] == 1
+    assert keeper.facing_degree == heading
+    # The heading before the hit is a miss: the robot turned to the first hit
+    keeper.rotate_to_angle(heading + keeper.face_movement)
+    assert keeper.idenifiy()[0] == 0
+    reads = keeper.backend.laser_activations - 1
+    assert reads % SWEEP_CHUNK == 0
+    assert reads < HALF_CIRCLE_READS
+    assert (90 - heading) // keeper.face_movement < reads
+
+
+def test_followed_ball_is_read_with_single_shots():
+    keeper = make_keeper(ball_at(60))
+    heading, _ = keeper.sweep_read()
+    keeper.sweep_report(heading, True, True)
+    before = keeper.backend.laser_activations
+    assert keeper.sweep_read()[0] == heading
+    assert keeper.backend.laser_activations == before + 1
+
+
+def test_sweep_moves_on_after_a_miss():
+    keeper = make_keeper(ball_at(60))
+    heading, _ = keeper.sweep_read()
+    keeper.sweep_report(heading, True, True)
+    keeper.sweep_report(heading, False, False)
+    assert keeper.sweep_single is None
+    assert keeper.facing_degree == pytest.approx((heading - keeper.face_movement) % 360)
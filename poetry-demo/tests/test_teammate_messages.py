@@ -0,0 +1,153 @@
+import logging
+import threading
+
+import pytest
+
+from poetry_demo.goalKeeper import GoalKeeper
+from poetry_demo.simulator import FieldSimulator
+from poetry_demo.teammateProtocol import (
+    MESSAGE_SIZE,
+    OP_GO_TO_BASE,
+    OP_POSITION,
+    OP_WRONG_DIRECTION,
+    decode,
+    decode_batch,
+    encode,
+    parse_legacy,
+)
+from poetry_demo.teammateInbox import TeammateInbox
+
+
+def make_keeper():
+    return GoalKeeper(backend=FieldSimulator(), fast_start=True)
+
+
+def test_encode_decode_round_trip():
+    message = encode(OP_POSITION, 3.5, 12.25)
+    assert len(message) == MESSAGE_SIZE
+    assert decode(message) == (OP_POSITION, 3.5, 12.25)
+
+
+def test_decode_batch_reads_back_to_back_messages():
+    buffer = encode(OP_POSITION, 1.0, 2.0) + encode(OP_WRONG_DIRECTION) + encode(OP_POSITION, 3.0, 4.0)
+    messages = decode_batch(buffer)
+    assert messages["opcode"].tolist() == [OP_POSITION, OP_WRONG_DIRECTION, OP_POSITION]
+    assert messages["x"].tolist() == [1.0, 0.0, 3.0]
+    assert messages["y"].tolist() == [2.0, 0.0, 4.0]
+
+
+def test_parse_legacy():
+    assert parse_legacy("Go to base") == (OP_GO_TO_BASE, 0.0, 0.0)
+    assert parse_legacy("position: 1.5,7") == (OP_POSITION, 1.5, 7.0)
+    assert parse_legacy("hello") is None
+
+
+@pytest.mark.parametrize("message", ["position: a,b", "position: 1", "position: 1,2,3"])
+def test_parse_legacy_rejects_malformed_position(message):
+    with pytest.raises(ValueError):
+        parse_legacy(message)
+
+
+def test_binary_and_legacy_positions_update_the_teammate():
+    keeper = make_keeper()
+    keeper.process_teammate_message(encode(OP_POSITION, 4.0, 9.0))
+    assert keeper.team_mate_position == (4.0, 9.0)
+    keeper.process_teammate_message("position: 6,11")
+    assert keeper.team_mate_position == (6.0, 11.0)
+
+
+def test_batch_keeps_the_latest_position_and_every_other_message():
+    keeper = make_keeper()
+    keeper.process_teammate_messages(
+        encode(OP_POSITION, 1.0, 1.0) + encode(OP_WRONG_DIRECTION) + encode(OP_POSITION, 2.0, 3.0)
+    )
+    assert keeper.team_mate_position == (2.0, 3.0)
+    assert keeper.search_direction == 0
+
+
+@pytest.mark.parametrize("message", [b"\x05abc", encode(OP_POSITION, 1.0, 1.0) + b"\x05", b"", "position: a,b"])
+def test_malformed_message_is_dropped(message):
+    keeper = make_keeper()
+    keeper.process_teammate_message(message)
+    assert keeper.team_mate_position == (-1, -1)
+
+
+def test_malformed_message_does_not_break_the_drain():
+    keeper = make_keeper()
+    keeper.inbox.put(b"\x05abc")
+    keeper.inbox.put(encode(OP_POSITION, 2.0, 5.0))
+    keeper.drain_teammate_messages()
+    assert keeper.team_mate_position == (2.0, 5.0)
+    assert not keeper.message_batch
+    keeper.inbox.put(encode(OP_POSITION, 3.0, 6.0))
+    keeper.drain_teammate_messages()
+    assert keeper.team_mate_position == (3.0, 6.0)
+
+
+def test_batch_handles_messages_in_arrival_order():
+    keeper = make_keeper()
+    handled = []
+    for opcode in (OP_POSITION, OP_WRONG_DIRECTION, OP_GO_TO_BASE):
+        keeper.message_handlers[opcode] = lambda x, y, opcode=opcode: handled.append((opcode, x, y))
+    keeper.process_teammate_messages(
+        encode(OP_POSITION, 1.0, 1.0)
+        + encode(OP_WRONG_DIRECTION)
+        + encode(OP_POSITION, 2.0, 3.0)
+        + encode(OP_GO_TO_BASE)
+    )
+    assert handled == [(OP_WRONG_DIRECTION, 0.0, 0.0), (OP_POSITION, 2.0, 3.0), (OP_GO_TO_BASE, 0.0, 0.0)]
+
+
+def test_handler_error_reaches_the_caller_and_the_batch_is_emptied():
+    keeper = make_keeper()
+
+    def fail(x, y):
+        raise RuntimeError("handler failed")
+
+    keeper.message_handlers[OP_WRONG_DIRECTION] = fail
+    keeper.inbox.put(encode(OP_WRONG_DIRECTION))
+    with pytest.raises(RuntimeError, match="handler failed"):
+        keeper.drain_teammate_messages()
+    assert not keeper.message_batch
+    keeper.inbox.put(encode(OP_POSITION, 3.0, 6.0))
+    keeper.drain_teammate_messages()
+    assert keeper.team_mate_position == (3.0, 6.0)
+
+
+def test_malformed_message_is_logged(caplog):
+    keeper = make_keeper()
+    with caplog.at_level(logging.WARNING, logger="poetry_demo.goalKeeper"):
+        keeper.process_teammate_message("position: a,b")
+    assert "Invalid position format" in caplog.text
+
+
+def test_full_inbox_drops_the_oldest_message():
+    inbox = TeammateInbox(maxsize=3)
+    for message in range(5):
+        inbox.put(message)
+    handled = []
+    assert inbox.drain(handled.append) == 3
+    assert handled == [2, 3, 4]
+    metrics = inbox.metrics()
+    assert (metrics["received"], metrics["processed"], metrics["dropped"]) == (5, 3, 2)
+    assert (metrics["depth"], metrics["max_depth"]) == (0, 3)
+
+
+def test_stop_ends_the_listening_thread():
+    keeper = GoalKeeper(fast_start=True)
+    received = threading.Event()
+
+    def transceiver(timeout=None):
+        if received.is_set():
+            keeper.message_stop.wait(timeout)
+            return None
+        received.set()
+        return encode(OP_POSITION, 2.0, 5.0)
+
+    keeper.Transceiver = transceiver
+    keeper.start_workers()
+    assert received.wait(1.0)
+    keeper.stop()
+    assert not keeper.message_check_thread.is_alive()
+    keeper.drain_teammate_messages()
+    assert keeper.team_mate_position == (2.0, 5.0)
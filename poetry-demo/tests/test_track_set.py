@@ -0,0 +1,40 @@
+from poetry_demo.trackSet import BALL, ROBOT, UNKNOWN, TrackSet
+
+
+def robot_track(tracks, x=5.0, y=19.0, heading=90.0):
+    track = tracks.associate(x, y, 0.0, heading)
+    tracks.label(track, False, 45.0)
+    return track
+
+
+def test_sightings_are_gated_to_the_nearest_track():
+    tracks = TrackSet(gate=3)
+    first = tracks.associate(5.0, 19.0, 0.0)
+    second = tracks.associate(12.0, 8.0, 0.0)
+    assert first != second
+    assert list(tracks.gate_many([5.5, 11.0, 20.0], [19.5, 8.0, 30.0], 0.01)) == [first, second, -1]
+
+
+def test_repeated_robot_sighting_keeps_its_kind():
+    tracks = TrackSet(gate=3)
+    track = robot_track(tracks)
+    assert tracks.associate(5.0, 19.0, 0.05, 90.0) == track
+    assert tracks.kind(track) == ROBOT
+    assert tracks.other_heading(track) == 45.0
+
+
+def test_robot_moving_along_the_same_heading_is_classified_again():
+    tracks = TrackSet(gate=3)
+    track = robot_track(tracks)
+    assert tracks.associate(5.0, 19.5, 0.05, 90.0) == track
+    assert tracks.kind(track) == UNKNOWN
+    tracks.label(track, True)
+    assert tracks.kind(track) == BALL
+    assert tracks.other_heading(track) is None
+
+
+def test_robot_seen_along_another_heading_is_classified_again():
+    tracks = TrackSet(gate=3)
+    track = robot_track(tracks)
+    assert tracks.associate(5.0, 19.0, 0.05, 88.0) == track
+    assert tracks.kind(track) == UNKNOWN
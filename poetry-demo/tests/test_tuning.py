@@ -0,0 +1,43 @@
+import json
+
+from poetry_demo.tuning import evaluation_settings, load_checkpoint, profile_key, rank
+
+PROFILE = {"face_movement": 2.0, "step_size": 1.5, "tracker_window": 2, "epsilon_degree": 4.0}
+
+
+def make_result(save_rate, latency, opponent_save_rate=0.9, decision_time=0.5):
+    return {
+        "save_rate": save_rate,
+        "opponent_save_rate": opponent_save_rate,
+        "mean_decision_time": decision_time,
+        "decision_latency_us": latency,
+    }
+
+
+def test_profile_key_depends_on_the_evaluation_settings():
+    key = profile_key(PROFILE)
+    assert key == profile_key(PROFILE, evaluation_settings())
+    assert key != profile_key(PROFILE, evaluation_settings(seed=1))
+    assert key != profile_key(PROFILE, evaluation_settings(shots=100))
+    assert key != profile_key(PROFILE, evaluation_settings(opponents=((7, 8),)))
+
+
+def test_checkpoint_keeps_the_settings_of_every_result(tmp_path):
+    path = tmp_path / "checkpoint.jsonl"
+    settings = evaluation_settings(seed=3)
+    result = dict(make_result(0.9, 100.0), profile=PROFILE, evaluation=settings)
+    path.write_text(json.dumps(result) + "\n" + json.dumps(dict(result, evaluation=None))[:20])
+    results = load_checkpoint(str(path))
+    assert list(results) == [profile_key(PROFILE, settings)]
+    assert profile_key(PROFILE) not in results
+
+
+def test_rank_breaks_ties_on_latency():
+    slow, fast = make_result(0.9, 300.0), make_result(0.9, 100.0)
+    assert sorted([slow, fast], key=rank) == [fast, slow]
+
+
+def test_rank_puts_profiles_over_the_latency_budget_last():
+    better, within = make_result(0.95, 300.0), make_result(0.9, 100.0)
+    assert sorted([better, within], key=rank) == [better, within]
+    assert sorted([better, within], key=lambda result: rank(result, max_latency_us=200.0)) == [within, better]
@@ -0,0 +1,75 @@
+import math
+
+import pytest
+
+from poetry_demo.autoTuner import AutoTuner
+from poetry_demo.goalKeeper import GoalKeeper
+from poetry_demo.simulator import FieldSimulator
+from poetry_demo.warmStart import HEADER, MAGIC, STATE, pack_snapshot, read_snapshot, unpack_snapshot, write_snapshot
+
+
+def make_keeper(**keeper_arguments):
+    keeper = GoalKeeper(backend=FieldSimulator(), **keeper_arguments)
+    keeper.location = (5.0, 12.5)
+    keeper.facing_degree = 40.0
+    keeper.search_direction = 0
+    keeper.team_mate_position = (20.0, 7.5)
+    keeper.tracker.push(8.0, 20.0, 0.1)
+    keeper.tracker.push(7.5, 19.0, 0.2)
+    return keeper
+
+
+def test_pack_unpack_round_trip():
+    keeper = make_keeper()
+    snapshot = unpack_snapshot(pack_snapshot(keeper, 0.5))
+    assert snapshot.location == (5.0, 12.5)
+    assert snapshot.facing_degree == 40.0
+    assert snapshot.search_direction == 0
+    assert snapshot.team_mate_position == (20.0, 7.5)
+    assert snapshot.face_movement == keeper.face_movement
+    assert snapshot.epsilon_degree == keeper.epsilon_degree
+    assert snapshot.tuner is None
+    assert snapshot.sightings == [(8.0, 20.0, pytest.approx(0.4)), (7.5, 19.0, pytest.approx(0.3))]
+
+
+def test_round_trip_keeps_the_tuner_state():
+    tuner = AutoTuner()
+    tuner.observe_laser(0.004, readings=2)
+    keeper = make_keeper(auto_tuner=tuner)
+    snapshot = unpack_snapshot(pack_snapshot(keeper, 0.5))
+    laser_latency, distance, bias, readings = snapshot.tuner
+    assert (laser_latency, bias, readings) == (0.002, 0.0, 2)
+    assert math.isnan(distance)
+
+
+@pytest.mark.parametrize("cut", [1, HEADER.size, HEADER.size + STATE.size - 1, HEADER.size + STATE.size + 1])
+def test_truncated_snapshot_is_rejected(cut):
+    data = pack_snapshot(make_keeper(), 0.5)
+    assert unpack_snapshot(data[:-cut]) is None
+
+
+def test_foreign_data_is_rejected():
+    data = pack_snapshot(make_keeper(), 0.5)
+    assert unpack_snapshot(b"XXXX" + data[len(MAGIC) :]) is None
+    assert unpack_snapshot(data + b"\x00") is None
+
+
+def test_truncated_file_is_rejected(tmp_path):
+    path = str(tmp_path / "keeper.snap")
+    data = pack_snapshot(make_keeper(), 0.5)
+    write_snapshot(path, data)
+    assert read_snapshot(path).location == (5.0, 12.5)
+    with open(path, "wb") as snapshot_file:
+        snapshot_file.write(data[: len(data) // 2])
+    assert read_snapshot(path) is None
+    assert read_snapshot(str(tmp_path / "missing.snap")) is None
+
+
+def test_restarted_keeper_continues_from_the_snapshot(tmp_path):
+    path = str(tmp_path / "keeper.snap")
+    keeper = make_keeper()
+    write_snapshot(path, pack_snapshot(keeper, keeper.now()))
+    restarted = GoalKeeper(backend=FieldSimulator(), warm_start=path)
+    assert restarted.location == (5.0, 12.5)
+    assert restarted.team_mate_position == (20.0, 7.5)
+    assert restarted.tracker.points() == [(8.0, 20.0), (7.5, 19.0)]